@@ -0,0 +1,58 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Compare the size of a large Analysis, and the time taken to save and load
+# it, in the binary format (see firehose.binary), as XML, and as JSON
+#
+# Usage:
+#   python -m benchmarks.binary_format [NUM_RESULTS]
+
+import json
+import sys
+
+from six import BytesIO
+
+from firehose import binary
+from firehose.model import Analysis
+
+from benchmarks.common import make_analysis, best_of
+
+def main(argv):
+    num_results = int(argv[1]) if len(argv) > 1 else 20000
+    a = make_analysis(num_results)
+    xmlbytes = a.to_xml_bytes()
+    jsontext = json.dumps(a.to_json())
+    binbytes = binary.dumps(a)
+    assert binary.loads(binbytes) == a
+
+    print('%i results' % num_results)
+    print('%8s %12s %10s %10s' % ('format', 'size', 'save', 'load'))
+    print('%8s %12i %9.2fs %9.2fs'
+          % ('xml', len(xmlbytes),
+             best_of(a.to_xml_bytes),
+             best_of(lambda: Analysis.from_xml(BytesIO(xmlbytes)))))
+    print('%8s %12i %9.2fs %9.2fs'
+          % ('json', len(jsontext),
+             best_of(lambda: json.dumps(a.to_json())),
+             best_of(lambda: Analysis.from_json(json.loads(jsontext)))))
+    print('%8s %12i %9.2fs %9.2fs'
+          % ('binary', len(binbytes),
+             best_of(lambda: binary.dumps(a)),
+             best_of(lambda: binary.loads(binbytes))))
+
+if __name__ == '__main__':
+    main(sys.argv)
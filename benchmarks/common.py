@@ -0,0 +1,75 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Helpers shared by the benchmarks: construction of synthetic, but
+# realistically-shaped, reports
+
+import time
+
+from firehose.model import Analysis, Issue, Metadata, Generator, Location, \
+    File, Function, Point, Message, Notes, Trace, State, Stats
+
+TESTIDS = ['refcount-too-high', 'null-ptr-deref', 'unusedVariable',
+           'format', 'resource-leak', 'uninitialized']
+
+def make_issue(i, num_files=500, trace_len=4, distinct_lines=False):
+    """
+    Construct the i-th synthetic Issue: a location within one of num_files
+    source files, a message, and a trace of trace_len states.  By default
+    the issues all use the same few lines; with distinct_lines, each uses
+    its own lines, as in real reports
+    """
+    path = 'src/module%i/file%i.c' % (i % 17, i % num_files)
+    first_line = 10 + i * (trace_len + 1) if distinct_lines else 10
+    funcname = 'function_%i' % (i % 2000)
+    states = []
+    for j in range(trace_len):
+        states.append(State(Location(File(path, None),
+                                     Function(funcname),
+                                     Point(first_line + j, 5)),
+                            Notes('step %i' % j)))
+    return Issue(cwe=[None, 401, 476][i % 3],
+                 testid=TESTIDS[i % len(TESTIDS)],
+                 location=Location(File(path, None),
+                                   Function(funcname),
+                                   Point(first_line + trace_len, 5)),
+                 message=Message('something bad happened (#%i)' % (i % 5000)),
+                 notes=None,
+                 trace=Trace(states) if trace_len else None,
+                 severity='warning')
+
+def make_analysis(num_results, **kwargs):
+    """
+    Construct an Analysis holding num_results synthetic issues
+    """
+    metadata = Metadata(Generator('benchmark', '1.0'), None, None,
+                        Stats(1.5))
+    return Analysis(metadata,
+                    [make_issue(i, **kwargs) for i in range(num_results)])
+
+def best_of(fn, repeat=3):
+    """
+    Call fn() repeat times, returning the fastest wallclock time in seconds
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.time()
+        fn()
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
@@ -0,0 +1,71 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Time building a large number of issues (with traces) via the checked
+# constructors, compared with unchecked(), and time an explicit validate()
+# pass over the result
+#
+# Usage:
+#   python -m benchmarks.construction [NUM_RESULTS]
+
+import sys
+
+from firehose.model import Analysis, Issue, Location, Message, Notes, \
+    State, Trace, Interner, Metadata, Generator
+
+from benchmarks.common import best_of
+
+def build(num_results, unchecked):
+    interner = Interner()
+    if unchecked:
+        make_issue, make_location, make_message, make_notes, make_state, \
+            make_trace = (Issue.unchecked, Location.unchecked,
+                          Message.unchecked, Notes.unchecked,
+                          State.unchecked, Trace.unchecked)
+    else:
+        make_issue, make_location, make_message, make_notes, make_state, \
+            make_trace = Issue, Location, Message, Notes, State, Trace
+    results = []
+    for i in range(num_results):
+        file_ = interner.file('src/file%i.c' % (i % 500), None)
+        function = interner.function('function_%i' % (i % 2000))
+        states = [make_state(make_location(file_, function,
+                                           interner.point(10 + j, 5)),
+                             make_notes('step %i' % j))
+                  for j in range(4)]
+        results.append(make_issue(401, 'leak',
+                                  make_location(file_, function,
+                                                interner.point(14, 5)),
+                                  make_message('something bad happened'),
+                                  None, make_trace(states), 'warning', None))
+    return Analysis(Metadata(Generator('benchmark'), None, None, None),
+                    results)
+
+def main(argv):
+    num_results = int(argv[1]) if len(argv) > 1 else 100000
+    print('%i results, with traces of 4 states' % num_results)
+    checked_time = best_of(lambda: build(num_results, False))
+    unchecked_time = best_of(lambda: build(num_results, True))
+    print('constructors: %.3fs (%.0f issues/s)'
+          % (checked_time, num_results / checked_time))
+    print('unchecked():  %.3fs (%.0f issues/s)'
+          % (unchecked_time, num_results / unchecked_time))
+    a = build(num_results, True)
+    print('validate():   %.3fs' % best_of(a.validate))
+
+if __name__ == '__main__':
+    main(sys.argv)
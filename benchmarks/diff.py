@@ -0,0 +1,77 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Time firehose.diff.diff on large reports, in which some results have been
+# fixed, some added, and many moved by a few lines; and compare it with a
+# naive pairwise comparison using __eq__ on a smaller report
+#
+# Usage:
+#   python -m benchmarks.diff [NUM_RESULTS]
+
+import sys
+import time
+
+from firehose.diff import diff
+from firehose.model import Point
+
+from benchmarks.common import make_analysis, best_of
+
+def make_pair(num_results):
+    old = make_analysis(num_results, trace_len=0)
+    new = make_analysis(num_results, trace_len=0)
+    # Drop every 10th result, add some, and shift the lines of every 3rd:
+    new.results = [result for i, result in enumerate(new.results)
+                   if i % 10 != 0]
+    new.results += make_analysis(num_results // 20, trace_len=0).results
+    for result in new.results[::3]:
+        point = result.location.point
+        result.location.point = Point(point.line + 5, point.column)
+    return old, new
+
+def naive_diff(old, new):
+    unmatched_olds = list(old.results)
+    added = []
+    for result in new.results:
+        for i, candidate in enumerate(unmatched_olds):
+            if candidate == result:
+                del unmatched_olds[i]
+                break
+        else:
+            added.append(result)
+    return added, unmatched_olds
+
+def time_diff(num_results):
+    # (using freshly-built reports, so that no fingerprints are cached)
+    old, new = make_pair(num_results)
+    start = time.time()
+    result = diff(old, new)
+    return result, time.time() - start
+
+def main(argv):
+    num_results = int(argv[1]) if len(argv) > 1 else 200000
+    result, elapsed = time_diff(num_results)
+    print('%i results: %r' % (num_results, result))
+    print('diff: %.2fs' % elapsed)
+
+    num_results = 5000
+    old, new = make_pair(num_results)
+    print('%i results: diff: %.2fs, naive pairwise __eq__: %.2fs'
+          % (num_results, time_diff(num_results)[1],
+             best_of(lambda: naive_diff(old, new), repeat=1)))
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,79 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Time selecting the results of a large Analysis matching a filter
+# expression: with a hand-written Python loop, with the compiled Filter,
+# and with the Filter pushed down into an AnalysisIndex and into a Store
+#
+# Usage:
+#   python -m benchmarks.filter [NUM_RESULTS]
+
+import os
+import shutil
+import sys
+import tempfile
+
+from firehose.filter import Filter
+from firehose.index import AnalysisIndex
+from firehose.store import Store
+
+from benchmarks.common import make_analysis, best_of
+
+EXPRESSION = ('cwe in (401, 476) and file ~ "src/module3/**"'
+              ' and testid != "unusedVariable"')
+
+def by_hand(analysis):
+    found = []
+    for result in analysis.results:
+        if result.cwe not in (401, 476):
+            continue
+        location = result.location
+        if location is None \
+                or not location.file.givenpath.startswith('src/module3/'):
+            continue
+        if result.testid == 'unusedVariable':
+            continue
+        found.append(result)
+    return found
+
+def main(argv):
+    num_results = int(argv[1]) if len(argv) > 1 else 100000
+    a = make_analysis(num_results)
+    filter_ = Filter(EXPRESSION)
+    index = AnalysisIndex(a)
+    index.query(file='', cwe=0, testid='')
+    expected = len(by_hand(a))
+    assert len(filter_.select(a)) == expected
+    assert len(filter_.select(index)) == expected
+    print('%i results, %i matching %s' % (num_results, expected, EXPRESSION))
+    print('python loop:             %7.3fs' % best_of(lambda: by_hand(a)))
+    print('compiled filter:         %7.3fs'
+          % best_of(lambda: filter_.select(a)))
+    print('pushed into index:       %7.3fs'
+          % best_of(lambda: filter_.select(index)))
+    tmpdir = tempfile.mkdtemp()
+    try:
+        with Store(os.path.join(tmpdir, 'reports.sqlite')) as store:
+            store.add_analysis(a)
+            assert len(filter_.select(store)) == expected
+            print('pushed into store:       %7.3fs'
+                  % best_of(lambda: filter_.select(store)))
+    finally:
+        shutil.rmtree(tmpdir)
+
+if __name__ == '__main__':
+    main(sys.argv)
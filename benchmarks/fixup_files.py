@@ -0,0 +1,82 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Time Analysis.fixup_files(hashalg=...) over a synthetic source tree,
+# compared with reading and hashing the file afresh for every location
+# referring to it, and with a (cold, then warm) persistent HashCache
+#
+# Usage:
+#   python -m benchmarks.fixup_files [NUM_RESULTS] [FILE_SIZE]
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+
+from firehose.hashcache import HashCache
+from firehose.model import Visitor, Hash
+
+from benchmarks.common import make_analysis, best_of
+
+def fixup_files_per_location(analysis, relativedir, hashalg):
+    class FixupFiles(Visitor):
+        def visit_file(self, file_):
+            file_.abspath = os.path.normpath(os.path.join(relativedir,
+                                                          file_.givenpath))
+            with open(file_.abspath, 'rb') as f:
+                h = hashlib.new(hashalg)
+                h.update(f.read())
+                file_.hash_ = Hash(alg=hashalg, hexdigest=h.hexdigest())
+    analysis.accept(FixupFiles())
+
+def main(argv):
+    num_results = int(argv[1]) if len(argv) > 1 else 10000
+    file_size = int(argv[2]) if len(argv) > 2 else 64 * 1024
+    a = make_analysis(num_results)
+    srcdir = tempfile.mkdtemp()
+    try:
+        paths = set(result.location.file.givenpath for result in a.results)
+        for path in paths:
+            path = os.path.join(srcdir, path)
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(path, 'wb') as f:
+                f.write(os.urandom(file_size))
+        print('%i results, %i files of %i bytes'
+              % (num_results, len(paths), file_size))
+        print('per location: %.3fs'
+              % best_of(lambda: fixup_files_per_location(a, srcdir, 'sha256'),
+                        repeat=1))
+        for threads in (1, None):
+            print('fixup_files(threads=%s): %.3fs'
+                  % (threads,
+                     best_of(lambda: a.fixup_files(srcdir, 'sha256',
+                                                   threads=threads))))
+        with HashCache(os.path.join(srcdir, 'hashes.sqlite')) as cache:
+            print('fixup_files(hashcache=...), cold: %.3fs'
+                  % best_of(lambda: a.fixup_files(srcdir, 'sha256',
+                                                  hashcache=cache),
+                            repeat=1))
+            print('fixup_files(hashcache=...), warm: %.3fs'
+                  % best_of(lambda: a.fixup_files(srcdir, 'sha256',
+                                                  hashcache=cache)))
+    finally:
+        shutil.rmtree(srcdir)
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,127 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Measure the quality of the model's hashes, and the performance of sets
+# and dicts of issues, compared with the previous scheme of XOR-ing the
+# hashes of the fields together (reimplemented here as xor_hash)
+#
+# Usage:
+#   python -m benchmarks.hashing [NUM_ISSUES]
+
+import sys
+
+from firehose.model import JsonMixin, Point
+
+from benchmarks.common import make_issue, best_of
+
+def xor_hash(obj):
+    if isinstance(obj, JsonMixin):
+        result = 0
+        for attr in obj.attrs:
+            if attr.name == 'customfields':
+                continue
+            value = getattr(obj, attr.name)
+            if isinstance(value, list):
+                for item in value:
+                    result ^= xor_hash(item)
+            else:
+                result ^= xor_hash(value)
+        return result
+    return hash(obj)
+
+class Keyed(object):
+    """
+    Wraps a model object, hashing it with the given function
+    """
+    __slots__ = ('obj', 'hashfn')
+
+    def __init__(self, obj, hashfn):
+        self.obj = obj
+        self.hashfn = hashfn
+
+    def __hash__(self):
+        return self.hashfn(self.obj)
+
+    def __eq__(self, other):
+        return self.obj == other.obj
+
+def make_issues(num_issues):
+    # Spread the issues over a realistic range of lines and columns
+    issues = []
+    for i in range(num_issues):
+        issue = make_issue(i)
+        issue.location.point = Point(1 + (i * 7) % 3000, 1 + (i * 13) % 80)
+        issues.append(issue)
+    return issues
+
+def time_fresh(fn, num_issues, repeat=3):
+    """
+    Get the fastest time taken by fn(issues), each time on freshly-built
+    issues
+    """
+    best = None
+    for _ in range(repeat):
+        issues = make_issues(num_issues)
+        elapsed = best_of(lambda: fn(issues), repeat=1)
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def count_distinct(objs, hashfn):
+    return len(set(objs)), len(set(hashfn(obj) for obj in objs))
+
+def main(argv):
+    num_issues = int(argv[1]) if len(argv) > 1 else 20000
+    print('%i issues' % num_issues)
+
+    print('%10s %10s %14s %14s'
+          % ('', 'distinct', 'tuple hashes', 'XOR hashes'))
+    issues = make_issues(num_issues)
+    for name, objs in [('points', [issue.location.point for issue in issues]),
+                       ('locations', [issue.location for issue in issues]),
+                       ('issues', issues)]:
+        distinct, tuple_hashes = count_distinct(objs, hash)
+        distinct, xor_hashes = count_distinct(objs, xor_hash)
+        print('%10s %10i %14i %14i'
+              % (name, distinct, tuple_hashes, xor_hashes))
+
+    print('')
+    print('%10s %12s %12s %14s'
+          % ('', 'build set', 'lookups', 'dict by loc'))
+    for name, hashfn in [('tuple', hash), ('XOR', xor_hash)]:
+        def build_set(issues):
+            return set(Keyed(issue, hashfn) for issue in issues)
+        def lookups(issues):
+            # (repeated lookups of the same objects)
+            keys = [Keyed(issue, hashfn) for issue in issues]
+            issue_set = set(keys)
+            for _ in range(5):
+                for key in keys:
+                    assert key in issue_set
+        def dict_by_location(issues):
+            result = {}
+            for issue in issues:
+                result.setdefault(Keyed(issue.location, hashfn),
+                                  []).append(issue)
+            return result
+        print('%10s %11.2fs %11.2fs %13.2fs'
+              % (name, time_fresh(build_set, num_issues),
+                 time_fresh(lookups, num_issues),
+                 time_fresh(dict_by_location, num_issues)))
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,58 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Time queries against an AnalysisIndex, compared with scanning
+# analysis.results
+#
+# Usage:
+#   python -m benchmarks.index [NUM_RESULTS]
+
+import sys
+
+from firehose.index import AnalysisIndex
+
+from benchmarks.common import make_analysis, best_of
+
+QUERIES = [{'file': 'src/module3/file3.c'},
+           {'cwe': 401},
+           {'testid': 'format'},
+           {'cwe': 401, 'testid': 'resource-leak', 'severity': 'warning'}]
+
+def scan(analysis, criteria):
+    getters = [(AnalysisIndex.KEYS[key], value)
+               for key, value in criteria.items()]
+    return [result for result in analysis.results
+            if all(getter(result) == value for getter, value in getters)]
+
+def main(argv):
+    num_results = int(argv[1]) if len(argv) > 1 else 100000
+    a = make_analysis(num_results, trace_len=0)
+    index = AnalysisIndex(a)
+    print('%i results' % num_results)
+    print('building the indexes: %.3fs'
+          % best_of(lambda: [AnalysisIndex(a).get_index(key)
+                             for key in AnalysisIndex.KEYS], repeat=1))
+    print('%-64s %8s %10s %10s' % ('query', 'matches', 'scan', 'index'))
+    for criteria in QUERIES:
+        assert scan(a, criteria) == index.query(**criteria)
+        print('%-64s %8i %9.4fs %9.4fs'
+              % (criteria, len(index.query(**criteria)),
+                 best_of(lambda: scan(a, criteria)),
+                 best_of(lambda: index.query(**criteria))))
+
+if __name__ == '__main__':
+    main(sys.argv)
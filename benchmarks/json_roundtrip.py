@@ -0,0 +1,41 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Time conversion of a large Analysis to and from JSON-compatible objects,
+# and comparison of two equal analyses
+#
+# Usage:
+#   python -m benchmarks.json_roundtrip [NUM_RESULTS]
+
+import sys
+
+from firehose.model import Analysis
+
+from benchmarks.common import make_analysis, best_of
+
+def main(argv):
+    num_results = int(argv[1]) if len(argv) > 1 else 20000
+    a = make_analysis(num_results)
+    jsonobj = a.to_json()
+    b = Analysis.from_json(jsonobj)
+    print('%i results' % num_results)
+    print('to_json:   %.3fs' % best_of(a.to_json))
+    print('from_json: %.3fs' % best_of(lambda: Analysis.from_json(jsonobj)))
+    print('__eq__:    %.3fs' % best_of(lambda: a == b))
+
+if __name__ == '__main__':
+    main(sys.argv)
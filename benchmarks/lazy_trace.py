@@ -0,0 +1,84 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Time loading a large Analysis with traces from XML and JSON, and listing
+# the primary location and message of each issue, with the traces left
+# undecoded, compared with also decoding every trace; and the memory held
+# per issue with the traces undecoded, and once they are all decoded
+#
+# Usage:
+#   python -m benchmarks.lazy_trace [NUM_RESULTS]
+
+import json
+import sys
+import tracemalloc
+
+from six import BytesIO
+
+from firehose.model import Analysis
+
+from benchmarks.common import make_analysis, best_of
+
+def list_issues(analysis):
+    return [(result.testid, result.location.file.givenpath,
+             result.location.line, result.message.text)
+            for result in analysis.results]
+
+def decode_traces(analysis):
+    for result in analysis.results:
+        result.trace
+
+def memory_per_issue(load, num_results):
+    """
+    Get the bytes held per issue by the Analysis that load() builds, with
+    its traces undecoded, and then once they are all decoded
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    b = load()
+    lazy = tracemalloc.get_traced_memory()[0] - before
+    decode_traces(b)
+    decoded = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return float(lazy) / num_results, float(decoded) / num_results
+
+def main(argv):
+    num_results = int(argv[1]) if len(argv) > 1 else 20000
+    a = make_analysis(num_results, trace_len=20)
+    xmlbytes = a.to_xml_bytes()
+    jsontext = json.dumps(a.to_json())
+    loaders = [('xml', lambda: Analysis.from_xml(BytesIO(xmlbytes))),
+               ('json', lambda: Analysis.from_json(json.loads(jsontext)))]
+    print('%i results, with traces of 20 states' % num_results)
+    print('%-6s %18s %18s' % ('', 'load and list', '+ decode traces'))
+    for name, load in loaders:
+        def lazily():
+            list_issues(load())
+        def eagerly():
+            b = load()
+            list_issues(b)
+            decode_traces(b)
+        print('%-6s %17.3fs %17.3fs'
+              % (name, best_of(lazily), best_of(eagerly)))
+    print('')
+    print('%-6s %18s %18s' % ('', 'bytes/issue', '+ decode traces'))
+    for name, load in loaders:
+        print('%-6s %18.0f %18.0f'
+              % ((name, ) + memory_per_issue(load, num_results)))
+
+if __name__ == '__main__':
+    main(sys.argv)
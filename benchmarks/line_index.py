@@ -0,0 +1,66 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Time finding the results touched by a set of changed line ranges with a
+# LineIndex, compared with scanning analysis.results
+#
+# Usage:
+#   python -m benchmarks.line_index [NUM_RESULTS]
+
+import random
+import sys
+
+from firehose.index import LineIndex
+
+from benchmarks.common import make_analysis, best_of
+
+def scan(analysis, hunks):
+    found = []
+    for result in analysis.results:
+        location = result.location
+        for path, start, end in hunks:
+            if (location.file.givenpath == path
+                    and start <= location.point.line <= end):
+                found.append(result)
+                break
+    return found
+
+def main(argv):
+    num_results = int(argv[1]) if len(argv) > 1 else 100000
+    a = make_analysis(num_results, trace_len=0)
+    # Spread the results over the lines of their files:
+    rng = random.Random(0)
+    for result in a.results:
+        result.location.point.line = rng.randint(1, 2000)
+    # A pull request touching 20 files, with 5 hunks each:
+    hunks = []
+    for i in range(20):
+        path = 'src/module%i/file%i.c' % (i % 17, i)
+        for _ in range(5):
+            start = rng.randint(1, 2000)
+            hunks.append((path, start, start + rng.randint(0, 30)))
+    print('%i results, %i hunks' % (num_results, len(hunks)))
+    print('building the index and querying: %.4fs'
+          % best_of(lambda: LineIndex(a).touched_by(hunks), repeat=1))
+    index = LineIndex(a)
+    assert index.touched_by(hunks) == scan(a, hunks)
+    print('%i matches' % len(index.touched_by(hunks)))
+    print('scan:  %.4fs' % best_of(lambda: scan(a, hunks)))
+    print('index: %.4fs' % best_of(lambda: index.touched_by(hunks)))
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,89 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Report the memory used per Issue by the __slots__-based model classes,
+# compared with equivalent objects that carry a per-instance __dict__ (as
+# the model classes did before they gained __slots__)
+#
+# Usage:
+#   python -m benchmarks.memory [NUM_ISSUES]
+
+import sys
+import tracemalloc
+
+from firehose.model import JsonMixin
+
+from benchmarks.common import make_issue
+
+_dict_classes = {}
+
+def to_dict_based(obj):
+    """
+    Build a copy of the given model object graph using plain classes
+    that have a __dict__, with one class per model class (so that the
+    instances can share dict keys, as the original classes could)
+    """
+    if isinstance(obj, list):
+        return [to_dict_based(item) for item in obj]
+    if not isinstance(obj, JsonMixin):
+        return obj
+    cls = obj.__class__
+    if cls not in _dict_classes:
+        _dict_classes[cls] = type(cls.__name__, (object, ), {})
+    result = _dict_classes[cls]()
+    for attr in cls.attrs:
+        setattr(result, attr.name, to_dict_based(getattr(obj, attr.name)))
+    return result
+
+def measure(num_issues, convert):
+    """
+    Return the number of bytes allocated per issue when building
+    num_issues issues, and passing each through convert()
+    """
+    # Build the strings and ints up-front, so that only the object graph
+    # itself is measured:
+    issues = [make_issue(i) for i in range(num_issues)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    converted = [convert(issue) for issue in issues]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del converted
+    return float(after - before) / num_issues
+
+def copy_slotted(obj):
+    # Build a fresh copy of the slots-based graph, sharing the leaf values
+    if isinstance(obj, list):
+        return [copy_slotted(item) for item in obj]
+    if not isinstance(obj, JsonMixin):
+        return obj
+    kwargs = dict((attr.name, copy_slotted(getattr(obj, attr.name)))
+                  for attr in obj.attrs)
+    return obj.__class__(**kwargs)
+
+def main(argv):
+    num_issues = int(argv[1]) if len(argv) > 1 else 20000
+    with_dict = measure(num_issues, to_dict_based)
+    with_slots = measure(num_issues, copy_slotted)
+    print('issues measured:         %i' % num_issues)
+    print('bytes/issue (__dict__):  %.0f' % with_dict)
+    print('bytes/issue (__slots__): %.0f' % with_slots)
+    print('saving:                  %.1f%%'
+          % (100.0 * (with_dict - with_slots) / with_dict))
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,77 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Time merging many reports with firehose.merge, in-process and with a
+# pool of workers, compared with loading every report with
+# Analysis.from_xml and writing the deduplicated results with to_xml_bytes
+#
+# Usage:
+#   python -m benchmarks.merge [NUM_INPUTS] [RESULTS_PER_INPUT]
+
+import os
+import shutil
+import sys
+import tempfile
+
+from firehose.merge import merge
+from firehose.model import Analysis
+
+from benchmarks.common import make_analysis, best_of
+
+def naive_merge(paths, fileobj):
+    analyses = [Analysis.from_xml(path) for path in paths]
+    seen = set()
+    results = []
+    for a in analyses:
+        for result, fingerprint in zip(a.results, a.fingerprints()):
+            if fingerprint not in seen:
+                seen.add(fingerprint)
+                results.append(result)
+    fileobj.write(Analysis(analyses[0].metadata, results).to_xml_bytes())
+
+def main(argv):
+    num_inputs = int(argv[1]) if len(argv) > 1 else 100
+    results_per_input = int(argv[2]) if len(argv) > 2 else 1000
+    tmpdir = tempfile.mkdtemp()
+    try:
+        # (each input shares half of its results with the previous one, as
+        # with headers included by several translation units)
+        a = make_analysis(results_per_input * (num_inputs + 1) // 2)
+        paths = []
+        for i in range(num_inputs):
+            start = i * results_per_input // 2
+            part = Analysis(a.metadata,
+                            a.results[start:start + results_per_input])
+            path = os.path.join(tmpdir, 'input-%i.xml' % i)
+            with open(path, 'wb') as f:
+                part.write_xml(f)
+            paths.append(path)
+        print('%i inputs of %i results' % (num_inputs, results_per_input))
+        with open(os.devnull, 'wb') as devnull:
+            print('naive:            %.2fs'
+                  % best_of(lambda: naive_merge(paths, devnull), repeat=1))
+            print('merge, 1 process: %.2fs'
+                  % best_of(lambda: merge(paths, devnull, processes=1),
+                            repeat=1))
+            print('merge, pool:      %.2fs (%i CPUs)'
+                  % (best_of(lambda: merge(paths, devnull), repeat=1),
+                     os.cpu_count() if hasattr(os, 'cpu_count') else 0))
+    finally:
+        shutil.rmtree(tmpdir)
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,75 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Time applying several independent visitors to a large Analysis, with a
+# walk of the tree per visitor, compared with a single walk with a
+# MultiVisitor
+#
+# Usage:
+#   python -m benchmarks.multivisitor [NUM_RESULTS]
+
+from collections import Counter
+import posixpath
+import sys
+
+from firehose.model import Visitor, MultiVisitor
+
+from benchmarks.common import make_analysis, best_of
+
+class NormalizePaths(Visitor):
+    def visit_file(self, file_):
+        file_.givenpath = posixpath.normpath(file_.givenpath)
+
+class CountTestIds(Visitor):
+    def __init__(self):
+        self.counts = Counter()
+
+    def visit_warning(self, warning):
+        self.counts[warning.testid] += 1
+
+class CountFunctions(Visitor):
+    def __init__(self):
+        self.counts = Counter()
+
+    def visit_function(self, function):
+        self.counts[function.name] += 1
+
+class RedactMessages(Visitor):
+    def visit_message(self, message):
+        message.text = message.text.replace('bad', 'b*d')
+
+    def visit_notes(self, notes):
+        # (Trace.accept also passes the Trace to visit_notes)
+        if hasattr(notes, 'text'):
+            notes.text = notes.text.replace('step', 's**p')
+
+VISITORS = [NormalizePaths, CountTestIds, CountFunctions, RedactMessages]
+
+def main(argv):
+    num_results = int(argv[1]) if len(argv) > 1 else 100000
+    a = make_analysis(num_results)
+    print('%i results, %i visitors' % (num_results, len(VISITORS)))
+    def separately():
+        for cls in VISITORS:
+            a.accept(cls())
+    print('a walk per visitor: %.3fs' % best_of(separately))
+    print('MultiVisitor:       %.3fs'
+          % best_of(lambda: a.accept(MultiVisitor([cls()
+                                                   for cls in VISITORS]))))
+
+if __name__ == '__main__':
+    main(sys.argv)
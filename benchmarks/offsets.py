@@ -0,0 +1,67 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Time fetching single results and pages of results from a large report
+# via an OffsetIndex (and building its sidecar), compared with reading
+# the report with AnalysisReader up to the wanted results
+#
+# Usage:
+#   python -m benchmarks.offsets [NUM_RESULTS]
+
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+
+from firehose.model import AnalysisReader
+from firehose.offsets import OffsetIndex, build_offset_index
+
+from benchmarks.common import make_analysis, best_of
+
+def read_results(path, start, stop):
+    with open(path, 'rb') as f:
+        return list(itertools.islice(AnalysisReader(f), start, stop))
+
+def main(argv):
+    num_results = int(argv[1]) if len(argv) > 1 else 100000
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, 'report.xml')
+        with open(path, 'wb') as f:
+            f.write(make_analysis(num_results).to_xml_bytes())
+        print('%i results (%.1f MB)'
+              % (num_results, os.path.getsize(path) / 1e6))
+        print('build sidecar: %7.3fs'
+              % best_of(lambda: build_offset_index(path)))
+        index = OffsetIndex(path)
+        middle = num_results // 2
+        requests = [('result #%i' % middle, middle, middle + 1),
+                    ('results %i-%i' % (middle, middle + 100), middle,
+                     middle + 100),
+                    ('last result', num_results - 1, num_results)]
+        print('%-22s %12s %14s' % ('', 'OffsetIndex', 'AnalysisReader'))
+        for name, start, stop in requests:
+            assert index[start:stop] == read_results(path, start, stop)
+            print('%-22s %11.5fs %13.3fs'
+                  % (name, best_of(lambda: index[start:stop]),
+                     best_of(lambda: read_results(path, start, stop))))
+    finally:
+        shutil.rmtree(tmpdir)
+
+if __name__ == '__main__':
+    main(sys.argv)
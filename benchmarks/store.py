@@ -0,0 +1,82 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Time ingesting many reports into a firehose.store database, in one batch
+# and with one transaction per report, and time querying it for the
+# issues within one file, compared with re-parsing the XML of every report
+# and scanning its results
+#
+# Usage:
+#   python -m benchmarks.store [NUM_REPORTS] [RESULTS_PER_REPORT]
+
+import os
+import shutil
+import sys
+import tempfile
+
+from six import BytesIO
+
+from firehose.model import Analysis
+from firehose.store import Store
+
+from benchmarks.common import make_analysis, best_of
+
+def main(argv):
+    num_reports = int(argv[1]) if len(argv) > 1 else 100
+    results_per_report = int(argv[2]) if len(argv) > 2 else 1000
+    num_results = num_reports * results_per_report
+    analyses = [make_analysis(results_per_report)
+                for _ in range(num_reports)]
+    tmpdir = tempfile.mkdtemp()
+    try:
+        def ingest(batched):
+            path = os.path.join(tmpdir, 'reports.sqlite')
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.unlink(path + suffix)
+            with Store(path) as store:
+                if batched:
+                    store.add_analyses(analyses)
+                else:
+                    for analysis in analyses:
+                        store.add_analysis(analysis)
+        print('%i reports of %i results, with traces of 4 states'
+              % (num_reports, results_per_report))
+        for name, batched in [('one batch', True),
+                              ('one transaction per report', False)]:
+            elapsed = best_of(lambda: ingest(batched))
+            print('ingest, %-27s %7.3fs (%.0f results/s)'
+                  % (name + ':', elapsed, num_results / elapsed))
+
+        path = 'src/module3/file3.c'
+        xmlbytes = [a.to_xml_bytes() for a in analyses]
+        def scan():
+            found = []
+            for data in xmlbytes:
+                a = Analysis.from_xml(BytesIO(data))
+                found += [r for r in a.results
+                          if r.location.file.givenpath == path]
+            return found
+        with Store(os.path.join(tmpdir, 'reports.sqlite')) as store:
+            assert len(store.query(file=path)) == len(scan())
+            print('query one file:  %7.3fs' % best_of(lambda: store.query(file=path)))
+        print('re-parse and scan: %7.3fs' % best_of(scan))
+    finally:
+        shutil.rmtree(tmpdir)
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,105 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Compare the peak memory usage of Analysis.from_xml with that of the
+# streaming Analysis.iter_results reader, when counting the results
+# within reports of various sizes; and that of Analysis.to_xml_bytes with
+# that of the streaming AnalysisWriter, when writing them
+#
+# Usage:
+#   python -m benchmarks.streaming
+
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from firehose.model import Analysis, AnalysisWriter
+
+from benchmarks.common import make_analysis, make_issue
+
+def peak_memory(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+def retained_memory(fn):
+    """
+    Get the memory still allocated once fn() has returned, whilst its
+    result is alive
+    """
+    tracemalloc.start()
+    kept = fn()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return retained
+
+def bench_reading():
+    # (each result has lines of its own, as in real reports, so that
+    # sharing of identical Points doesn't hide any growth)
+    print('%10s %12s %16s %16s %18s'
+          % ('results', 'file size', 'from_xml peak', 'streaming peak',
+             'reader retained'))
+    for num_results in [1000, 10000, 50000]:
+        fd, path = tempfile.mkstemp(suffix='.xml')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(make_analysis(num_results,
+                                  distinct_lines=True).to_xml_bytes())
+        try:
+            def load():
+                len(Analysis.from_xml(path).results)
+            def stream():
+                sum(1 for result in Analysis.iter_results(path))
+            def stream_and_keep_reader():
+                reader = Analysis.iter_results(path)
+                sum(1 for result in reader)
+                return reader
+            print('%10i %12i %16i %16i %18i'
+                  % (num_results, os.path.getsize(path),
+                     peak_memory(load), peak_memory(stream),
+                     retained_memory(stream_and_keep_reader)))
+        finally:
+            os.unlink(path)
+
+def bench_writing():
+    print('%10s %16s %16s'
+          % ('results', 'in-memory peak', 'streaming peak'))
+    for num_results in [1000, 10000, 50000]:
+        metadata = make_analysis(0).metadata
+        def write_all():
+            a = Analysis(metadata,
+                         [make_issue(i) for i in range(num_results)])
+            with open(os.devnull, 'wb') as f:
+                f.write(a.to_xml_bytes())
+        def stream():
+            with open(os.devnull, 'wb') as f:
+                with AnalysisWriter(f, metadata) as writer:
+                    writer.write_results(make_issue(i)
+                                         for i in range(num_results))
+        print('%10i %16i %16i'
+              % (num_results, peak_memory(write_all), peak_memory(stream)))
+
+def main(argv):
+    bench_reading()
+    print('')
+    bench_writing()
+
+if __name__ == '__main__':
+    main(sys.argv)
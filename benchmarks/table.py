@@ -0,0 +1,69 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Compare a ResultTable with a list of Issue instances: the memory used by
+# each, and the time taken to filter and to count by testid
+#
+# Usage:
+#   python -m benchmarks.table [NUM_ISSUES]
+
+import sys
+import tracemalloc
+from collections import Counter
+
+from firehose.table import ResultTable
+
+from benchmarks.common import make_issue, best_of
+
+def main(argv):
+    num_issues = int(argv[1]) if len(argv) > 1 else 100000
+
+    tracemalloc.start()
+    issues = [make_issue(i, trace_len=0) for i in range(num_issues)]
+    objects_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    table = ResultTable.from_results(make_issue(i, trace_len=0)
+                                     for i in range(num_issues))
+    table_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    def filter_objects():
+        return [issue for issue in issues
+                if issue.testid == 'null-ptr-deref'
+                and issue.severity == 'warning']
+    def filter_table():
+        return table.select(testid='null-ptr-deref', severity='warning')
+    def count_objects():
+        return Counter(issue.testid for issue in issues)
+    def count_table():
+        return table.count_by('testid')
+    assert len(filter_objects()) == len(filter_table())
+    assert count_objects() == count_table()
+
+    print('%i issues (without traces)' % num_issues)
+    print('%8s %14s %10s %10s' % ('', 'memory', 'filter', 'count'))
+    print('%8s %14i %9.3fs %9.3fs'
+          % ('objects', objects_size,
+             best_of(filter_objects), best_of(count_objects)))
+    print('%8s %14i %9.3fs %9.3fs'
+          % ('table', table_size,
+             best_of(filter_table), best_of(count_table)))
+
+if __name__ == '__main__':
+    main(sys.argv)
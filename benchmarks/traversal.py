@@ -0,0 +1,81 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Time collecting the files, locations and messages of a large Analysis
+# with a Visitor, compared with the iter_*() generators, and time
+# fixup_files(relativedir=...)
+#
+# Usage:
+#   python -m benchmarks.traversal [NUM_RESULTS]
+
+import os
+import sys
+
+from firehose.model import Visitor
+
+from benchmarks.common import make_analysis, best_of
+
+class FileCollector(Visitor):
+    def __init__(self):
+        self.files = []
+
+    def visit_file(self, file_):
+        self.files.append(file_)
+
+class LocationCollector(Visitor):
+    def __init__(self):
+        self.locations = []
+
+    def visit_location(self, location):
+        self.locations.append(location)
+
+class MessageCollector(Visitor):
+    def __init__(self):
+        self.messages = []
+
+    def visit_message(self, message):
+        self.messages.append(message)
+
+class FixupPaths(Visitor):
+    def __init__(self, relativedir):
+        self.relativedir = relativedir
+
+    def visit_file(self, file_):
+        file_.abspath = os.path.normpath(os.path.join(self.relativedir,
+                                                      file_.givenpath))
+
+def main(argv):
+    num_results = int(argv[1]) if len(argv) > 1 else 100000
+    a = make_analysis(num_results)
+    print('%i results' % num_results)
+    print('%-12s %10s %10s' % ('', 'Visitor', 'iter_*()'))
+    for name, collector, iterator in [('files', FileCollector, a.iter_files),
+                                      ('locations', LocationCollector,
+                                       a.iter_locations),
+                                      ('messages', MessageCollector,
+                                       a.iter_messages)]:
+        print('%-12s %9.3fs %9.3fs'
+              % (name,
+                 best_of(lambda: a.accept(collector())),
+                 best_of(lambda: list(iterator()))))
+    print('%-12s %9.3fs %9.3fs'
+          % ('fixup paths',
+             best_of(lambda: a.accept(FixupPaths('/tmp'))),
+             best_of(lambda: a.fixup_files(relativedir='/tmp'))))
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,74 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Time validating many small reports with firehose.validate, in-process
+# (with the Relax NG schema and with the fallback checker) and with a pool
+# of workers, compared with running "xmllint --relaxng" on each
+#
+# Usage:
+#   python -m benchmarks.validate [NUM_REPORTS] [RESULTS_PER_REPORT]
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from firehose.validate import AttrsValidator, DEFAULT_SCHEMA, \
+    validate_files, lxml_etree
+
+from benchmarks.common import make_analysis, best_of
+
+def xmllint(paths):
+    for path in paths:
+        with open(os.devnull, 'wb') as devnull:
+            subprocess.check_call(['xmllint', '--relaxng', DEFAULT_SCHEMA,
+                                   '--noout', path],
+                                  stdout=devnull, stderr=devnull)
+
+def main(argv):
+    num_reports = int(argv[1]) if len(argv) > 1 else 500
+    results_per_report = int(argv[2]) if len(argv) > 2 else 20
+    tmpdir = tempfile.mkdtemp()
+    try:
+        paths = []
+        for i in range(num_reports):
+            path = os.path.join(tmpdir, 'report-%i.xml' % i)
+            with open(path, 'wb') as f:
+                make_analysis(results_per_report).write_xml(f)
+            paths.append(path)
+        print('%i reports of %i results' % (num_reports, results_per_report))
+        try:
+            print('xmllint per report:    %.3fs'
+                  % best_of(lambda: xmllint(paths), repeat=1))
+        except OSError:
+            print('xmllint per report:    (xmllint not found)')
+        if lxml_etree is not None:
+            print('validate_files, -j1:   %.3fs'
+                  % best_of(lambda: list(validate_files(paths,
+                                                        processes=1))))
+            print('validate_files, pool:  %.3fs'
+                  % best_of(lambda: list(validate_files(paths))))
+        validator = AttrsValidator()
+        print('fallback checker, -j1: %.3fs'
+              % best_of(lambda: [validator.validate_file(path)
+                                 for path in paths]))
+    finally:
+        shutil.rmtree(tmpdir)
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,57 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Compare the available XML backends (see firehose.xmlbackend) when
+# reading a large report
+#
+# Usage:
+#   python -m benchmarks.xml_backends [NUM_RESULTS]
+
+import os
+import sys
+import tempfile
+
+from firehose import xmlbackend
+from firehose.model import Analysis
+
+from benchmarks.common import make_analysis, best_of
+
+def main(argv):
+    num_results = int(argv[1]) if len(argv) > 1 else 50000
+    fd, path = tempfile.mkstemp(suffix='.xml')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(make_analysis(num_results).to_xml_bytes())
+    try:
+        print('%i results, %i bytes' % (num_results, os.path.getsize(path)))
+        print('%8s %14s %14s %14s'
+              % ('backend', 'parse only', 'from_xml', 'iter_results'))
+        for name in sorted(xmlbackend.BACKENDS):
+            xmlbackend.set_backend(name)
+            def parse():
+                xmlbackend.parse(path)
+            def load():
+                Analysis.from_xml(path)
+            def stream():
+                for result in Analysis.iter_results(path):
+                    pass
+            print('%8s %13.2fs %13.2fs %13.2fs'
+                  % (name, best_of(parse), best_of(load), best_of(stream)))
+    finally:
+        os.unlink(path)
+
+if __name__ == '__main__':
+    main(sys.argv)
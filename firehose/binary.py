@@ -0,0 +1,349 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# A compact binary serialization of Analysis instances, for archiving.
+#
+# Layout:
+#   * the magic bytes b'FHB1'
+#   * a varint giving the number of strings in the string table, followed
+#     by a varint per string giving its length in characters
+#   * a varint giving the size in bytes of the string data, followed by
+#     the string data: the UTF-8 encoding of all of the strings,
+#     concatenated
+#   * the body: a sequence of varints describing the object graph
+#
+# Every distinct string (paths, function names, test ids, messages, etc)
+# is stored once in the string table, and referred to by index from the
+# body.  Everything in the body is an unsigned integer, written as a
+# little-endian base-128 varint, walking each object's "attrs" metadata
+# in order:
+#   * strings: 0 for None, otherwise 1 + the index in the string table
+#   * ints: 0 for None, otherwise 1 + the zigzag-encoding of the value
+#   * floats: as the string holding their repr()
+#   * lists: 0 for None, otherwise 1 + the length, followed by the items
+#   * objects: 0 for None, otherwise 1 (or, for Result and Sut, a number
+#     identifying the subclass), followed by the attributes
+#   * CustomFields: 0 for None, otherwise 1 + the number of fields,
+#     followed by the name, a tag (0 for str, 1 for int), and the value
+#     of each field
+
+from six import integer_types, iteritems
+
+from firehose.model import Analysis, Result, Issue, Failure, Info, Sut, \
+    SourceRpm, DebianBinary, DebianSource, CustomFields, _string_type
+
+MAGIC = b'FHB1'
+
+# Subclasses of the polymorphic attribute types, by the number used for
+# them in the body
+SUBCLASSES = {Result: [Issue, Failure, Info],
+              Sut: [SourceRpm, DebianBinary, DebianSource]}
+
+_TAGS = dict((subclass, index + 1)
+             for subclasses in SUBCLASSES.values()
+             for index, subclass in enumerate(subclasses))
+
+#
+# Varints
+#
+
+def encode_varints(ints, out):
+    """
+    Append the varint encodings of the given unsigned ints to the
+    bytearray "out"
+    """
+    append = out.append
+    for value in ints:
+        while value > 0x7f:
+            append((value & 0x7f) | 0x80)
+            value >>= 7
+        append(value)
+
+def decode_varints(data, pos, count=None):
+    """
+    Decode varints from the bytearray "data" starting at offset pos, until
+    the end of the data, or until count of them have been decoded.
+    Return a (list of ints, new offset) pair, raising ValueError if the
+    data ends part-way through a varint
+    """
+    result = []
+    append = result.append
+    value = 0
+    shift = 0
+    end = len(data)
+    if count is None:
+        for byte in data[pos:]:
+            if byte < 0x80:
+                append(value | (byte << shift))
+                value = 0
+                shift = 0
+            else:
+                value |= (byte & 0x7f) << shift
+                shift += 7
+        if shift:
+            raise ValueError('truncated data')
+        return result, end
+    while len(result) < count:
+        if pos >= end:
+            raise ValueError('truncated data')
+        byte = data[pos]
+        pos += 1
+        if byte < 0x80:
+            append(value | (byte << shift))
+            value = 0
+            shift = 0
+        else:
+            value |= (byte & 0x7f) << shift
+            shift += 7
+    return result, pos
+
+def _zigzag(value):
+    return (value << 1) if value >= 0 else ((-value << 1) - 1)
+
+def _unzigzag(value):
+    return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+
+#
+# Encoding
+#
+
+class _Encoder(object):
+    def __init__(self):
+        self.strings = {}
+        self.ints = []
+
+    def string(self, value):
+        if value is None:
+            self.ints.append(0)
+            return
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        self.ints.append(index + 1)
+
+    def int(self, value):
+        if value is None:
+            self.ints.append(0)
+        else:
+            self.ints.append(_zigzag(value) + 1)
+
+    def value(self, attrtype, value):
+        if isinstance(attrtype, list):
+            if value is None:
+                self.ints.append(0)
+                return
+            self.ints.append(len(value) + 1)
+            itemtype = attrtype[0]
+            for item in value:
+                self.value(itemtype, item)
+        elif attrtype == _string_type:
+            self.string(value)
+        elif attrtype == int:
+            self.int(value)
+        elif attrtype == float:
+            self.string(None if value is None else repr(value))
+        elif attrtype == 'CustomFields':
+            self.customfields(value)
+        else:
+            self.object(value)
+
+    def object(self, obj):
+        if obj is None:
+            self.ints.append(0)
+            return
+        self.ints.append(_TAGS.get(obj.__class__, 1))
+        for attr in obj.attrs:
+            self.value(attr.type, getattr(obj, attr.name))
+
+    def customfields(self, customfields):
+        if customfields is None:
+            self.ints.append(0)
+            return
+        self.ints.append(len(customfields) + 1)
+        for key, value in iteritems(customfields):
+            self.string(key)
+            if isinstance(value, _string_type):
+                self.ints.append(0)
+                self.string(value)
+            elif isinstance(value, integer_types):
+                self.ints.append(1)
+                self.ints.append(_zigzag(value))
+            else:
+                raise TypeError('unhandled type within CustomFields instance')
+
+def dumps(analysis):
+    """
+    Return a bytes instance holding the binary serialization of the given
+    Analysis
+    """
+    assert isinstance(analysis, Analysis)
+    encoder = _Encoder()
+    encoder.object(analysis)
+
+    strings = [None] * len(encoder.strings)
+    for value, index in iteritems(encoder.strings):
+        strings[index] = value
+    stringdata = u''.join(strings).encode('utf-8')
+
+    out = bytearray(MAGIC)
+    encode_varints([len(strings)], out)
+    encode_varints([len(value) for value in strings], out)
+    encode_varints([len(stringdata)], out)
+    out += stringdata
+    encode_varints(encoder.ints, out)
+    return bytes(out)
+
+def dump(analysis, fileobj):
+    """
+    Write the binary serialization of the given Analysis to fileobj (a
+    file-like object opened in binary mode)
+    """
+    fileobj.write(dumps(analysis))
+
+#
+# Decoding
+#
+
+def _index(tag):
+    """
+    Get the list index for a tag read from the body (1 for the first item,
+    with 0 reserved for None), rejecting 0 where a value is required,
+    rather than letting it pick the last item
+    """
+    if tag < 1:
+        raise IndexError(tag)
+    return tag - 1
+
+def _customfields(count, next_int, strings):
+    result = CustomFields()
+    for _ in range(count - 1):
+        key = strings[_index(next_int())]
+        if next_int() == 0:
+            result[key] = strings[_index(next_int())]
+        else:
+            result[key] = _unzigzag(next_int())
+    return result
+
+def _value_expr(attrtype):
+    """
+    Get a Python expression decoding a value of the given attribute type,
+    given that the first int of its encoding has already been read into
+    "v"
+    """
+    if isinstance(attrtype, list):
+        return ('[decode_%s[_index(next_int())](next_int, strings)'
+                ' for _ in range(v - 1)] if v else None' % attrtype[0])
+    if attrtype == _string_type:
+        return 'strings[v - 1] if v else None'
+    if attrtype == int:
+        # Inlined equivalent of _unzigzag(v - 1)
+        return '((v - 1) >> 1 if v & 1 else -(v >> 1)) if v else None'
+    if attrtype == float:
+        return 'float(strings[v - 1]) if v else None'
+    if attrtype == 'CustomFields':
+        return '_customfields(v, next_int, strings) if v else None'
+    return 'decode_%s[v - 1](next_int, strings) if v else None' % attrtype
+
+def _generate_decoders():
+    """
+    Generate a decoding function for each model class, driven by its attrs
+    metadata (in the same way as model._generate_attrs_methods).  Each
+    function takes the __next__ method of an iterator over the body's ints,
+    and the string table, the int identifying the object's class having
+    already been consumed.  The objects are built with unchecked(), the
+    decoded values being well-typed by construction.
+
+    Return a dict mapping the names of the model classes, and of Result
+    and Sut, to lists of the decoders for the classes identified by
+    1, 2, ... in the body
+    """
+    from firehose import model
+    classes = [cls for cls in vars(model).values()
+               if isinstance(cls, type) and 'attrs' in cls.__dict__]
+    namespace = {'_customfields': _customfields, '_index': _index}
+    lines = []
+    for cls in classes:
+        namespace[cls.__name__] = cls
+        lines.append('def _decode_%s(next_int, strings):' % cls.__name__)
+        for attr in cls.attrs:
+            lines.append('    v = next_int()')
+            lines.append('    %s = %s' % (attr.name, _value_expr(attr.type)))
+        lines.append('    return %s.unchecked(%s)'
+                     % (cls.__name__,
+                        ', '.join('%s=%s' % (attr.name, attr.name)
+                                  for attr in cls.attrs)))
+    source = '\n'.join(lines) + '\n'
+    exec(compile(source, '<generated binary decoders>', 'exec'), namespace)
+
+    decoders = {}
+    for cls in classes:
+        decoders[cls.__name__] = [namespace['_decode_%s' % cls.__name__]]
+    for basecls, subclasses in iteritems(SUBCLASSES):
+        decoders[basecls.__name__] = [decoders[subclass.__name__][0]
+                                      for subclass in subclasses]
+    for name, decoder_list in iteritems(decoders):
+        namespace['decode_' + name] = decoder_list
+    return decoders
+
+_decoders = _generate_decoders()
+
+def loads(data):
+    """
+    Construct an Analysis from a bytes instance holding its binary
+    serialization
+    """
+    data = bytearray(data)
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError('not a binary firehose file')
+    pos = len(MAGIC)
+    (numstrings, ), pos = decode_varints(data, pos, 1)
+    lengths, pos = decode_varints(data, pos, numstrings)
+    (stringdatalen, ), pos = decode_varints(data, pos, 1)
+    if pos + stringdatalen > len(data):
+        raise ValueError('truncated data')
+    stringdata = bytes(data[pos:pos + stringdatalen]).decode('utf-8')
+    pos += stringdatalen
+
+    strings = []
+    offset = 0
+    for length in lengths:
+        strings.append(stringdata[offset:offset + length])
+        offset += length
+
+    ints, pos = decode_varints(data, pos)
+    it = iter(ints)
+    next_int = getattr(it, '__next__', None) or it.next
+    # (the generated decoders read the ints without checking them, so
+    # truncated or corrupt data surfaces as these exceptions)
+    try:
+        if next_int() != 1:
+            raise ValueError('body does not start with an Analysis')
+        analysis = _decoders['Analysis'][0](next_int, strings)
+    except StopIteration:
+        raise ValueError('truncated data')
+    except IndexError:
+        raise ValueError('corrupt data')
+    for _ in it:
+        raise ValueError('trailing data')
+    return analysis
+
+def load(fileobj):
+    """
+    Read an Analysis from the binary serialization within fileobj (a
+    file-like object opened in binary mode)
+    """
+    return loads(fileobj.read())
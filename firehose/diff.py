@@ -0,0 +1,177 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Comparison of two Analysis instances (e.g. from successive builds of a
+# package), classifying their results as new, fixed or unchanged.
+#
+# Results are matched in two passes, each via a dict rather than by
+# comparing every pair of results:
+#   * by fingerprint (see Result.fingerprint): results that are identical
+#     in every respect that the fingerprint covers, including the line
+#   * then, amongst the results left over, by (file, function, id, message),
+#     so that results survive code being added or removed above them.
+#     Within each such bucket, results are paired up in order of line.
+
+import bisect
+
+from firehose.model import Analysis, normalize_fingerprint_path
+
+class AnalysisDiff(object):
+    """
+    The differences between an old and a new Analysis:
+
+      * "new": a list of the results only found in the new analysis
+      * "fixed": a list of the results only found in the old analysis
+      * "unchanged": a list of (old result, new result) pairs of results
+        found in both
+    """
+    def __init__(self, new, fixed, unchanged):
+        self.new = new
+        self.fixed = fixed
+        self.unchanged = unchanged
+
+    def __repr__(self):
+        return ('AnalysisDiff(new=%i results, fixed=%i results,'
+                ' unchanged=%i results)'
+                % (len(self.new), len(self.fixed), len(self.unchanged)))
+
+def _bucket_key(result, normalized_paths):
+    """
+    Get the key used to match results whose lines differ
+    """
+    path = function = None
+    location = result.location
+    if location is not None:
+        givenpath = location.file.givenpath
+        path = normalized_paths.get(givenpath)
+        if path is None:
+            path = normalized_paths[givenpath] = \
+                normalize_fingerprint_path(givenpath)
+        if location.function is not None:
+            function = location.function.name
+    message = result.message
+    if message is not None:
+        message = ' '.join(message.text.split())
+    return (result.__class__, path, function, result._fingerprint_id()[1],
+            message)
+
+def _line(result):
+    if result.location is None:
+        return None
+    return result.location.line
+
+def _pair_by_line(olds, news):
+    """
+    Pair up the results within a bucket, each new result taking the
+    closest remaining old result by line.  Return the (old, new) pairs, and
+    the unpaired old and new results
+    """
+    if len(olds) == 1 and len(news) == 1:
+        return [(olds[0], news[0])], [], []
+    # The remaining old results are held sorted by line, so that the
+    # closest to each new result can be found by bisection rather than by
+    # comparing it against all of them.  Results without a line only pair
+    # up with each other, or else with whatever is left over.
+    def sort_key(result):
+        line = _line(result)
+        return (line is not None, line)
+    lineless = []
+    numbered = []
+    for old in sorted(olds, key=sort_key):
+        if _line(old) is None:
+            lineless.append(old)
+        else:
+            numbered.append(old)
+    lines = [_line(old) for old in numbered]
+    pairs = []
+    unpaired_news = []
+    for new in sorted(news, key=sort_key):
+        newline = _line(new)
+        if newline is None:
+            if lineless:
+                pairs.append((lineless.pop(0), new))
+            elif numbered:
+                del lines[0]
+                pairs.append((numbered.pop(0), new))
+            else:
+                unpaired_news.append(new)
+            continue
+        if not numbered:
+            if lineless:
+                pairs.append((lineless.pop(0), new))
+            else:
+                unpaired_news.append(new)
+            continue
+        # Take the first of the closest results, either at or above the
+        # new result's line or the run just below it (preferring below on
+        # a tie)
+        i = bisect.bisect_left(lines, newline)
+        if i == len(lines) or (
+                i > 0 and newline - lines[i - 1] <= lines[i] - newline):
+            i = bisect.bisect_left(lines, lines[i - 1])
+        del lines[i]
+        pairs.append((numbered.pop(i), new))
+    return pairs, lineless + numbered, unpaired_news
+
+def diff(old, new):
+    """
+    Compare the results of two Analysis instances, returning an
+    AnalysisDiff
+    """
+    assert isinstance(old, Analysis)
+    assert isinstance(new, Analysis)
+
+    # Pass 1: exact matches, by fingerprint
+    old_by_fingerprint = {}
+    for result, fingerprint in zip(old.results, old.fingerprints()):
+        old_by_fingerprint.setdefault(fingerprint, []).append(result)
+    # (so that duplicates are matched in order, by popping from the end)
+    for candidates in old_by_fingerprint.values():
+        candidates.reverse()
+    unchanged = []
+    unmatched_news = []
+    for result, fingerprint in zip(new.results, new.fingerprints()):
+        candidates = old_by_fingerprint.get(fingerprint)
+        if candidates:
+            unchanged.append((candidates.pop(), result))
+        else:
+            unmatched_news.append(result)
+
+    # Pass 2: matches ignoring lines (and the generator and CWE), by bucket
+    normalized_paths = {}
+    buckets = {}
+    for candidates in old_by_fingerprint.values():
+        for result in candidates:
+            key = _bucket_key(result, normalized_paths)
+            buckets.setdefault(key, ([], []))[0].append(result)
+    for result in unmatched_news:
+        key = _bucket_key(result, normalized_paths)
+        buckets.setdefault(key, ([], []))[1].append(result)
+    fixed_set = set()
+    new_set = set()
+    for olds, news in buckets.values():
+        if olds and news:
+            pairs, olds, news = _pair_by_line(olds, news)
+            unchanged.extend(pairs)
+        fixed_set.update(id(result) for result in olds)
+        new_set.update(id(result) for result in news)
+
+    # (report the new and fixed results in their original order)
+    return AnalysisDiff(
+        new=[result for result in new.results if id(result) in new_set],
+        fixed=[result for result in old.results if id(result) in fixed_set],
+        unchanged=unchanged)
@@ -0,0 +1,545 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+
+# A small language for filtering results, e.g.:
+#
+#   cwe in (401, 476) and file ~ "src/**" and testid != "unusedVariable"
+#
+# An expression is parsed once, into a Filter, which compiles it into a
+# Python function testing a single result (built with exec, as for the
+# methods generated in firehose.model).
+#
+# Given an AnalysisIndex or a Store, Filter.select() pushes the parts of the
+# expression that it can down into their indexes, rather than testing
+# every result: each top-level "and" clause that only involves one of the
+# indexed keys is evaluated against the distinct values of that key, and
+# the values it accepts become a criterion for AnalysisIndex.query() or
+# Store.query().  The whole expression is then tested against the results
+# of the query.
+#
+# Usage:
+#   python -m firehose.filter [-o OUTPUT] [--count] EXPRESSION [INPUT]
+#   python -m firehose.filter --store DATABASE [--count] EXPRESSION
+
+import argparse
+import re
+import sys
+
+from six import integer_types, string_types
+
+from firehose.index import AnalysisIndex
+from firehose.model import Analysis, AnalysisReader, AnalysisWriter, Issue, \
+    Failure, Info
+from firehose.store import Store
+
+class FilterError(ValueError):
+    """
+    A syntax or type error within a filter expression
+    """
+    def __init__(self, message, text, offset):
+        ValueError.__init__(self, '%s at offset %i: %r'
+                            % (message, offset, text))
+        self.text = text
+        self.offset = offset
+
+# The fields that can be tested, mapped to their type and to the Python
+# expression getting them from "result"
+FIELDS = {
+    'kind': (str, '_KINDS.get(result.__class__)'),
+    'cwe': (int, "getattr(result, 'cwe', None)"),
+    'testid': (str, "getattr(result, 'testid', None)"),
+    'failureid': (str, "getattr(result, 'failureid', None)"),
+    'infoid': (str, "getattr(result, 'infoid', None)"),
+    'severity': (str, "getattr(result, 'severity', None)"),
+    'file': (str, 'result.location.file.givenpath'
+             ' if result.location is not None else None'),
+    'function': (str, 'result.location.function.name'
+                 ' if result.location is not None'
+                 ' and result.location.function is not None else None'),
+    'line': (int, 'result.location.line if result.location is not None'
+             ' else None'),
+    'column': (int, 'result.location.column if result.location is not None'
+               ' else None'),
+    'message': (str, 'result.message.text if result.message is not None'
+                ' else None'),
+    'notes': (str, "result.notes.text if getattr(result, 'notes', None)"
+              ' is not None else None'),
+}
+
+_KINDS = {Issue: 'issue', Failure: 'failure', Info: 'info'}
+
+# The fields that AnalysisIndex and Store can query by
+INDEXED_FIELDS = frozenset(['file', 'function', 'testid', 'cwe',
+                            'severity'])
+
+# The most values that a clause can accept for it to be pushed down into a
+# Store (each value becoming a parameter of the SQL query)
+MAX_STORE_VALUES = 500
+
+_TOKEN = re.compile(r'''
+    \s*(?:
+      (?P<number>-?[0-9]+)
+    | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+    | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<op>==|!=|<=|>=|!~|<|>|~|\(|\)|,)
+    )''', re.VERBOSE)
+
+_ESCAPE = re.compile(r'\\(.)')
+
+_KEYWORDS = frozenset(['and', 'or', 'not', 'in', 'null'])
+
+def _tokenize(text):
+    """
+    Split an expression into a list of (kind, value, offset) tokens, where
+    kind is one of "number", "string", "name", "keyword", "op" or "end"
+    """
+    tokens = []
+    pos = 0
+    text_len = len(text)
+    while True:
+        while pos < text_len and text[pos].isspace():
+            pos += 1
+        if pos == text_len:
+            tokens.append(('end', None, pos))
+            return tokens
+        match = _TOKEN.match(text, pos)
+        if match is None:
+            raise FilterError('unexpected character %r' % text[pos],
+                              text, pos)
+        kind = match.lastgroup
+        value = match.group(kind)
+        offset = match.start(kind)
+        if kind == 'number':
+            value = int(value)
+        elif kind == 'string':
+            value = _ESCAPE.sub(r'\1', value[1:-1])
+        elif kind == 'name' and value in _KEYWORDS:
+            kind = 'keyword'
+        tokens.append((kind, value, offset))
+        pos = match.end()
+
+class _Parser(object):
+    """
+    Recursive-descent parser, building a tree of tuples:
+
+      ('or', [nodes]), ('and', [nodes]), ('not', node), and
+      ('compare', field, op, literal), where op is one of "==", "!=", "<",
+      "<=", ">", ">=", "~", "!~", "in" and "not in", and literal is an
+      int, a string, None (for "null"), or for "in", a tuple of them
+    """
+    def __init__(self, text):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def error(self, message, token=None):
+        if token is None:
+            token = self.tokens[self.pos]
+        return FilterError(message, self.text, token[2])
+
+    def peek(self, kind, value=None):
+        token = self.tokens[self.pos]
+        return token[0] == kind and (value is None or token[1] == value)
+
+    def accept(self, kind, value=None):
+        if self.peek(kind, value):
+            self.pos += 1
+            return self.tokens[self.pos - 1]
+
+    def expect(self, kind, value=None):
+        token = self.accept(kind, value)
+        if token is None:
+            raise self.error('expected %s' % (repr(value) if value else kind))
+        return token
+
+    def parse(self):
+        node = self.parse_or()
+        if not self.peek('end'):
+            raise self.error('unexpected %r' % (self.tokens[self.pos][1], ))
+        return node
+
+    def parse_or(self):
+        nodes = [self.parse_and()]
+        while self.accept('keyword', 'or'):
+            nodes.append(self.parse_and())
+        return nodes[0] if len(nodes) == 1 else ('or', nodes)
+
+    def parse_and(self):
+        nodes = [self.parse_not()]
+        while self.accept('keyword', 'and'):
+            nodes.append(self.parse_not())
+        return nodes[0] if len(nodes) == 1 else ('and', nodes)
+
+    def parse_not(self):
+        if self.accept('keyword', 'not'):
+            return ('not', self.parse_not())
+        if self.accept('op', '('):
+            node = self.parse_or()
+            self.expect('op', ')')
+            return node
+        return self.parse_comparison()
+
+    def parse_comparison(self):
+        token = self.expect('name')
+        field = token[1]
+        if field not in FIELDS:
+            raise self.error('unknown field %r' % field, token)
+        fieldtype = FIELDS[field][0]
+        if self.accept('keyword', 'in'):
+            op = 'in'
+        elif self.accept('keyword', 'not'):
+            self.expect('keyword', 'in')
+            op = 'not in'
+        else:
+            op = self.expect('op')[1]
+            if op in ('(', ')', ','):
+                raise self.error('expected a comparison',
+                                 self.tokens[self.pos - 1])
+        if op in ('in', 'not in'):
+            self.expect('op', '(')
+            literals = [self.parse_literal(fieldtype)]
+            while self.accept('op', ','):
+                literals.append(self.parse_literal(fieldtype))
+            self.expect('op', ')')
+            types = set(type(literal) for literal in literals
+                        if literal is not None)
+            if len(types) > 1:
+                raise self.error('mixed types within (...)',
+                                 self.tokens[self.pos - 1])
+            return ('compare', field, op, tuple(literals))
+        token = self.tokens[self.pos]
+        literal = self.parse_literal(fieldtype)
+        if op in ('~', '!~'):
+            if fieldtype is not str or not isinstance(literal, string_types):
+                raise self.error('%s needs a string field and a glob pattern'
+                                 % op, token)
+        elif op not in ('==', '!=') and literal is None:
+            raise self.error('null can only be compared with == and !=',
+                             token)
+        return ('compare', field, op, literal)
+
+    def parse_literal(self, fieldtype):
+        token = self.tokens[self.pos]
+        if self.accept('keyword', 'null'):
+            return None
+        if self.accept('number'):
+            return token[1]
+        if self.accept('string'):
+            if fieldtype is int:
+                raise self.error('expected a number', token)
+            return token[1]
+        raise self.error('expected a value')
+
+_GLOB_CHARS = re.compile(r'[*?[]')
+
+def glob_to_regex(pattern):
+    """
+    Translate a glob pattern into a regular expression matching the whole
+    of a path: "*" and "?" match within one path component, "**" matches
+    across components, and "**/" also matches no directories at all
+    """
+    parts = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+            continue
+        if c == '*':
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+        elif c == '[' and ']' in pattern[i + 2:]:
+            end = pattern.index(']', i + 2)
+            chars = pattern[i + 1:end]
+            if chars.startswith('!'):
+                chars = '^' + chars[1:]
+            parts.append('[%s]' % chars.replace('\\', '\\\\'))
+            i = end
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return '(?s)%s\\Z' % ''.join(parts)
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+# Ordered comparisons, false when the value is absent
+_ORDERED = {
+    '<': lambda value, literal: value is not None and value < literal,
+    '<=': lambda value, literal: value is not None and value <= literal,
+    '>': lambda value, literal: value is not None and value > literal,
+    '>=': lambda value, literal: value is not None and value >= literal,
+}
+
+def _fields_of(node):
+    if node[0] == 'compare':
+        return set([node[1]])
+    if node[0] == 'not':
+        return _fields_of(node[1])
+    return set().union(*[_fields_of(child) for child in node[1]])
+
+class _Compiler(object):
+    """
+    Generates the Python source of an expression, gathering the constants
+    that it refers to.
+
+    Fields are got from "result" where they are tested, so that the "and"
+    and "or" operators skip getting the fields of clauses that they don't
+    need to evaluate; or if "field" is given, the expression tests a
+    single value of that field, as "value"
+    """
+    def __init__(self, field=None):
+        self.field = field
+        self.namespace = {'_KINDS': _KINDS, '_as_int': _as_int}
+
+    def constant(self, value):
+        name = '_c%i' % len(self.namespace)
+        self.namespace[name] = value
+        return name
+
+    def compile(self, node):
+        kind = node[0]
+        if kind == 'and' or kind == 'or':
+            return '(%s)' % (' %s ' % kind).join(self.compile(child)
+                                                for child in node[1])
+        if kind == 'not':
+            return '(not %s)' % self.compile(node[1])
+        _, field, op, literal = node
+        if self.field is None:
+            var = '(%s)' % FIELDS[field][1]
+        else:
+            var = 'value'
+        if op in ('in', 'not in'):
+            example = ([value for value in literal if value is not None]
+                       or [None])[0]
+        else:
+            example = literal
+        if (FIELDS[field][0] is str
+            and isinstance(example, integer_types)):
+            var = '_as_int(%s)' % var
+        if literal is None:
+            return '(%s %s None)' % (var, 'is' if op == '==' else 'is not')
+        if op in ('in', 'not in'):
+            return '(%s %s %s)' % (var, op,
+                                   self.constant(frozenset(literal)))
+        if op in ('~', '!~'):
+            # (a helper taking the value once, to avoid getting it twice)
+            prefix = literal[:-2]
+            if literal.endswith('**') and not _GLOB_CHARS.search(prefix):
+                # (the common case of everything below a directory)
+                def matches(value, prefix=prefix):
+                    return value is not None and value.startswith(prefix)
+            else:
+                regex = re.compile(glob_to_regex(literal))
+                def matches(value, match=regex.match):
+                    return value is not None and match(value) is not None
+            test = '%s(%s)' % (self.constant(matches), var)
+            return test if op == '~' else '(not %s)' % test
+        if op in ('==', '!='):
+            return '(%s %s %s)' % (var, op, self.constant(literal))
+        test = self.constant(_ORDERED[op])
+        return '%s(%s, %s)' % (test, var, self.constant(literal))
+
+    def build(self, node):
+        """
+        Build a function from a tree, taking a result (or a value)
+        """
+        source = ('def predicate(%s):\n    return %s'
+                  % ('result' if self.field is None else 'value',
+                     self.compile(node)))
+        exec(source, self.namespace)
+        return self.namespace['predicate']
+
+class Filter(object):
+    """
+    A parsed filter expression, callable on a result to test whether it
+    matches
+    """
+    def __init__(self, text):
+        self.text = text
+        self.tree = _Parser(text).parse()
+        self.fields = frozenset(_fields_of(self.tree))
+        self.predicate = _Compiler().build(self.tree)
+
+        # The top-level "and" clauses involving a single indexed field,
+        # compiled into tests of the values of that field:
+        clauses = self.tree[1] if self.tree[0] == 'and' else [self.tree]
+        self._value_predicates = []
+        for clause in clauses:
+            fields = _fields_of(clause)
+            if len(fields) == 1 and fields <= INDEXED_FIELDS:
+                field, = fields
+                self._value_predicates.append(
+                    (field, _Compiler(field).build(clause)))
+
+    def __repr__(self):
+        return 'Filter(%r)' % self.text
+
+    def __call__(self, result):
+        return self.predicate(result)
+
+    def filter(self, results):
+        """
+        Get the list of the given results that match
+        """
+        predicate = self.predicate
+        return [result for result in results if predicate(result)]
+
+    def criteria(self, get_values, max_values=None):
+        """
+        Get the criteria (as for AnalysisIndex.query) that results must
+        match for the expression to be true, given a function returning
+        the distinct values of an indexed field.  Clauses accepting more
+        than max_values values are skipped.
+        """
+        criteria = {}
+        for field, predicate in self._value_predicates:
+            # (None is always a candidate, for results without the field)
+            accepted = set(value
+                           for value in list(get_values(field)) + [None]
+                           if predicate(value))
+            if field in criteria:
+                accepted &= criteria[field]
+            elif max_values is not None and len(accepted) > max_values:
+                continue
+            criteria[field] = accepted
+        return criteria
+
+    def select(self, source):
+        """
+        Get the matching results of an Analysis, an AnalysisIndex (using
+        its indexes) or a Store (querying its database), in order
+        """
+        if isinstance(source, Analysis):
+            return self.filter(source.results)
+        if isinstance(source, AnalysisIndex):
+            criteria = self.criteria(lambda field: source.get_index(field))
+            if not criteria:
+                return self.filter(source.analysis.results)
+            return self.filter(source.query(**criteria))
+        if isinstance(source, Store):
+            criteria = self.criteria(source.values, MAX_STORE_VALUES)
+            return self.filter(source.query(**criteria))
+        raise TypeError('cannot filter %r' % (source, ))
+
+def describe_result(result):
+    """
+    Get a one-line description of a result, in the style of a compiler
+    diagnostic
+    """
+    location = result.location
+    if location is not None:
+        where = '%s:%s:%s' % (location.file.givenpath, location.line,
+                              location.column)
+    else:
+        where = '(no location)'
+    if isinstance(result, Issue):
+        kind = 'issue'
+        ident = result.testid
+    elif isinstance(result, Failure):
+        kind = 'failure'
+        ident = result.failureid
+    else:
+        kind = 'info'
+        ident = result.infoid
+    if ident is not None:
+        kind += '[%s]' % ident
+    if result.message is not None:
+        return '%s: %s: %s' % (where, kind, result.message.text)
+    return '%s: %s' % (where, kind)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Select the results of a Firehose XML report (or of a'
+        ' database built with firehose.store) matching an expression')
+    parser.add_argument('expression', metavar='EXPRESSION',
+                        help='filter expression, e.g. \'cwe in (401, 476)'
+                        ' and file ~ "src/**"\'')
+    parser.add_argument('input', metavar='INPUT', nargs='?',
+                        help='Firehose XML report (default: stdin)')
+    parser.add_argument('-o', '--output', metavar='OUTPUT',
+                        help='where to write the report of the matching'
+                        ' results (default: stdout)')
+    parser.add_argument('--store', metavar='DATABASE',
+                        help='list the matching results within a database'
+                        ' built with firehose.store, rather than reading a'
+                        ' report')
+    parser.add_argument('--count', action='store_true',
+                        help='just print the number of matching results')
+    args = parser.parse_args(argv)
+    try:
+        filter_ = Filter(args.expression)
+    except FilterError as exc:
+        parser.error(str(exc))
+
+    if args.store is not None:
+        if args.input is not None:
+            parser.error('INPUT cannot be used with --store')
+        with Store(args.store) as store:
+            results = filter_.select(store)
+        if args.count:
+            print(len(results))
+        else:
+            for result in results:
+                print(describe_result(result))
+        return
+
+    if args.input is not None:
+        infile = open(args.input, 'rb')
+    else:
+        infile = getattr(sys.stdin, 'buffer', sys.stdin)
+    try:
+        reader = AnalysisReader(infile)
+        if args.count:
+            print(sum(1 for result in reader if filter_.predicate(result)))
+            return
+        if args.output is not None:
+            outfile = open(args.output, 'wb')
+        else:
+            outfile = getattr(sys.stdout, 'buffer', sys.stdout)
+        try:
+            writer = AnalysisWriter(outfile, reader.metadata)
+            num_results = 0
+            for result in reader:
+                num_results += 1
+                if filter_.predicate(result):
+                    writer.write_result(result)
+            writer.customfields = reader.customfields
+            writer.close()
+        finally:
+            if args.output is not None:
+                outfile.close()
+            else:
+                outfile.flush()
+    finally:
+        if args.input is not None:
+            infile.close()
+    sys.stderr.write('%i of %i results matched\n'
+                     % (writer.num_results, num_results))
+
+if __name__ == '__main__':
+    main()
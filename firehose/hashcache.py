@@ -0,0 +1,128 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# A persistent cache of the digests of source files, for use by
+# Analysis.fixup_files, so that files that haven't changed since they were
+# last hashed (by any process) needn't be read again.
+#
+# The cache is an SQLite database holding a row per (absolute path,
+# algorithm), recording the size, modification time (in nanoseconds) and
+# inode number of the file when it was hashed, along with the digest.  A
+# row is only used if all of these still match the file.  SQLite's locking
+# makes it safe for several processes to use the same cache concurrently;
+# the database is put in WAL mode where possible, so that readers don't
+# block on writers.
+
+import os
+import sqlite3
+
+from firehose.model import _hash_paths
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS hashes (
+    abspath TEXT NOT NULL,
+    alg TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    hexdigest TEXT NOT NULL,
+    PRIMARY KEY (abspath, alg)
+)
+'''
+
+def stat_key(path):
+    """
+    Get the (size, mtime_ns, ino) triple identifying the current content
+    of the file at the given path (also used by firehose.offsets to spot
+    stale indexes)
+    """
+    st = os.stat(path)
+    mtime_ns = getattr(st, 'st_mtime_ns', None)
+    if mtime_ns is None:
+        # (Python 2)
+        mtime_ns = int(st.st_mtime * 1000000000)
+    return (st.st_size, mtime_ns, st.st_ino)
+
+class HashCache(object):
+    """
+    A persistent cache of file digests, stored in the SQLite database at
+    the given path (created if need be).  Pass it to
+    Analysis.fixup_files(hashcache=...).
+
+    It can be used as a context manager, closing the database on exit.
+    """
+    def __init__(self, path, timeout=60.0):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=timeout)
+        try:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+        except sqlite3.DatabaseError:
+            # e.g. on a network filesystem; the default journal still
+            # provides safe concurrent access
+            pass
+        with self.conn:
+            self.conn.execute(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def lookup(self, path, alg):
+        """
+        Get the cached hexdigest of the file at the given path, or None if
+        there isn't one matching the file's current state
+        """
+        abspath = os.path.abspath(path)
+        row = self.conn.execute('SELECT size, mtime_ns, ino, hexdigest'
+                                ' FROM hashes WHERE abspath = ? AND alg = ?',
+                                (abspath, alg)).fetchone()
+        if row is not None and tuple(row[:3]) == stat_key(abspath):
+            return row[3]
+
+    def hash_paths(self, paths, alg, threads=None):
+        """
+        Get the hexdigests of the files at the given paths, in order, from
+        the cache where possible, hashing (in parallel) and recording the
+        rest
+        """
+        hexdigests = [self.lookup(path, alg) for path in paths]
+        misses = [index for index, hexdigest in enumerate(hexdigests)
+                  if hexdigest is None]
+        if not misses:
+            return hexdigests
+        keys = [stat_key(paths[index]) for index in misses]
+        new_hexdigests = _hash_paths([paths[index] for index in misses],
+                                     alg, threads)
+        rows = []
+        for index, key, hexdigest in zip(misses, keys, new_hexdigests):
+            hexdigests[index] = hexdigest
+            # Don't record the digest if the file changed whilst it was
+            # being hashed, as it might not match either state:
+            if stat_key(paths[index]) == key:
+                rows.append((os.path.abspath(paths[index]), alg)
+                            + key + (hexdigest, ))
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO hashes'
+                                  ' (abspath, alg, size, mtime_ns, ino,'
+                                  '  hexdigest)'
+                                  ' VALUES (?, ?, ?, ?, ?, ?)', rows)
+        return hexdigests
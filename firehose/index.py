@@ -0,0 +1,386 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Secondary indexes over the results of an Analysis, for answering queries
+# such as "all issues in foo.c" or "all CWE-401" without scanning every
+# result.
+#
+# Each index is a dict mapping a value (e.g. a path) to the "posting list"
+# of the positions within analysis.results of the results having that
+# value, in increasing order.  Indexes are built on first use, and are
+# extended to cover any results appended to the analysis since they were
+# last used.  Results are assumed not to be modified, removed or reordered
+# once indexed: call invalidate() after doing so.
+#
+# LineIndex similarly indexes results by the lines that their locations
+# cover within each file, for finding those touched by a set of changed
+# lines, such as a unified diff.
+
+from bisect import bisect_left
+import re
+
+from firehose.model import Analysis, normalize_fingerprint_path
+
+def _get_file(result):
+    location = result.location
+    if location is not None:
+        return location.file.givenpath
+
+def _get_function(result):
+    location = result.location
+    if location is not None and location.function is not None:
+        return location.function.name
+
+def _get_testid(result):
+    return getattr(result, 'testid', None)
+
+def _get_cwe(result):
+    return getattr(result, 'cwe', None)
+
+def _get_severity(result):
+    return getattr(result, 'severity', None)
+
+class AnalysisIndex(object):
+    """
+    Lazily-built secondary indexes over the results of an Analysis, by
+    "file" (the given path), "function", "testid", "cwe" and "severity".
+    (Failures and Infos have no testid, cwe or severity, so they are
+    indexed under None for those keys)
+    """
+    KEYS = {'file': _get_file,
+            'function': _get_function,
+            'testid': _get_testid,
+            'cwe': _get_cwe,
+            'severity': _get_severity}
+
+    def __init__(self, analysis):
+        assert isinstance(analysis, Analysis)
+        self.analysis = analysis
+        # Mapping from key to (index dict, number of results indexed)
+        self._indexes = {}
+
+    def append(self, result):
+        """
+        Append a result to the analysis (any indexes already built are
+        extended to cover it when next used)
+        """
+        self.analysis.results.append(result)
+
+    def invalidate(self):
+        """
+        Discard the indexes, e.g. after results have been modified or
+        removed
+        """
+        self._indexes = {}
+
+    def get_index(self, key):
+        """
+        Get the dict mapping each value of the given key to the sorted
+        list of positions of the results having that value, building or
+        extending it as necessary
+        """
+        getter = self.KEYS.get(key)
+        if getter is None:
+            raise ValueError('unknown key: %r' % key)
+        results = self.analysis.results
+        index, num_indexed = self._indexes.get(key, ({}, 0))
+        if num_indexed > len(results):
+            # (results have been removed)
+            index, num_indexed = {}, 0
+        if num_indexed < len(results):
+            for position in range(num_indexed, len(results)):
+                value = getter(results[position])
+                postings = index.get(value)
+                if postings is None:
+                    index[value] = [position]
+                else:
+                    postings.append(position)
+            self._indexes[key] = (index, len(results))
+        return index
+
+    def counts(self, key):
+        """
+        Get a dict mapping each value of the given key to the number of
+        results having that value
+        """
+        return dict((value, len(postings))
+                    for value, postings in self.get_index(key).items())
+
+    def positions(self, **criteria):
+        """
+        Get the sorted list of positions within analysis.results of the
+        results matching all of the given criteria, each being a key and a
+        value (or a set/list/tuple of acceptable values)
+        """
+        postings_lists = []
+        for key, wanted in criteria.items():
+            index = self.get_index(key)
+            if not isinstance(wanted, (set, frozenset, list, tuple)):
+                postings = index.get(wanted, [])
+            else:
+                # (each result has a single value for each key, so the
+                # posting lists are disjoint)
+                postings = sorted(position
+                                  for value in set(wanted)
+                                  for position in index.get(value, []))
+            if not postings:
+                return []
+            postings_lists.append(postings)
+        if not postings_lists:
+            return list(range(len(self.analysis.results)))
+
+        # Intersect the posting lists, walking the shortest one, and
+        # binary-searching within the others:
+        postings_lists.sort(key=len)
+        result = postings_lists[0]
+        for postings in postings_lists[1:]:
+            matches = []
+            lo = 0
+            hi = len(postings)
+            for position in result:
+                lo = bisect_left(postings, position, lo, hi)
+                if lo == hi:
+                    break
+                if postings[lo] == position:
+                    matches.append(position)
+            result = matches
+            if not result:
+                break
+        return list(result)
+
+    def query(self, **criteria):
+        """
+        Get the results matching all of the given criteria, in order, e.g.:
+
+          index.query(file='foo.c', cwe=401)
+          index.query(testid=('format', 'format-security'))
+        """
+        results = self.analysis.results
+        return [results[position]
+                for position in self.positions(**criteria)]
+
+#
+# Line-range queries
+#
+
+def _build_interval_tree(intervals):
+    """
+    Build a centered interval tree from a list of (start, end, position)
+    triples, returning nested (center, by_start, by_end, left, right)
+    tuples, or None if there are no intervals.
+
+    Each node holds the intervals containing its center, sorted by start
+    and by decreasing end; its subtrees hold the intervals wholly before
+    and wholly after the center
+    """
+    if not intervals:
+        return None
+    endpoints = sorted(interval[0] for interval in intervals)
+    center = endpoints[len(endpoints) // 2]
+    before = []
+    after = []
+    here = []
+    for interval in intervals:
+        if interval[1] < center:
+            before.append(interval)
+        elif interval[0] > center:
+            after.append(interval)
+        else:
+            here.append(interval)
+    return (center,
+            sorted(here),
+            sorted(here, key=lambda interval: interval[1], reverse=True),
+            _build_interval_tree(before),
+            _build_interval_tree(after))
+
+def _query_interval_tree(node, lo, hi, found):
+    """
+    Append to found the positions of the intervals within the tree that
+    overlap [lo, hi], taking O(log n + k) time
+    """
+    while node is not None:
+        center, by_start, by_end, left, right = node
+        if hi < center:
+            # Only intervals starting by hi can overlap:
+            for start, end, position in by_start:
+                if start > hi:
+                    break
+                found.append(position)
+            node = left
+        elif lo > center:
+            # Only intervals ending at or after lo can overlap:
+            for start, end, position in by_end:
+                if end < lo:
+                    break
+                found.append(position)
+            node = right
+        else:
+            found.extend(position for start, end, position in by_start)
+            _query_interval_tree(left, lo, hi, found)
+            node = right
+
+class LineIndex(object):
+    """
+    An index of the results of an Analysis by the lines that their
+    locations cover (the line of their point, or the lines spanned by
+    their range), with an interval tree per file (by given path,
+    normalized as for fingerprints), for finding the results touching
+    given lines in O(log n + k) time.
+
+    As with AnalysisIndex, the trees are built on first use, and rebuilt
+    to cover results appended since.
+    """
+    def __init__(self, analysis):
+        assert isinstance(analysis, Analysis)
+        self.analysis = analysis
+        self.invalidate()
+
+    def invalidate(self):
+        # Mapping from normalized path to list of (start, end, position)
+        self._intervals = {}
+        self._num_indexed = 0
+        # Mapping from normalized path to interval tree, for those paths
+        # whose trees are up-to-date
+        self._trees = {}
+
+    def _update(self):
+        results = self.analysis.results
+        if self._num_indexed > len(results):
+            self.invalidate()
+        for position in range(self._num_indexed, len(results)):
+            location = results[position].location
+            if location is None:
+                continue
+            if location.point is not None:
+                start = end = location.point.line
+            elif location.range_ is not None:
+                start = location.range_.start.line
+                end = location.range_.end.line
+            else:
+                continue
+            path = normalize_fingerprint_path(location.file.givenpath)
+            self._intervals.setdefault(path, []).append((start, end,
+                                                         position))
+            self._trees.pop(path, None)
+        self._num_indexed = len(results)
+
+    def positions(self, path, start, end):
+        """
+        Get the sorted positions within analysis.results of the results in
+        the file with the given path whose locations overlap the lines
+        start to end (inclusive)
+        """
+        self._update()
+        path = normalize_fingerprint_path(path)
+        tree = self._trees.get(path)
+        if tree is None:
+            tree = self._trees[path] = \
+                _build_interval_tree(self._intervals.get(path, []))
+        found = []
+        _query_interval_tree(tree, start, end, found)
+        found.sort()
+        return found
+
+    def overlapping(self, path, start, end):
+        """
+        Get the results in the file with the given path whose locations
+        overlap the lines start to end (inclusive)
+        """
+        results = self.analysis.results
+        return [results[position]
+                for position in self.positions(path, start, end)]
+
+    def touched_by(self, hunks):
+        """
+        Get the results whose locations overlap any of the given
+        (path, start, end) hunks, in order
+        """
+        positions = set()
+        for path, start, end in hunks:
+            positions.update(self.positions(path, start, end))
+        results = self.analysis.results
+        return [results[position] for position in sorted(positions)]
+
+_HUNK_HEADER = re.compile(r'^@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+def parse_unified_diff(lines, strip=1):
+    """
+    Parse a unified diff (an iterable of lines, e.g. an open file),
+    returning a list of (path, start, end) hunks, giving the ranges of
+    lines within the new version of each file that were added or changed.
+    A deletion is treated as changing the line following it, so that
+    results there are also selected.
+
+    strip is the number of leading components to remove from the paths
+    (as with "patch -p"), so that "+++ b/src/foo.c" gives "src/foo.c"
+    """
+    hunks = []
+    path = None
+    # Line number within the new version of the file
+    line = 0
+    # Lines of the current hunk still to be seen, within each version
+    old_remaining = new_remaining = 0
+    # Start of the current run of added/removed lines, if any
+    run_start = None
+    for text in lines:
+        if old_remaining <= 0 and new_remaining <= 0:
+            if text.startswith('+++ '):
+                name = text[4:].rstrip('\r\n').split('\t')[0]
+                if name == '/dev/null':
+                    path = None
+                else:
+                    path = '/'.join(name.split('/')[strip:])
+                continue
+            match = _HUNK_HEADER.match(text)
+            if match:
+                old_remaining = int(match.group(1) or 1)
+                line = int(match.group(2))
+                new_remaining = int(match.group(3) or 1)
+                # (a deletion of a whole file has "+0,0")
+                line = max(line, 1)
+            continue
+        if text.startswith('+'):
+            if run_start is None:
+                run_start = line
+            line += 1
+            new_remaining -= 1
+        elif text.startswith('-'):
+            if run_start is None:
+                run_start = line
+            old_remaining -= 1
+        elif text.startswith('\\'):
+            # "\ No newline at end of file"
+            continue
+        else:
+            if run_start is not None:
+                hunks.append((path, run_start, max(run_start, line - 1)))
+                run_start = None
+            line += 1
+            old_remaining -= 1
+            new_remaining -= 1
+        if (run_start is not None
+                and old_remaining <= 0 and new_remaining <= 0):
+            hunks.append((path, run_start, max(run_start, line - 1)))
+            run_start = None
+    return [hunk for hunk in hunks if hunk[0] is not None]
+
+def results_touched_by_diff(analysis, lines, strip=1):
+    """
+    Get the results of the given Analysis whose locations overlap the
+    lines added or changed by a unified diff (see parse_unified_diff)
+    """
+    return LineIndex(analysis).touched_by(parse_unified_diff(lines, strip))
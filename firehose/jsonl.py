@@ -0,0 +1,149 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# JSON Lines serialization of Analysis instances.
+#
+# Each analysis is written as a header line:
+#   {"type": "Analysis", "metadata": {...}, "customfields": {...} or null}
+# followed by one line per result, each being the JSON form of that
+# Issue/Failure/Info (as per Result.to_json).
+#
+# Results can thus be appended one at a time, and consumed while the file
+# is still being written.  Files from several writers can simply be
+# concatenated: each result belongs to the analysis of the most recent
+# header line before it.
+
+from collections import OrderedDict
+import json
+
+from firehose.model import Analysis, Metadata, Result, CustomFields
+
+class JsonLinesWriter(object):
+    """
+    Writes an analysis in JSON Lines form to a file-like object opened in
+    text mode: the header line is written on construction, and then one
+    line per result passed to write_result().
+
+    Each line is passed to a single write() call; with autoflush=True the
+    file is also flushed after each line, so that readers following the
+    file see each result as soon as it has been written.
+    """
+    def __init__(self, fileobj, metadata, customfields=None,
+                 autoflush=False):
+        assert isinstance(metadata, Metadata)
+        if customfields is not None:
+            assert isinstance(customfields, CustomFields)
+        self.fileobj = fileobj
+        self.autoflush = autoflush
+        header = {'type': 'Analysis',
+                  'metadata': metadata.to_json(),
+                  'customfields': (customfields.to_json()
+                                   if customfields is not None else None)}
+        self._write_line(header)
+
+    def _write_line(self, jsonobj):
+        self.fileobj.write(json.dumps(jsonobj) + '\n')
+        if self.autoflush:
+            self.fileobj.flush()
+
+    def write_result(self, result):
+        assert isinstance(result, Result)
+        self._write_line(result.to_json())
+
+    def write_results(self, results):
+        for result in results:
+            self.write_result(result)
+
+class JsonLinesReader(object):
+    """
+    Reads results lazily from JSON Lines data in a file-like object opened
+    in text mode.
+
+    Iterating yields each Result in turn.  The "metadata" and
+    "customfields" attributes are those of the header line most recently
+    seen, i.e. of the analysis that the most recently yielded result
+    belongs to.
+
+    Iteration stops at the end of the data currently available; a trailing
+    incomplete line is held back until it has been completed, so that
+    iterating again later yields just the results that have been appended
+    since (e.g. to follow the output of a job that is still running).
+    """
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.metadata = None
+        self.customfields = None
+        self._partial = ''
+
+    def iter_records(self):
+        """
+        Generate an Analysis instance (with an empty list of results) for
+        each header line, and a Result instance for each result line
+        """
+        while True:
+            line = self.fileobj.readline()
+            if not line:
+                return
+            if self._partial:
+                line = self._partial + line
+                self._partial = ''
+            if not line.endswith('\n'):
+                self._partial = line
+                return
+            if not line.strip():
+                continue
+            # (keeping the order of custom fields, as on reading XML)
+            jsonobj = json.loads(line, object_pairs_hook=OrderedDict)
+            if jsonobj['type'] == 'Analysis':
+                yield Analysis(Metadata.from_json(jsonobj['metadata']), [],
+                               CustomFields.from_json(jsonobj['customfields']))
+            else:
+                yield Result.from_json(jsonobj)
+
+    def __iter__(self):
+        for record in self.iter_records():
+            if isinstance(record, Analysis):
+                self.metadata = record.metadata
+                self.customfields = record.customfields
+            else:
+                yield record
+
+def write_analysis(analysis, fileobj):
+    """
+    Write the given Analysis to fileobj in JSON Lines form
+    """
+    writer = JsonLinesWriter(fileobj, analysis.metadata,
+                             analysis.customfields)
+    writer.write_results(analysis.results)
+
+def read_analyses(fileobj):
+    """
+    Read JSON Lines data from fileobj, generating an Analysis instance for
+    each header line seen, holding the results that follow it
+    """
+    analysis = None
+    for record in JsonLinesReader(fileobj).iter_records():
+        if isinstance(record, Analysis):
+            if analysis is not None:
+                yield analysis
+            analysis = record
+        else:
+            if analysis is None:
+                raise ValueError('result seen before any header line')
+            analysis.results.append(record)
+    if analysis is not None:
+        yield analysis
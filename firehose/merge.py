@@ -0,0 +1,203 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Merging of many Firehose XML reports (e.g. from several tools run on the
+# same package, or from clang's per-translation-unit reports) into one.
+#
+# The inputs are read in a pool of worker processes.  Each worker parses
+# one report at a time, and sends back its results already serialized,
+# along with their fingerprints (see Result.fingerprint); the main process
+# just drops those whose fingerprint it has already seen, and writes the
+# rest through a single AnalysisWriter, so that the merged report is never
+# held in memory as a whole.  Only a couple of reports per worker are
+# handed to the pool ahead of the writer, so that the results of a few
+# reports at most are held waiting to be written, however quickly the
+# workers outpace it.
+#
+# This happens in two passes over the inputs: the <metadata> of every
+# input is needed to reconcile the metadata of the merged report, which
+# has to be written before any of the results.
+#
+# Usage:
+#   python -m firehose.merge [-j JOBS] [-o OUTPUT] INPUT...
+
+import argparse
+from collections import deque
+from multiprocessing import Pool, cpu_count
+import sys
+
+from six.moves import map
+
+from firehose.model import AnalysisReader, AnalysisWriter, Metadata, \
+    Generator, Stats, CustomFields, serialize_result
+
+def merge_metadata(metadatas):
+    """
+    Reconcile the Metadata of several reports, returning a
+    (Metadata, CustomFields or None) pair for the merged report:
+
+      * if the reports come from more than one generator (by name and
+        version), the merged generator is named after all of them, joined
+        with ", " (without a version), and the custom field "generators"
+        lists each of them
+      * the sut and file are kept if every report that has one agrees
+        on it, and are otherwise dropped
+      * the wallclock times of the reports are summed
+    """
+    generators = []
+    suts = []
+    files = []
+    wallclocktime = None
+    for metadata in metadatas:
+        if metadata.generator not in generators:
+            generators.append(metadata.generator)
+        if metadata.sut is not None and metadata.sut not in suts:
+            suts.append(metadata.sut)
+        if metadata.file_ is not None and metadata.file_ not in files:
+            files.append(metadata.file_)
+        if metadata.stats is not None:
+            wallclocktime = ((wallclocktime or 0.0)
+                             + metadata.stats.wallclocktime)
+
+    customfields = None
+    if len(generators) == 1:
+        generator = generators[0]
+    else:
+        names = []
+        for g in generators:
+            if g.name not in names:
+                names.append(g.name)
+        generator = Generator(name=', '.join(names))
+        customfields = CustomFields()
+        customfields['generators'] = ', '.join(
+            '%s %s' % (g.name, g.version) if g.version else g.name
+            for g in generators)
+    metadata = Metadata(generator,
+                        suts[0] if len(suts) == 1 else None,
+                        files[0] if len(files) == 1 else None,
+                        Stats(wallclocktime)
+                        if wallclocktime is not None else None)
+    return metadata, customfields
+
+def _read_metadata(path):
+    with open(path, 'rb') as f:
+        return AnalysisReader(f).metadata
+
+def _read_results(path):
+    """
+    Read the report at path, returning a list of (fingerprint, serialized
+    result) pairs, and its CustomFields
+    """
+    with open(path, 'rb') as f:
+        reader = AnalysisReader(f)
+        generator = reader.metadata.generator.name
+        results = [(result.fingerprint(generator), serialize_result(result))
+                   for result in reader]
+        return results, reader.customfields
+
+def _imap_bounded(pool, func, items, limit):
+    """
+    Like pool.imap(func, items), yielding the results in order, but with
+    at most limit items submitted to the pool and not yet yielded (imap
+    submits them all at once, so the results pile up in this process if
+    they're produced faster than they're consumed)
+    """
+    pending = deque()
+    for item in items:
+        if len(pending) == limit:
+            yield pending.popleft().get()
+        pending.append(pool.apply_async(func, (item, )))
+    while pending:
+        yield pending.popleft().get()
+
+def merge(paths, fileobj, processes=None):
+    """
+    Merge the Firehose XML reports at the given paths into one, writing
+    it to fileobj (opened in binary mode), and dropping results that
+    duplicate one earlier in the inputs (by fingerprint).
+
+    The reports are read using a pool of the given number of worker
+    processes (by default, one per CPU); with processes=1 they are read
+    within this process.
+
+    Return a (number of results written, number of duplicates dropped)
+    pair.
+    """
+    paths = list(paths)
+    if not paths:
+        raise ValueError('no reports to merge')
+    if processes == 1:
+        pool = None
+        imap = map
+    else:
+        if processes is None:
+            processes = cpu_count()
+        pool = Pool(processes)
+        def imap(func, items):
+            return _imap_bounded(pool, func, items, 2 * processes)
+    try:
+        metadata, customfields = merge_metadata(imap(_read_metadata, paths))
+        writer = AnalysisWriter(fileobj, metadata)
+        seen = set()
+        num_duplicates = 0
+        for results, input_customfields in imap(_read_results, paths):
+            for fingerprint, data in results:
+                if fingerprint in seen:
+                    num_duplicates += 1
+                    continue
+                seen.add(fingerprint)
+                writer.write_serialized_result(data)
+            # (custom fields of the inputs: the first value for each name
+            # wins)
+            if input_customfields:
+                if customfields is None:
+                    customfields = CustomFields()
+                for name, value in input_customfields.items():
+                    if name not in customfields:
+                        customfields[name] = value
+        writer.customfields = customfields
+        writer.close()
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return writer.num_results, num_duplicates
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Merge Firehose XML reports, dropping duplicate results')
+    parser.add_argument('inputs', metavar='INPUT', nargs='+',
+                        help='Firehose XML report to merge')
+    parser.add_argument('-o', '--output', metavar='OUTPUT',
+                        help='where to write the merged report'
+                        ' (default: stdout)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='number of worker processes'
+                        ' (default: one per CPU)')
+    args = parser.parse_args(argv)
+    if args.output is not None:
+        with open(args.output, 'wb') as f:
+            num_results, num_duplicates = merge(args.inputs, f, args.jobs)
+    else:
+        output = getattr(sys.stdout, 'buffer', sys.stdout)
+        num_results, num_duplicates = merge(args.inputs, output, args.jobs)
+        output.flush()
+    sys.stderr.write('merged %i reports: %i results (%i duplicates dropped)\n'
+                     % (len(args.inputs), num_results, num_duplicates))
+
+if __name__ == '__main__':
+    main()
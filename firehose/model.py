@@ -24,15 +24,20 @@ from subprocess import Popen, PIPE
 import xml.etree.ElementTree as ET
 import hashlib
 import glob
+import inspect
+import posixpath
 import sys
 import os
 
-from six import BytesIO, string_types, integer_types, iteritems
+from six import BytesIO, PY3, string_types, integer_types, iteritems
+
+from firehose import xmlbackend
 
 _string_type = string_types[0]
 
 
-class Attribute(namedtuple('Attribute', ('name', 'type', 'nullable'))):
+class Attribute(namedtuple('Attribute', ('name', 'type', 'nullable',
+                                          'lazy'))):
     """
     Description of an attribute of a class.
 
@@ -47,9 +52,13 @@ class Attribute(namedtuple('Attribute', ('name', 'type', 'nullable'))):
                list of that (named) type
 
     nullable: boolean: can this attribute be None?
+
+    lazy: boolean: should decoding this attribute from JSON be deferred until
+          it is first accessed?  (see LazyValue; the type must provide a
+          _lazy_from_json classmethod)
     """
-    def __new__(self, name, type, nullable=False):
-        return super(Attribute, self).__new__(self, name, type, nullable)
+    def __new__(self, name, type, nullable=False, lazy=False):
+        return super(Attribute, self).__new__(self, name, type, nullable, lazy)
 
     def resolve_type(self):
         return globals()[self.type]
@@ -84,40 +93,244 @@ def from_json_using_attrs(cls, jsonobj):
     Given a class cls and a jsonobj, construct an instance of cls, using
     its attrs metadata.
     """
-    if jsonobj is None:
-        return None
-    kwargs = {}
-    for attr in cls.attrs:
-        attrjson = jsonobj[attr.name]
-        kwargs[attr.name] = attr.from_json(attrjson)
-    result = cls(**kwargs)
-    return result
+    return cls._attrs_from_json(jsonobj)
+
+class LazyValue(object):
+    """
+    A placeholder for an attribute value (such as Issue.trace) that has not
+    yet been decoded: a compact form of the data from which it can be built
+    (see _compact_trace_from_xml) is kept, and decode(*args) is called to
+    build the value when the attribute is first accessed.
+
+    Most consumers of large reports only look at the primary location and
+    message of each issue, so they need never pay for decoding the traces.
+    """
+    __slots__ = ('decode', 'args')
+
+    def __init__(self, decode, *args):
+        self.decode = decode
+        self.args = args
+
+    def materialize(self):
+        return self.decode(*self.args)
+
+    def __repr__(self):
+        return 'LazyValue(%r, ...)' % (self.decode, )
+
+def _iter_value_errors(attrtype, nullable, value, path):
+    """
+    Generate descriptions of any problems with a value of an attribute of
+    the given type, at the given path
+    """
+    if value is None:
+        if not nullable:
+            yield '%s: missing' % path
+        return
+    if isinstance(attrtype, list):
+        if not isinstance(value, list):
+            yield '%s: expected a list, got %r' % (path, value)
+            return
+        for index, item in enumerate(value):
+            for error in _iter_value_errors(attrtype[0], False, item,
+                                            '%s[%i]' % (path, index)):
+                yield error
+    elif attrtype in (_string_type, int, float):
+        expected = integer_types if attrtype is int else attrtype
+        if not isinstance(value, expected) or isinstance(value, bool):
+            yield ('%s: expected %s, got %r'
+                   % (path, attrtype.__name__, value))
+    elif attrtype == 'CustomFields':
+        if not isinstance(value, CustomFields):
+            yield '%s: expected CustomFields, got %r' % (path, value)
+            return
+        for key, item in iteritems(value):
+            if not isinstance(key, _string_type):
+                yield '%s: expected str key, got %r' % (path, key)
+            if (not isinstance(item, (_string_type, ) + integer_types)
+                    or isinstance(item, bool)):
+                yield ('%s[%r]: expected str or int, got %r'
+                       % (path, key, item))
+    else:
+        cls = globals()[attrtype]
+        if not isinstance(value, cls):
+            yield '%s: expected %s, got %r' % (path, attrtype, value)
+            return
+        for error in value.iter_errors(path):
+            yield error
+
+def _customfields_are_valid(value):
+    if not isinstance(value, CustomFields):
+        return False
+    for key, item in iteritems(value):
+        if (not isinstance(key, _string_type)
+                or not isinstance(item, (_string_type, ) + integer_types)
+                or isinstance(item, bool)):
+            return False
+    return True
+
+def _required(value, node, what):
+    """
+    Check that a value read from an XML node (an attribute, the text, or a
+    child element) is present, so that the objects built from it can be
+    constructed via unchecked()
+    """
+    if value is None:
+        raise ValueError('<%s> without %s' % (node.tag, what))
+    return value
 
 class JsonMixin(object):
+    # Model objects are created in very large numbers (one per issue,
+    # location, point etc), so every class in the hierarchy uses __slots__
+    # rather than a per-instance __dict__
+    __slots__ = ()
+
+    # The _attrs_to_json, _attrs_from_json and __eq__ methods of each
+    # class with "attrs" are generated from that metadata; see
+    # _generate_attrs_methods below
+
     def to_json(self):
-        result = {}
-        for attr in self.attrs:
-            result[attr.name] = to_json(getattr(self, attr.name))
-        return result
+        return self._attrs_to_json()
 
     @classmethod
     def from_json(cls, jsonobj):
-        return from_json_using_attrs(cls, jsonobj)
+        return cls._attrs_from_json(jsonobj)
+
+    def __ne__(self, other):
+        return not (self == other)
 
-    def __eq__(self, other):
+    # Pickling:
+    #
+    # Pickle protocols 0 and 1 (the default on Python 2) can't handle
+    # classes with __slots__ unless they define __getstate__, so the state
+    # is given as a dict of the slots holding values, from every class in
+    # the hierarchy.  The cached fingerprint is left out, and a lazy trace
+    # is decoded first (pickling the Interner behind it would cost more
+    # than the trace itself).
+
+    def __getstate__(self):
+        state = {}
+        for name in _pickled_slots(self.__class__):
+            value = getattr(self, name, _missing)
+            if value is _missing:
+                continue
+            if value.__class__ is LazyValue:
+                value = value.materialize()
+            state[name] = value
+        return state
+
+    def __setstate__(self, state):
+        for name, value in iteritems(state):
+            setattr(self, name, value)
+
+    # Validation:
+    #
+    # The constructors assert the types of their arguments, but the readers
+    # and parsers, which build well-typed values themselves, skip those
+    # checks by constructing objects via the generated unchecked()
+    # classmethods.  Data from untrusted sources can be checked explicitly
+    # with validate().
+
+    def validate(self):
+        """
+        Check that the attributes of this object, and of those within it,
+        are of the types given by their attrs metadata, raising ValueError
+        describing the first problem found
+        """
+        if self._is_valid():
+            return
+        for error in self.iter_errors():
+            raise ValueError(error)
+
+    def iter_errors(self, path=None):
+        """
+        Generate a description of each problem that validate() would
+        report, each prefixed with the path to the offending attribute
+        """
+        if path is None:
+            path = self.__class__.__name__
         for attr in self.attrs:
-            try:
-                if getattr(self, attr.name) != getattr(other, attr.name):
-                    return False
-            except AttributeError:
-                return False
+            for error in _iter_value_errors(attr.type, attr.nullable,
+                                            getattr(self, attr.name),
+                                            '%s.%s' % (path, attr.name)):
+                yield error
+        for error in self._iter_own_errors():
+            yield '%s: %s' % (path, error)
+
+    def _iter_own_errors(self):
+        """
+        Generate descriptions of any problems with this object beyond the
+        types of its attributes
+        """
+        return iter(())
+
+    # Hashing:
+    #
+    # Each class implements __hash__ by hashing a tuple of its fields in
+    # order, so that e.g. Point(3, 7) and Point(7, 3) don't collide.
+    # Hashes aren't cached: the objects are mutable (fixup_files modifies
+    # File instances in-place, and Trace.states is a list), so a cached
+    # hash could silently go stale.  CustomFields are not included in the
+    # hashes of the objects containing them.
+
+_missing = object()
+
+# The names of the slots pickled for each class (see
+# JsonMixin.__getstate__), omitting those holding caches
+_UNPICKLED_SLOTS = frozenset(('_fingerprint', ))
+_pickled_slots_by_class = {}
+
+def _pickled_slots(cls):
+    names = _pickled_slots_by_class.get(cls)
+    if names is None:
+        names = []
+        for klass in reversed(cls.__mro__):
+            for name in klass.__dict__.get('__slots__', ()):
+                if name not in _UNPICKLED_SLOTS:
+                    names.append(name)
+        names = _pickled_slots_by_class[cls] = tuple(names)
+    return names
+
+def normalize_fingerprint_path(path):
+    """
+    Normalize a path for use within a fingerprint: backslashes become
+    slashes, and redundant separators and "." and ".." components are
+    removed (as per posixpath.normpath)
+    """
+    return posixpath.normpath(path.replace('\\', '/'))
 
-        return True
+# Size of the reads used when hashing files
+HASH_CHUNK_SIZE = 1024 * 1024
 
-    def __ne__(self, other):
-        return not (self == other)
+def hash_path(path, hashalg):
+    """
+    Get the hexdigest of the content of the file at the given path, using
+    the given hashlib algorithm, reading it in chunks
+    """
+    h = hashlib.new(hashalg)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _hash_paths(paths, hashalg, threads=None):
+    """
+    Get the hexdigests of the files at the given paths, in order, hashing
+    them within a pool of threads (hashlib releases the GIL whilst
+    hashing large buffers, as does reading them)
+    """
+    if threads == 1 or len(paths) < 2:
+        return [hash_path(path, hashalg) for path in paths]
+    from multiprocessing.pool import ThreadPool
+    pool = ThreadPool(threads)
+    try:
+        return pool.map(lambda path: hash_path(path, hashalg), paths)
+    finally:
+        pool.close()
+        pool.join()
 
 class Analysis(JsonMixin):
+    __slots__ = ('metadata', 'results', 'customfields')
+
     attrs = [Attribute('metadata', 'Metadata'),
              Attribute('results', ['Result']),
              Attribute('customfields', 'CustomFields', nullable=True)]
@@ -136,19 +349,19 @@ class Analysis(JsonMixin):
 
     @classmethod
     def from_xml(cls, fileobj):
-        tree = ET.parse(fileobj)
-        root = tree.getroot()
+        root = xmlbackend.parse(fileobj)
 
-        metadata = Metadata.from_xml(root.find('metadata'))
+        interner = Interner()
+        metadata = Metadata.from_xml(root.find('metadata'), interner)
         results_node = root.find('results')
         results = []
         for result_node in results_node:
             if result_node.tag == 'issue':
-                results.append(Issue.from_xml(result_node))
+                results.append(Issue.from_xml(result_node, interner))
             elif result_node.tag == 'failure':
-                results.append(Failure.from_xml(result_node))
+                results.append(Failure.from_xml(result_node, interner))
             elif result_node.tag == 'info':
-                results.append(Info.from_xml(result_node))
+                results.append(Info.from_xml(result_node, interner))
         customfields_node = root.find('custom-fields')
         if customfields_node is not None:
             customfields = CustomFields.from_xml(customfields_node)
@@ -156,6 +369,16 @@ class Analysis(JsonMixin):
             customfields = None
         return Analysis(metadata, results, customfields)
 
+    @classmethod
+    def iter_results(cls, fileobj):
+        """
+        Read a Firehose XML document incrementally, returning an
+        AnalysisReader: its "metadata" attribute is populated immediately,
+        and iterating over it yields the Result instances one at a time,
+        without building the whole document in memory
+        """
+        return AnalysisReader(fileobj)
+
     def to_xml(self):
         tree = ET.ElementTree()
         node = ET.Element('analysis')
@@ -170,11 +393,19 @@ class Analysis(JsonMixin):
         return tree
 
     def to_xml_bytes(self):
-        xml = self.to_xml()
         output = BytesIO()
-        xml.write(output, encoding='utf-8')
+        self.write_xml(output)
         return output.getvalue()
 
+    def write_xml(self, fileobj):
+        """
+        Write an XML serialization of the data within self to fileobj (a
+        file-like object opened in binary mode), one result at a time
+        """
+        writer = AnalysisWriter(fileobj, self.metadata, self.customfields)
+        writer.write_results(self.results)
+        writer.close()
+
     def __repr__(self):
         return ('Analysis(metadata=%r, results=%r, customfields=%r)'
                 % (self.metadata, self.results, self.customfields))
@@ -189,39 +420,336 @@ class Analysis(JsonMixin):
         for result in self.results:
             result.accept(visitor)
 
-    def fixup_files(self, relativedir=None, hashalg=None):
+    # Iterative alternatives to accept(), for when only a few kinds of node
+    # are of interest: these walk the results with plain loops, rather than
+    # a method call per node
+
+    def iter_locations(self):
         """
-        Record the absolute path of each file, and record the digest of the
-        file content
+        Generate every Location within the results: the location of each
+        result that has one, followed by those of the states of its trace
         """
-        class FixupFiles(Visitor):
-            def __init__(self, relativedir, hashalg):
-                self.relativedir = relativedir
-                self.hashalg = hashalg
+        for result in self.results:
+            location = result.location
+            if location is not None:
+                yield location
+            if isinstance(result, Issue) and result.trace is not None:
+                for state in result.trace.states:
+                    yield state.location
+
+    def iter_files(self):
+        """
+        Generate every File within the analysis: that of the metadata (if
+        any), then that of each Location, in the order of iter_locations()
+        """
+        if self.metadata.file_ is not None:
+            yield self.metadata.file_
+        for result in self.results:
+            location = result.location
+            if location is not None:
+                yield location.file
+            if isinstance(result, Issue) and result.trace is not None:
+                for state in result.trace.states:
+                    yield state.location.file
+
+    def iter_states(self):
+        """
+        Generate every State within the traces of the results
+        """
+        for result in self.results:
+            if isinstance(result, Issue) and result.trace is not None:
+                for state in result.trace.states:
+                    yield state
 
-            def visit_file(self, file_):
-                if self.relativedir is not None:
-                    file_.abspath = os.path.normpath(os.path.join(self.relativedir,
-                                                                  file_.givenpath))
+    def iter_messages(self):
+        """
+        Generate the Message of each result that has one
+        """
+        for result in self.results:
+            if result.message is not None:
+                yield result.message
 
-                if hashalg is not None:
-                    bestpath = file_.abspath \
-                        if file_.abspath else file_.givenpath
+    def fingerprints(self, include_line=True):
+        """
+        Get the fingerprint of each result (see Result.fingerprint), in
+        order, using the name of this analysis' generator.  Paths are
+        normalized once per distinct path, rather than once per result.
+        """
+        generator = self.metadata.generator.name
+        normalized_paths = {}
+        def normalize_path(path):
+            result = normalized_paths.get(path)
+            if result is None:
+                result = normalized_paths[path] = \
+                    normalize_fingerprint_path(path)
+            return result
+        return [result._cached_fingerprint(generator, include_line,
+                                           normalize_path)
+                for result in self.results]
+
+    def fixup_files(self, relativedir=None, hashalg=None, threads=None,
+                    hashcache=None):
+        """
+        Record the absolute path of each file, and record the digest of the
+        file content
 
-                    with open(bestpath, 'rb') as f:
-                        h = hashlib.new(hashalg)
-                        h.update(f.read())
-                        file_.hash_ = Hash(alg=hashalg, hexdigest=h.hexdigest())
+        Each distinct path is read and hashed once, however many locations
+        refer to it, with the hashing spread over a pool of threads (of the
+        given size, or one per CPU by default); the resulting Hash instance
+        is shared by every File with that path.
 
-        visitor = FixupFiles(relativedir, hashalg)
-        self.accept(visitor)
+        hashcache can be a firehose.hashcache.HashCache, in which case the
+        digests of files that are unchanged since they were recorded there
+        are taken from it, rather than being recomputed.
+        """
+        files_by_path = OrderedDict()
+        abspaths = {}
+        for file_ in self.iter_files():
+            if relativedir is not None:
+                abspath = abspaths.get(file_.givenpath)
+                if abspath is None:
+                    abspath = abspaths[file_.givenpath] = \
+                        os.path.normpath(os.path.join(relativedir,
+                                                      file_.givenpath))
+                file_.abspath = abspath
+
+            bestpath = file_.abspath if file_.abspath else file_.givenpath
+            files_by_path.setdefault(bestpath, []).append(file_)
+
+        if hashalg is not None:
+            paths = list(files_by_path)
+            if hashcache is not None:
+                hexdigests = hashcache.hash_paths(paths, hashalg, threads)
+            else:
+                hexdigests = _hash_paths(paths, hashalg, threads)
+            for path, hexdigest in zip(paths, hexdigests):
+                hash_ = Hash(alg=hashalg, hexdigest=hexdigest)
+                for file_ in files_by_path[path]:
+                    file_.hash_ = hash_
 
     def set_custom_field(self, name, value):
         if self.customfields is None:
             self.customfields = CustomFields()
         self.customfields[name] = value
 
+class AnalysisReader(object):
+    """
+    Incremental reader for Firehose XML documents, built on iterparse
+    (using the backend selected in firehose.xmlbackend).
+
+    The <metadata> element is parsed on construction.  Iterating over the
+    reader then yields each Issue, Failure and Info in turn; each element
+    is discarded once it has been consumed, so memory usage doesn't grow
+    with the number of results (the reader's Interner shares Files and
+    Functions between results, but not Points).  The "customfields"
+    attribute of the reader is populated once the iteration is complete.
+    """
+    __slots__ = ('metadata', 'customfields', 'interner', '_events')
+
+    def __init__(self, fileobj):
+        self.metadata = None
+        self.customfields = None
+        self.interner = Interner(share_points=False)
+        self._events = self._iter_events(fileobj)
+        for node in self._events:
+            if node.tag == 'metadata':
+                self.metadata = Metadata.from_xml(node, self.interner)
+                break
+        if self.metadata is None:
+            raise ValueError('no <metadata> found')
+
+    def _iter_events(self, fileobj):
+        # Yield the direct children of <analysis> and of <results> once
+        # each has been fully parsed, discarding <results> children after
+        # they have been consumed
+        depth = 0
+        results_node = None
+        for event, node in xmlbackend.iterparse(fileobj,
+                                                events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if depth == 2 and node.tag == 'results':
+                    results_node = node
+                continue
+            depth -= 1
+            if depth == 1:
+                if node is results_node:
+                    results_node = None
+                yield node
+            elif depth == 2 and results_node is not None:
+                yield node
+                node.clear()
+                results_node.remove(node)
+
+    def __iter__(self):
+        interner = self.interner
+        for node in self._events:
+            if node.tag == 'issue':
+                yield Issue.from_xml(node, interner)
+            elif node.tag == 'failure':
+                yield Failure.from_xml(node, interner)
+            elif node.tag == 'info':
+                yield Info.from_xml(node, interner)
+            elif node.tag == 'custom-fields':
+                self.customfields = CustomFields.from_xml(node)
+
+class AnalysisWriter(object):
+    """
+    Incremental writer for Firehose XML documents.
+
+    The <analysis> and <metadata> elements are written on construction;
+    each result passed to write_result() is serialized straight to the
+    file-like object (which must be opened in binary mode), and close()
+    completes the document.  The output is identical to that of
+    Analysis.to_xml_bytes(), but only one result is held as XML at a time.
+
+    Can be used as a context manager, closing the document on exit.
+    """
+    __slots__ = ('fileobj', 'customfields', 'num_results')
+
+    def __init__(self, fileobj, metadata, customfields=None):
+        assert isinstance(metadata, Metadata)
+        if customfields is not None:
+            assert isinstance(customfields, CustomFields)
+        self.fileobj = fileobj
+        self.customfields = customfields
+        self.num_results = 0
+        fileobj.write(b'<analysis>')
+        self._write_node(metadata.to_xml())
+
+    def _write_node(self, node):
+        self.fileobj.write(_serialize_node(node))
+
+    def write_result(self, result):
+        assert isinstance(result, Result)
+        if self.num_results == 0:
+            self.fileobj.write(b'<results>')
+        self._write_node(result.to_xml())
+        self.num_results += 1
+
+    def write_serialized_result(self, data):
+        """
+        Write a result that has already been serialized to bytes by
+        serialize_result() (e.g. within another process)
+        """
+        if self.num_results == 0:
+            self.fileobj.write(b'<results>')
+        self.fileobj.write(data)
+        self.num_results += 1
+
+    def write_results(self, results):
+        for result in results:
+            self.write_result(result)
+
+    def close(self):
+        if self.num_results == 0:
+            self.fileobj.write(b'<results />')
+        else:
+            self.fileobj.write(b'</results>')
+        if self.customfields is not None:
+            self._write_node(self.customfields.to_xml())
+        self.fileobj.write(b'</analysis>')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Leave the document unterminated if an exception occurred, rather
+        # than writing something that looks complete:
+        if exc_type is None:
+            self.close()
+
+def _serialize_node(node):
+    """
+    Serialize an element as UTF-8, without an XML declaration
+    """
+    if PY3:
+        # (about 1.5 times faster than writing UTF-8 directly, which
+        # encodes each fragment of the output separately)
+        return ET.tostring(node, encoding='unicode').encode('utf-8')
+    output = BytesIO()
+    ET.ElementTree(node).write(output, encoding='utf-8')
+    return output.getvalue()
+
+def serialize_result(result):
+    """
+    Serialize a result to bytes, in the form in which AnalysisWriter
+    writes it
+    """
+    assert isinstance(result, Result)
+    return _serialize_node(result.to_xml())
+
 class Result(JsonMixin):
+    # "_fingerprint" caches the result of fingerprint(), along with the
+    # values it was computed from
+    __slots__ = ('_fingerprint', )
+
+    def fingerprint(self, generator=None, include_line=True):
+        """
+        Get a deterministic fingerprint of this result, as a string of 40
+        hex digits, for recognizing the same finding across reports (e.g.
+        from successive builds) without comparing them pairwise.
+
+        The fingerprint is the SHA-1 digest of the following fields, each
+        encoded as UTF-8, joined with NUL characters (with the empty string
+        for any that are None):
+
+          * the kind of result: "issue", "failure" or "info"
+          * the name of the generator (as passed in)
+          * the testid, failureid or infoid
+          * the CWE identifier, in decimal (issues only)
+          * the path of the file, as given, normalized by
+            normalize_fingerprint_path
+          * the name of the function
+          * the text of the message, with runs of whitespace collapsed to
+            single spaces
+          * the line number, unless include_line is False (so that findings
+            can be matched even when code above them has moved)
+
+        Unlike hash(), this doesn't vary between processes.  The result is
+        cached on the object, and only recomputed if the values that it is
+        computed from have changed.
+        """
+        return self._cached_fingerprint(generator, include_line,
+                                        normalize_fingerprint_path)
+
+    def _fingerprint_inputs(self, generator, include_line):
+        kind, id_, cwe = self._fingerprint_id()
+        path = function = line = message = None
+        location = self.location
+        if location is not None:
+            path = location.file.givenpath
+            if location.function is not None:
+                function = location.function.name
+            if include_line:
+                line = location.line
+        if self.message is not None:
+            message = self.message.text
+        return (kind, generator, id_, cwe, path, function, message,
+                include_line, line)
+
+    def _cached_fingerprint(self, generator, include_line, normalize_path):
+        # Checking the (unnormalized) inputs against those that the cached
+        # fingerprint was computed from is much cheaper than the digest
+        inputs = self._fingerprint_inputs(generator, include_line)
+        cached = getattr(self, '_fingerprint', None)
+        if cached is not None and cached[0] == inputs:
+            return cached[1]
+        (kind, generator, id_, cwe, path, function, message,
+         include_line, line) = inputs
+        fields = [kind, generator, id_,
+                  None if cwe is None else u'%i' % cwe,
+                  None if path is None else normalize_path(path),
+                  function,
+                  None if message is None else u' '.join(message.split())]
+        if include_line:
+            fields.append(None if line is None else u'%i' % line)
+        data = u'\0'.join(u'' if field is None else field
+                           for field in fields)
+        result = hashlib.sha1(data.encode('utf-8')).hexdigest()
+        self._fingerprint = (inputs, result)
+        return result
+
     @classmethod
     def from_json(cls, jsonobj):
         if jsonobj['type'] == 'Issue':
@@ -233,12 +761,17 @@ class Result(JsonMixin):
         raise TypeError('unknown type: %r' % jsonobj['type'])
 
 class Issue(Result):
+    # The trace is held in "_trace", either as a Trace (or None), or as a
+    # LazyValue that is decoded on first access to the "trace" property
+    __slots__ = ('cwe', 'testid', 'location', 'message', 'notes', '_trace',
+                 'severity', 'customfields')
+
     attrs = [Attribute('cwe', int, nullable=True),
              Attribute('testid', _string_type, nullable=True),
              Attribute('location', 'Location'),
              Attribute('message', 'Message'),
              Attribute('notes', 'Notes', nullable=True),
-             Attribute('trace', 'Trace', nullable=True),
+             Attribute('trace', 'Trace', nullable=True, lazy=True),
              Attribute('severity', _string_type, nullable=True),
              Attribute('customfields', 'CustomFields', nullable=True)]
 
@@ -260,7 +793,7 @@ class Issue(Result):
         if notes:
             assert isinstance(notes, Notes)
         if trace:
-            assert isinstance(trace, Trace)
+            assert isinstance(trace, (Trace, LazyValue))
         if severity is not None:
             assert isinstance(severity, _string_type)
         if customfields is not None:
@@ -274,31 +807,50 @@ class Issue(Result):
         self.severity = severity
         self.customfields = customfields
 
+    @property
+    def trace(self):
+        trace = self._trace
+        if trace.__class__ is LazyValue:
+            trace = self._trace = trace.materialize()
+        return trace
+
+    @trace.setter
+    def trace(self, trace):
+        self._trace = trace
+
+    @property
+    def has_lazy_trace(self):
+        """
+        Is the trace yet to be decoded?
+        """
+        return self._trace.__class__ is LazyValue
+
     @classmethod
-    def from_xml(cls, node):
+    def from_xml(cls, node, interner=None):
         cwe = node.get('cwe')
         if cwe is not None:
             cwe = int(cwe)
         testid = node.get('test-id')
-        location = Location.from_xml(node.find('location'))
-        message = Message.from_xml(node.find('message'))
-        notes_node = node.find('notes')
-        if notes_node is not None:
-            notes = Notes.from_xml(notes_node)
-        else:
-            notes = None
-        trace_node = node.find('trace')
-        if trace_node is not None:
-            trace = Trace.from_xml(trace_node)
-        else:
-            trace = None
         severity = node.get('severity')
-        customfields_node = node.find('custom-fields')
-        if customfields_node is not None:
-            customfields = CustomFields.from_xml(customfields_node)
-        else:
-            customfields = None
-        return Issue(cwe, testid, location, message, notes, trace, severity, customfields)
+        # Visit the children in a single pass, rather than via a series of
+        # find() calls (which are expensive with lxml):
+        location = message = notes = trace = customfields = None
+        for child in node:
+            tag = child.tag
+            if tag == 'location':
+                location = Location.from_xml(child, interner)
+            elif tag == 'message':
+                message = Message.from_xml(child)
+            elif tag == 'notes':
+                notes = Notes.from_xml(child)
+            elif tag == 'trace':
+                trace = Trace._lazy_from_xml(child, interner)
+            elif tag == 'custom-fields':
+                customfields = CustomFields.from_xml(child)
+        return Issue.unchecked(cwe, testid,
+                               _required(location, node, '<location>'),
+                               _required(message, node, '<message>'),
+                               notes, trace, severity, customfields)
 
     def to_xml(self):
         node = ET.Element('issue')
@@ -364,10 +916,12 @@ class Issue(Result):
                 % (self.cwe, self.testid, self.location, self.message,
                    self.notes, self.trace, self.severity, self.customfields))
 
+    def _fingerprint_id(self):
+        return ('issue', self.testid, self.cwe)
+
     def __hash__(self):
-        return (hash(self.cwe) ^ hash(self.testid)
-                ^ hash(self.location) ^ hash(self.message)
-                ^ hash(self.notes) ^ hash(self.trace) ^ hash(self.severity))
+        return hash((self.cwe, self.testid, self.location, self.message,
+                     self.notes, self.trace, self.severity))
 
     def accept(self, visitor):
         visitor.visit_warning(self)
@@ -387,9 +941,11 @@ class Issue(Result):
             return 'http://cwe.mitre.org/data/definitions/%i.html' % self.cwe
 
 class Failure(Result):
+    __slots__ = ('failureid', 'location', 'message', 'customfields')
+
     attrs = [Attribute('failureid', _string_type, nullable=True),
-             Attribute('location', 'Location'),
-             Attribute('message', 'Message'),
+             Attribute('location', 'Location', nullable=True),
+             Attribute('message', 'Message', nullable=True),
              Attribute('customfields', 'CustomFields', nullable=True)]
 
     def __init__(self, failureid, location, message, customfields):
@@ -407,24 +963,18 @@ class Failure(Result):
         self.customfields = customfields
 
     @classmethod
-    def from_xml(cls, node):
+    def from_xml(cls, node, interner=None):
         failureid = node.get('failure-id')
-        location_node = node.find('location')
-        if location_node is not None:
-            location = Location.from_xml(location_node)
-        else:
-            location = None
-        message_node = node.find('message')
-        if message_node is not None:
-            message = Message.from_xml(message_node)
-        else:
-            message = None
-        customfields_node = node.find('custom-fields')
-        if customfields_node is not None:
-            customfields = CustomFields.from_xml(customfields_node)
-        else:
-            customfields = None
-        return Failure(failureid, location, message, customfields)
+        location = message = customfields = None
+        for child in node:
+            tag = child.tag
+            if tag == 'location':
+                location = Location.from_xml(child, interner)
+            elif tag == 'message':
+                message = Message.from_xml(child)
+            elif tag == 'custom-fields':
+                customfields = CustomFields.from_xml(child)
+        return Failure.unchecked(failureid, location, message, customfields)
 
     def to_xml(self):
         node = ET.Element('failure')
@@ -452,9 +1002,11 @@ class Failure(Result):
         return ('Failure(failureid=%r, location=%r, message=%r, customfields=%r)'
                 % (self.failureid, self.location, self.message, self.customfields))
 
+    def _fingerprint_id(self):
+        return ('failure', self.failureid, None)
+
     def __hash__(self):
-        return (hash(self.failureid) ^ hash(self.location)
-                ^ hash(self.message) ^ hash(self.customfields))
+        return hash((self.failureid, self.location, self.message))
 
     def accept(self, visitor):
         visitor.visit_failure(self)
@@ -464,6 +1016,8 @@ class Failure(Result):
             self.message.accept(visitor)
 
 class Info(Result):
+    __slots__ = ('infoid', 'location', 'message', 'customfields')
+
     attrs = [Attribute('infoid', _string_type, nullable=True),
              Attribute('location', 'Location', nullable=True),
              Attribute('message', 'Message', nullable=True),
@@ -484,24 +1038,18 @@ class Info(Result):
         self.customfields = customfields
 
     @classmethod
-    def from_xml(cls, node):
+    def from_xml(cls, node, interner=None):
         infoid = node.get('info-id')
-        location_node = node.find('location')
-        if location_node is not None:
-            location = Location.from_xml(location_node)
-        else:
-            location = None
-        message_node = node.find('message')
-        if message_node is not None:
-            message = Message.from_xml(message_node)
-        else:
-            message = None
-        customfields_node = node.find('custom-fields')
-        if customfields_node is not None:
-            customfields = CustomFields.from_xml(customfields_node)
-        else:
-            customfields = None
-        return Info(infoid, location, message, customfields)
+        location = message = customfields = None
+        for child in node:
+            tag = child.tag
+            if tag == 'location':
+                location = Location.from_xml(child, interner)
+            elif tag == 'message':
+                message = Message.from_xml(child)
+            elif tag == 'custom-fields':
+                customfields = CustomFields.from_xml(child)
+        return Info.unchecked(infoid, location, message, customfields)
 
     def to_xml(self):
         node = ET.Element('info')
@@ -529,9 +1077,11 @@ class Info(Result):
         return ('Info(infoid=%r, location=%r, message=%r, customfields=%r)'
                 % (self.infoid, self.location, self.message, self.customfields))
 
+    def _fingerprint_id(self):
+        return ('info', self.infoid, None)
+
     def __hash__(self):
-        return (hash(self.infoid) ^ hash(self.location)
-                ^ hash(self.message) ^ hash(self.customfields))
+        return hash((self.infoid, self.location, self.message))
 
     def accept(self, visitor):
         visitor.visit_info(self)
@@ -541,6 +1091,8 @@ class Info(Result):
             self.message.accept(visitor)
 
 class Metadata(JsonMixin):
+    __slots__ = ('generator', 'sut', 'file_', 'stats')
+
     attrs = [Attribute('generator', 'Generator'),
              Attribute('sut', 'Sut', nullable=True),
              Attribute('file_', 'File', nullable=True),
@@ -560,7 +1112,7 @@ class Metadata(JsonMixin):
         self.stats = stats
 
     @classmethod
-    def from_xml(cls, node):
+    def from_xml(cls, node, interner=None):
         generator = Generator.from_xml(node.find('generator'))
         sut_node = node.find('sut')
         if sut_node is not None:
@@ -569,7 +1121,7 @@ class Metadata(JsonMixin):
             sut = None
         file_node = node.find('file')
         if file_node is not None:
-            file_ = File.from_xml(file_node)
+            file_ = File.from_xml(file_node, interner)
         else:
             file_ = None
         stats_node = node.find('stats')
@@ -596,8 +1148,7 @@ class Metadata(JsonMixin):
                 % (self.generator, self.sut, self.file_, self.stats))
 
     def __hash__(self):
-        return (hash(self.generator) ^ hash(self.sut)
-                ^ hash(self.file_) ^ hash(self.stats))
+        return hash((self.generator, self.sut, self.file_, self.stats))
 
     def accept(self, visitor):
         visitor.visit_metadata(self)
@@ -610,6 +1161,8 @@ class Metadata(JsonMixin):
             self.stats.accept(visitor)
 
 class Generator(JsonMixin):
+    __slots__ = ('name', 'version')
+
     attrs = [Attribute('name', _string_type),
              Attribute('version', _string_type, nullable=True),
              ]
@@ -639,13 +1192,14 @@ class Generator(JsonMixin):
                 % (self.name, self.version))
 
     def __hash__(self):
-        return hash(self.name) ^ hash(self.version)
+        return hash((self.name, self.version))
 
     def accept(self, visitor):
         visitor.visit_generator(self)
 
 class Sut(JsonMixin):
     # FIXME: this part of the schema needs more thought/work
+    __slots__ = ()
 
     @classmethod
     def from_xml(cls, node):
@@ -682,6 +1236,8 @@ class Sut(JsonMixin):
         visitor.visit_sut(self)
 
 class SourceRpm(Sut):
+    __slots__ = ('name', 'version', 'release', 'buildarch')
+
     attrs = [Attribute('name', _string_type),
              Attribute('version', _string_type),
              Attribute('release', _string_type),
@@ -724,8 +1280,7 @@ class SourceRpm(Sut):
                 % (self.name, self.version, self.release, self.buildarch))
 
     def __hash__(self):
-        return (hash(self.name) ^ hash(self.version)
-                ^ hash(self.release) ^ hash(self.buildarch))
+        return hash((self.name, self.version, self.release, self.buildarch))
 
 
 class DebianBinary(Sut):
@@ -733,6 +1288,8 @@ class DebianBinary(Sut):
     Internal Firehose represntation of a Debian binary package. This Object
     is extremely similar to a SourceRpm.
     """
+    __slots__ = ('name', 'version', 'release', 'buildarch')
+
     attrs = [Attribute('name', _string_type),
              Attribute('version', _string_type),
              Attribute('release', _string_type, nullable=True),
@@ -761,6 +1318,10 @@ class DebianBinary(Sut):
         self.release = release
         self.buildarch = buildarch
 
+    def _iter_own_errors(self):
+        if self.release is None and "-" in self.version:
+            yield "Native package with dash in the version string"
+
     @classmethod
     def from_xml(cls, node):
         """
@@ -797,8 +1358,7 @@ class DebianBinary(Sut):
                 % (self.name, self.version, self.release, self.buildarch))
 
     def __hash__(self):
-        return (hash(self.name) ^ hash(self.version)
-                ^ hash(self.release) ^ hash(self.buildarch))
+        return hash((self.name, self.version, self.release, self.buildarch))
 
 
 class DebianSource(Sut):
@@ -807,6 +1367,8 @@ class DebianSource(Sut):
     is extremely similar to a SourceRpm, but does not include the `buildarch`
     attribute.
     """
+    __slots__ = ('name', 'version', 'release')
+
     attrs = [Attribute('name', _string_type),
              Attribute('version', _string_type),
              Attribute('release', _string_type, nullable=True)]
@@ -829,6 +1391,10 @@ class DebianSource(Sut):
         self.version = version
         self.release = release
 
+    def _iter_own_errors(self):
+        if self.release is None and "-" in self.version:
+            yield "Native package with dash in the version string"
+
     @classmethod
     def from_xml(cls, node):
         """
@@ -863,11 +1429,12 @@ class DebianSource(Sut):
                 % (self.name, self.version, self.release))
 
     def __hash__(self):
-        return (hash(self.name) ^ hash(self.version)
-                ^ hash(self.release))
+        return hash((self.name, self.version, self.release))
 
 
 class Stats(JsonMixin):
+    __slots__ = ('wallclocktime', )
+
     attrs = [Attribute('wallclocktime', float)]
 
     def __init__(self, wallclocktime):
@@ -895,6 +1462,8 @@ class Stats(JsonMixin):
         visitor.visit_stats(self)
 
 class Message(JsonMixin):
+    __slots__ = ('text', )
+
     attrs = [Attribute('text', _string_type)]
 
     def __init__(self, text):
@@ -903,7 +1472,7 @@ class Message(JsonMixin):
 
     @classmethod
     def from_xml(cls, node):
-        result = Message(node.text)
+        result = Message.unchecked(_required(node.text, node, 'text'))
         return result
 
     def to_xml(self):
@@ -921,6 +1490,8 @@ class Message(JsonMixin):
         visitor.visit_message(self)
 
 class Notes(JsonMixin):
+    __slots__ = ('text', )
+
     attrs = [Attribute('text', _string_type)]
 
     def __init__(self, text):
@@ -929,8 +1500,8 @@ class Notes(JsonMixin):
 
     @classmethod
     def from_xml(cls, node):
-        text = node.text
-        result = Notes(text)
+        text = _required(node.text, node, 'text')
+        result = Notes.unchecked(text)
         return result
 
     def to_xml(self):
@@ -948,6 +1519,8 @@ class Notes(JsonMixin):
         visitor.visit_notes(self)
 
 class Trace(JsonMixin):
+    __slots__ = ('states', )
+
     attrs = [Attribute('states', ['State'])]
 
     def __init__(self, states):
@@ -958,13 +1531,51 @@ class Trace(JsonMixin):
         self.states.append(state)
 
     @classmethod
-    def from_xml(cls, node):
+    def from_xml(cls, node, interner=None):
         states = []
         for state_node in node.findall('state'):
-            states.append(State.from_xml(state_node))
-        result = Trace(states)
+            states.append(State.from_xml(state_node, interner))
+        result = Trace.unchecked(states)
         return result
 
+    @classmethod
+    def lazy(cls, fields, interner=None):
+        """
+        Get a LazyValue that decodes to the Trace with the given compact
+        form: a flat sequence holding, for each state in turn, the given
+        and absolute paths of its file, the alg and hexdigest of the
+        file's hash, the name of its function, its line and column, the
+        end line and end column (for a range, rather than a point), and
+        the text of its notes.  Only the given path is required; the
+        others may be None.
+
+        The values aren't checked when decoding, so parsers building a
+        trace this way must check them as they read them
+        """
+        return LazyValue(_decode_compact_trace, tuple(fields), interner)
+
+    @classmethod
+    def _lazy_from_xml(cls, node, interner=None):
+        """
+        Get a LazyValue holding the compact form of a <trace> element, or
+        the decoded Trace if it can't be held compactly
+        """
+        fields = _compact_trace_from_xml(
+            node, interner.strings if interner is not None else {})
+        if fields is None:
+            return cls.from_xml(node, interner)
+        return cls.lazy(fields, interner)
+
+    @classmethod
+    def _lazy_from_json(cls, jsonobj):
+        """
+        As _lazy_from_xml, for the JSON form of a trace
+        """
+        fields = _compact_trace_from_json(jsonobj)
+        if fields is None:
+            return cls._attrs_from_json(jsonobj)
+        return cls.lazy(fields)
+
     def to_xml(self):
         node = ET.Element('trace')
         for state in self.states:
@@ -975,17 +1586,188 @@ class Trace(JsonMixin):
         return 'Trace(states=%r)' % (self.states, )
 
     def __hash__(self):
-        result = 0
-        for state in self.states:
-            result ^= hash(state)
-        return result
+        return hash(tuple(self.states))
 
     def accept(self, visitor):
         visitor.visit_notes(self)
         for state in self.states:
             state.accept(visitor)
 
+# The compact form of a trace, as held by a LazyValue until it is decoded,
+# is a flat tuple with the following fields for each state in turn.  The
+# paths, function names and hashes read from XML are shared via the
+# "strings" table of an Interner (which, unlike a table of lines, doesn't
+# grow with the number of results), so that the tuple takes a fraction of
+# the memory of the <trace> element or JSON objects that it is built from,
+# and less than the decoded Trace, whilst being much cheaper to build than
+# the Trace.  Traces that don't fit this form (e.g. with a location having
+# both a point and a range, or missing values, which validate() would
+# reject) are decoded straight away.
+_COMPACT_STATE_FIELDS = ('givenpath', 'abspath', 'alg', 'hexdigest',
+                         'function', 'line', 'column', 'end_line',
+                         'end_column', 'notes')
+
+def _compact_trace_from_xml(node, strings):
+    """
+    Get the compact form of a <trace> element, or None, sharing strings via
+    the given dict
+    """
+    def share(value, setdefault=strings.setdefault):
+        return setdefault(value, value)
+    fields = []
+    for state_node in node:
+        if state_node.tag != 'state':
+            continue
+        location_node = None
+        notes = None
+        for child in state_node:
+            tag = child.tag
+            if tag == 'location':
+                location_node = child
+            elif tag == 'notes':
+                notes = child.text
+                if notes is None:
+                    return None
+        if location_node is None:
+            return None
+        givenpath = abspath = alg = hexdigest = function = None
+        line = column = end_line = end_column = None
+        for child in location_node:
+            tag = child.tag
+            if tag == 'file':
+                givenpath = share(child.get('given-path'))
+                abspath = share(child.get('absolute-path'))
+                alg = hexdigest = None
+                for hash_node in child:
+                    if hash_node.tag == 'hash':
+                        alg = share(hash_node.get('alg'))
+                        hexdigest = share(hash_node.get('hexdigest'))
+                        if alg is None or hexdigest is None:
+                            return None
+            elif tag == 'function':
+                function = share(child.get('name'))
+                if function is None:
+                    return None
+            elif tag == 'point':
+                if end_line is not None:
+                    return None
+                line = child.get('line')
+                column = child.get('column')
+                if line is None or column is None:
+                    return None
+                line = int(line)
+                column = int(column)
+            elif tag == 'range':
+                if line is not None:
+                    return None
+                points = list(child)
+                if len(points) < 2:
+                    return None
+                line = points[0].get('line')
+                column = points[0].get('column')
+                end_line = points[1].get('line')
+                end_column = points[1].get('column')
+                if None in (line, column, end_line, end_column):
+                    return None
+                line = int(line)
+                column = int(column)
+                end_line = int(end_line)
+                end_column = int(end_column)
+        if givenpath is None:
+            return None
+        fields += (givenpath, abspath, alg, hexdigest, function,
+                   line, column, end_line, end_column, notes)
+    return tuple(fields)
+
+def _compact_trace_from_json(jsonobj):
+    """
+    Get the compact form of the JSON form of a trace, or None
+    """
+    setdefault = {}.setdefault
+    fields = []
+    for state in jsonobj['states']:
+        location = state['location']
+        if location is None or location['file'] is None:
+            return None
+        file_ = location['file']
+        hash_ = file_['hash_']
+        if hash_ is not None:
+            alg = hash_['alg']
+            hexdigest = hash_['hexdigest']
+        else:
+            alg = hexdigest = None
+        function = location['function']
+        if function is not None:
+            function = function['name']
+        point = location['point']
+        range_ = location['range_']
+        if range_ is not None:
+            if point is not None:
+                return None
+            line = range_['start']['line']
+            column = range_['start']['column']
+            end_line = range_['end']['line']
+            end_column = range_['end']['column']
+        elif point is not None:
+            line = point['line']
+            column = point['column']
+            end_line = end_column = None
+        else:
+            line = column = end_line = end_column = None
+        notes = state['notes']
+        if notes is not None:
+            notes = notes['text']
+        values = (file_['givenpath'], file_['abspath'], alg, hexdigest,
+                  function, line, column, end_line, end_column, notes)
+        # (values of the wrong types are left for the constructors to
+        # reject, when decoding straight away)
+        if not all(value is None or isinstance(value, _string_type)
+                   for value in values[:5] + values[9:]):
+            return None
+        if not all(value is None or value.__class__ is int
+                   for value in values[5:9]):
+            return None
+        if values[0] is None or (point is not None and line is None) \
+                or (range_ is not None and None in values[5:9]):
+            return None
+        # (sharing the strings naming files and functions within the trace)
+        fields += [setdefault(value, value) for value in values[:5]]
+        fields += values[5:]
+    return tuple(fields)
+
+def _decode_compact_trace(fields, interner):
+    """
+    Build a Trace from its compact form
+    """
+    if interner is None:
+        interner = Interner()
+    states = []
+    num_fields = len(_COMPACT_STATE_FIELDS)
+    for i in range(0, len(fields), num_fields):
+        (givenpath, abspath, alg, hexdigest, function, line, column,
+         end_line, end_column, notes) = fields[i:i + num_fields]
+        hash_ = Hash.unchecked(alg, hexdigest) if alg is not None else None
+        file_ = interner.file(givenpath, abspath, hash_)
+        if function is not None:
+            function = interner.function(function)
+        if end_line is not None:
+            location = Location.unchecked(
+                file_, function, None,
+                Range.unchecked(interner.point(line, column),
+                                interner.point(end_line, end_column)))
+        elif line is not None:
+            location = Location.unchecked(
+                file_, function, interner.point(line, column))
+        else:
+            location = Location.unchecked(file_, function)
+        states.append(State.unchecked(location,
+                                      Notes.unchecked(notes)
+                                      if notes is not None else None))
+    return Trace.unchecked(states)
+
 class State(JsonMixin):
+    __slots__ = ('location', 'notes')
+
     attrs = [Attribute('location', 'Location'),
              Attribute('notes', 'Notes', nullable=True)]
 
@@ -997,14 +1779,16 @@ class State(JsonMixin):
         self.notes = notes
 
     @classmethod
-    def from_xml(cls, node):
-        location = Location.from_xml(node.find('location'))
-        notes_node = node.find('notes')
-        if notes_node is not None:
-            notes = Notes.from_xml(notes_node)
-        else:
-            notes = None
-        return State(location, notes)
+    def from_xml(cls, node, interner=None):
+        location = notes = None
+        for child in node:
+            tag = child.tag
+            if tag == 'location':
+                location = Location.from_xml(child, interner)
+            elif tag == 'notes':
+                notes = Notes.from_xml(child)
+        return State.unchecked(_required(location, node, '<location>'),
+                               notes)
 
     def to_xml(self):
         node = ET.Element('state')
@@ -1017,7 +1801,7 @@ class State(JsonMixin):
         return 'State(location=%r, notes=%r)' % (self.location, self.notes)
 
     def __hash__(self):
-        return hash(self.location) ^ hash(self.notes)
+        return hash((self.location, self.notes))
 
     def accept(self, visitor):
         visitor.visit_state(self)
@@ -1026,6 +1810,8 @@ class State(JsonMixin):
             self.notes.accept(visitor)
 
 class Location(JsonMixin):
+    __slots__ = ('file', 'function', 'point', 'range_')
+
     attrs = [Attribute('file', 'File'),
              Attribute('function', 'Function', nullable=True),
              Attribute('point', 'Point', nullable=True),
@@ -1045,24 +1831,20 @@ class Location(JsonMixin):
         self.range_ = range_
 
     @classmethod
-    def from_xml(cls, node):
-        file = File.from_xml(node.find('file'))
-        function_node = node.find('function')
-        if function_node is not None:
-            function = Function.from_xml(function_node)
-        else:
-            function = None
-        point_node = node.find('point')
-        if point_node is not None:
-            point = Point.from_xml(point_node)
-        else:
-            point = None
-        range_node = node.find('range')
-        if range_node is not None:
-            range_ = Range.from_xml(range_node)
-        else:
-            range_ = None
-        return Location(file, function, point, range_)
+    def from_xml(cls, node, interner=None):
+        file = function = point = range_ = None
+        for child in node:
+            tag = child.tag
+            if tag == 'file':
+                file = File.from_xml(child, interner)
+            elif tag == 'function':
+                function = Function.from_xml(child, interner)
+            elif tag == 'point':
+                point = Point.from_xml(child, interner)
+            elif tag == 'range':
+                range_ = Range.from_xml(child, interner)
+        return Location.unchecked(_required(file, node, '<file>'), function,
+                                  point, range_)
 
     def to_xml(self):
         node = ET.Element('location')
@@ -1080,8 +1862,7 @@ class Location(JsonMixin):
                 (self.file, self.function, self.point, self.range_))
 
     def __hash__(self):
-        return (hash(self.file) ^ hash(self.function)
-                ^ hash(self.point) ^ hash(self.range_))
+        return hash((self.file, self.function, self.point, self.range_))
 
     def accept(self, visitor):
         visitor.visit_location(self)
@@ -1108,6 +1889,8 @@ class Location(JsonMixin):
             return self.range_.start.column
 
 class File(JsonMixin):
+    __slots__ = ('givenpath', 'abspath', 'hash_')
+
     attrs = [Attribute('givenpath', _string_type),
              Attribute('abspath',  _string_type, nullable=True),
              Attribute('hash_',  'Hash', nullable=True)]
@@ -1124,15 +1907,16 @@ class File(JsonMixin):
         self.hash_ = hash_
 
     @classmethod
-    def from_xml(cls, node):
-        givenpath = node.get('given-path')
+    def from_xml(cls, node, interner=None):
+        givenpath = _required(node.get('given-path'), node, 'given-path')
         abspath = node.get('absolute-path')
-        hash_node = node.find('hash')
-        if hash_node is not None:
-            hash_ = Hash.from_xml(hash_node)
-        else:
-            hash_ = None
-        result = File(givenpath, abspath, hash_)
+        hash_ = None
+        for child in node:
+            if child.tag == 'hash':
+                hash_ = Hash.from_xml(child)
+        if interner is not None:
+            return interner.file(givenpath, abspath, hash_)
+        result = File.unchecked(givenpath, abspath, hash_)
         return result
 
     def to_xml(self):
@@ -1149,12 +1933,14 @@ class File(JsonMixin):
                 (self.givenpath, self.abspath, self.hash_))
 
     def __hash__(self):
-        return hash(self.givenpath) ^ hash(self.abspath) ^ hash(self.hash_)
+        return hash((self.givenpath, self.abspath, self.hash_))
 
     def accept(self, visitor):
         visitor.visit_file(self)
 
 class Hash(JsonMixin):
+    __slots__ = ('alg', 'hexdigest')
+
     attrs = [Attribute('alg', _string_type),
              Attribute('hexdigest',  _string_type)]
 
@@ -1166,9 +1952,9 @@ class Hash(JsonMixin):
 
     @classmethod
     def from_xml(cls, node):
-        alg = node.get('alg')
-        hexdigest = node.get('hexdigest')
-        result = Hash(alg, hexdigest)
+        alg = _required(node.get('alg'), node, 'alg')
+        hexdigest = _required(node.get('hexdigest'), node, 'hexdigest')
+        result = Hash.unchecked(alg, hexdigest)
         return result
 
     def to_xml(self):
@@ -1182,18 +1968,22 @@ class Hash(JsonMixin):
                 (self.alg, self.hexdigest))
 
     def __hash__(self):
-        return hash(self.alg) ^ hash(self.hexdigest)
+        return hash((self.alg, self.hexdigest))
 
 class Function(JsonMixin):
+    __slots__ = ('name', )
+
     attrs = [Attribute('name', _string_type)]
 
     def __init__(self, name):
         self.name = name
 
     @classmethod
-    def from_xml(cls, node):
-        name = node.get('name')
-        result = Function(name)
+    def from_xml(cls, node, interner=None):
+        name = _required(node.get('name'), node, 'name')
+        if interner is not None:
+            return interner.function(name)
+        result = Function.unchecked(name)
         return result
 
     def to_xml(self):
@@ -1211,6 +2001,8 @@ class Function(JsonMixin):
         visitor.visit_function(self)
 
 class Point(JsonMixin):
+    __slots__ = ('line', 'column')
+
     attrs = [Attribute('line', int),
              Attribute('column', int)]
 
@@ -1221,10 +2013,12 @@ class Point(JsonMixin):
         self.column = column
 
     @classmethod
-    def from_xml(cls, node):
-        line = int(node.get('line'))
-        column = int(node.get('column'))
-        result = Point(line, column)
+    def from_xml(cls, node, interner=None):
+        line = int(_required(node.get('line'), node, 'line'))
+        column = int(_required(node.get('column'), node, 'column'))
+        if interner is not None:
+            return interner.point(line, column)
+        result = Point.unchecked(line, column)
         return result
 
     def to_xml(self):
@@ -1238,12 +2032,14 @@ class Point(JsonMixin):
                 (self.line, self.column))
 
     def __hash__(self):
-        return hash(self.line) ^ hash(self.column)
+        return hash((self.line, self.column))
 
     def accept(self, visitor):
         visitor.visit_point(self)
 
 class Range(JsonMixin):
+    __slots__ = ('start', 'end')
+
     attrs = [Attribute('start', 'Point'),
              Attribute('end', 'Point')]
 
@@ -1254,11 +2050,13 @@ class Range(JsonMixin):
         self.end = end
 
     @classmethod
-    def from_xml(cls, node):
+    def from_xml(cls, node, interner=None):
         children = list(node)
-        start = Point.from_xml(children[0])
-        end = Point.from_xml(children[1])
-        result = Range(start, end)
+        if len(children) < 2:
+            raise ValueError('<range> without two <point>s')
+        start = Point.from_xml(children[0], interner)
+        end = Point.from_xml(children[1], interner)
+        result = Range.unchecked(start, end)
         return result
 
     def to_xml(self):
@@ -1272,7 +2070,7 @@ class Range(JsonMixin):
                 (self.start, self.end))
 
     def __hash__(self):
-        return hash(self.start) ^ hash(self.end)
+        return hash((self.start, self.end))
 
     def accept(self, visitor):
         visitor.visit_range(self)
@@ -1332,9 +2130,229 @@ class CustomFields(OrderedDict):
         # dicts are usually mutable, but it would be useful to hash
         # CustomFields instances (and assume they don't change from under
         # us)
-        result = 0
-        for key, value in self.iteritems():
-            result ^= hash(key) ^ hash(value)
+        return hash(tuple(self.items()))
+
+#
+# Generated JSON conversion and comparison
+#
+
+# Converting to and from JSON and comparing model objects by walking the
+# "attrs" metadata of each class at runtime involves a getattr(), a
+# globals() lookup and several type comparisons per attribute.  Instead,
+# specialized functions are generated for each class from that metadata
+# once, at import time.
+
+_getargspec = getattr(inspect, 'getfullargspec', None) or inspect.getargspec
+
+def _generate_attrs_methods(cls):
+    """
+    Generate and install the methods for cls, returning the namespace of
+    the generated code, and a dict mapping the names within it of the
+    decoders it needs to the classes that they decode
+    """
+    namespace = {'cls': cls}
+    decoders = {}
+    to_json_lines = ['def _attrs_to_json(self):',
+                     '    result = {}']
+    from_json_lines = ['def _attrs_from_json(jsonobj):',
+                       '    if jsonobj is None:',
+                       '        return None']
+    kwargs = []
+    comparisons = []
+    for attr in cls.attrs:
+        name = attr.name
+        comparisons.append('self.%s == other.%s' % (name, name))
+        kwargs.append('%s=%s' % (name, name))
+        to_json_lines.append('    value = self.%s' % name)
+        from_json_lines.append('    value = jsonobj[%r]' % name)
+        if isinstance(attr.type, list):
+            decoders['from_json_' + name] = globals()[attr.type[0]]
+            to_json_lines.append(
+                '    result[%r] = (None if value is None'
+                ' else [item.to_json() for item in value])' % name)
+            from_json_lines.append(
+                '    %s = (None if value is None'
+                ' else [from_json_%s(item) for item in value])'
+                % (name, name))
+        elif attr.type in (int, float, _string_type):
+            to_json_lines.append('    result[%r] = value' % name)
+            from_json_lines.append('    %s = value' % name)
+        else:
+            decoders['from_json_' + name] = attr.resolve_type()
+            to_json_lines.append(
+                '    result[%r] = None if value is None else value.to_json()'
+                % name)
+            if attr.lazy:
+                # (the class provides a _lazy_from_json() giving a
+                # LazyValue)
+                namespace['lazy_from_json_' + name] = \
+                    attr.resolve_type()._lazy_from_json
+                from_json_lines.append(
+                    '    %s = (None if value is None'
+                    ' else lazy_from_json_%s(value))' % (name, name))
+            else:
+                from_json_lines.append(
+                    '    %s = None if value is None else from_json_%s(value)'
+                    % (name, name))
+    to_json_lines.append('    return result')
+    from_json_lines.append('    return cls(%s)' % ', '.join(kwargs))
+    # unchecked() takes the same arguments as __init__, which are those of
+    # the attrs, in order:
+    argspec = _getargspec(cls.__init__)
+    assert argspec.args[1:] == [attr.name for attr in cls.attrs]
+    defaults = argspec.defaults or ()
+    assert all(default is None for default in defaults)
+    params = ([attr.name for attr in cls.attrs[:len(cls.attrs) - len(defaults)]]
+              + ['%s=None' % attr.name
+                 for attr in cls.attrs[len(cls.attrs) - len(defaults):]])
+    unchecked_lines = ['def unchecked(cls, %s):' % ', '.join(params),
+                       '    self = new(cls)']
+    for attr in cls.attrs:
+        unchecked_lines.append('    self.%s = %s' % (attr.name, attr.name))
+    unchecked_lines.append('    return self')
+    namespace['new'] = object.__new__
+
+    # _is_valid() is a fast check that validate() would find no problems;
+    # only if it fails are the (slower) descriptions generated
+    valid_lines = ['def _is_valid(self):']
+    for attr in cls.attrs:
+        valid_lines.append('    v = self.%s' % attr.name)
+        if attr.nullable:
+            valid_lines.append('    if v is not None:')
+            indent = '        '
+        else:
+            valid_lines.append('    if v is None: return False')
+            indent = '    '
+        if isinstance(attr.type, list):
+            namespace['list_type_' + attr.name] = globals()[attr.type[0]]
+            valid_lines += [indent + 'if v.__class__ is not list: return False',
+                            indent + 'for item in v:',
+                            indent + '    if not (isinstance(item, list_type_%s)'
+                            ' and item._is_valid()): return False' % attr.name]
+        elif attr.type in (_string_type, int, float):
+            namespace['type_' + attr.name] = (integer_types if attr.type is int
+                                              else attr.type)
+            valid_lines.append(indent + 'if not isinstance(v, type_%s)'
+                               ' or v is True or v is False: return False'
+                               % attr.name)
+        elif attr.type == 'CustomFields':
+            valid_lines.append(indent + 'if not _customfields_are_valid(v):'
+                               ' return False')
+        else:
+            namespace['type_' + attr.name] = attr.resolve_type()
+            valid_lines.append(indent + 'if not (isinstance(v, type_%s)'
+                               ' and v._is_valid()): return False' % attr.name)
+    if cls._iter_own_errors is not JsonMixin._iter_own_errors:
+        valid_lines.append('    for error in self._iter_own_errors():'
+                           ' return False')
+    valid_lines.append('    return True')
+    namespace['_customfields_are_valid'] = _customfields_are_valid
+
+    eq_lines = ['def __eq__(self, other):',
+                '    try:',
+                '        return %s' % ' and '.join(comparisons),
+                '    except AttributeError:',
+                '        return False']
+    source = '\n'.join(to_json_lines + from_json_lines + unchecked_lines
+                       + valid_lines + eq_lines) + '\n'
+    exec(compile(source, '<generated methods for %s>' % cls.__name__,
+                 'exec'),
+         namespace)
+    cls._attrs_to_json = namespace['_attrs_to_json']
+    cls._attrs_from_json = staticmethod(namespace['_attrs_from_json'])
+    cls.__eq__ = namespace['__eq__']
+    # Construct an instance without the type checks of __init__, for use
+    # where the arguments are known to be well-typed (see validate())
+    cls.unchecked = classmethod(namespace['unchecked'])
+    cls._is_valid = namespace['_is_valid']
+    return namespace, decoders
+
+def _generate_all_attrs_methods():
+    generated = []
+    for value in list(globals().values()):
+        if (isinstance(value, type)
+            and issubclass(value, JsonMixin)
+            and 'attrs' in value.__dict__):
+            generated.append(_generate_attrs_methods(value))
+
+    # Now that every class has its decoder, link them together: call the
+    # generated decoder directly, unless the class has its own from_json
+    # (e.g. Result and Sut, which dispatch on the "type" field)
+    for namespace, decoders in generated:
+        for name, cls in iteritems(decoders):
+            if (getattr(cls.from_json, '__func__', None)
+                is JsonMixin.from_json.__func__):
+                namespace[name] = cls._attrs_from_json
+            else:
+                namespace[name] = cls.from_json
+
+_generate_all_attrs_methods()
+
+#
+# Sharing of identical objects
+#
+
+class Interner(object):
+    """
+    A table of shared File, Function and Point instances (and of strings,
+    for the compact form of traces that are yet to be decoded).
+
+    Large reports mention the same few thousand paths and functions in
+    millions of locations; parsers and readers use an Interner (scoped to
+    the Analysis being built) so that identical values are represented by
+    a single object.
+
+    The objects are built via unchecked(), so callers must pass values of
+    the right types, as the readers (having checked the input) and parsers
+    do.
+
+    Interned objects are shared, so they should only be modified in ways
+    that are valid for every user of the object, as Analysis.fixup_files
+    does (the new abspath and hash_ of a File depend only on its givenpath).
+    Such modifications are detected on lookup: an entry that no longer
+    matches the requested values is replaced, rather than returned.
+    """
+    __slots__ = ('files', 'functions', 'points', 'strings')
+
+    def __init__(self, share_points=True):
+        # (with share_points=False, Points are built afresh each time:
+        # unlike paths and functions, the number of distinct points grows
+        # with the size of a report, so a long-lived Interner, such as that
+        # of an AnalysisReader, shouldn't hold on to them all)
+        self.files = {}
+        self.functions = {}
+        self.points = {} if share_points else None
+        self.strings = {}
+
+    def file(self, givenpath, abspath, hash_=None):
+        if hash_ is not None:
+            key = (givenpath, abspath, hash_.alg, hash_.hexdigest)
+        else:
+            key = (givenpath, abspath)
+        result = self.files.get(key)
+        if (result is None
+            or result.givenpath != givenpath
+            or result.abspath != abspath
+            or result.hash_ != hash_):
+            result = self.files[key] = File.unchecked(givenpath, abspath,
+                                                      hash_)
+        return result
+
+    def function(self, name):
+        result = self.functions.get(name)
+        if result is None or result.name != name:
+            result = self.functions[name] = Function.unchecked(name)
+        return result
+
+    def point(self, line, column):
+        if self.points is None:
+            return Point.unchecked(line, column)
+        key = (line, column)
+        result = self.points.get(key)
+        if (result is None
+            or result.line != line
+            or result.column != column):
+            result = self.points[key] = Point.unchecked(line, column)
         return result
 
 #
@@ -1390,6 +2408,56 @@ class Visitor:
     def visit_range(self, range_):
         pass
 
+_VISIT_METHODS = sorted(name for name in Visitor.__dict__
+                        if name.startswith('visit_'))
+
+# Mapping from Visitor subclass to the names of the visit_* methods that it
+# overrides
+_visitor_overrides = {}
+
+def _get_visitor_overrides(cls):
+    result = _visitor_overrides.get(cls)
+    if result is None:
+        result = []
+        for name in _VISIT_METHODS:
+            for klass in inspect.getmro(cls):
+                if name in klass.__dict__:
+                    if klass is not Visitor:
+                        result.append(name)
+                    break
+        result = _visitor_overrides[cls] = tuple(result)
+    return result
+
+class MultiVisitor(Visitor):
+    """
+    A Visitor that applies several visitors in a single walk of the tree:
+
+        analysis.accept(MultiVisitor([NormalizePaths(), CountIssues()]))
+
+    Each node is passed (in the order given) only to those visitors that
+    override the relevant visit_* method, these being found once per
+    Visitor subclass.
+    """
+    def __init__(self, visitors):
+        self.visitors = list(visitors)
+        for name in _VISIT_METHODS:
+            methods = [getattr(visitor, name)
+                       for visitor in self.visitors
+                       if name in _get_visitor_overrides(visitor.__class__)]
+            # Shadow the no-op method inherited from Visitor with an
+            # instance attribute, where there's anything to do:
+            if len(methods) == 1:
+                setattr(self, name, methods[0])
+            elif methods:
+                setattr(self, name, self._make_dispatcher(methods))
+
+    @staticmethod
+    def _make_dispatcher(methods):
+        def dispatch(node):
+            for method in methods:
+                method(node)
+        return dispatch
+
 def main():
     for filename in sorted(glob.glob('examples/example-*.xml')):
         print('%s as gcc output:' % filename)
@@ -0,0 +1,271 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+
+# Random access to the results of large Firehose XML reports, e.g. for
+# paging through them in a UI.
+#
+# The report is scanned once, recording the byte offsets of the start and
+# end of each <issue>, <failure> and <info> element within <results> in a
+# sidecar file (by default, the path of the report with ".offsets"
+# appended).  Each request then maps the report into memory and parses
+# just the elements it needs.
+#
+# The sidecar holds a header (a magic string, and the size and mtime of
+# the report when it was scanned, and the number of results), followed by
+# a (start, end) pair of little-endian 64-bit offsets per result.  Entries
+# are read from it with struct.unpack_from, so it is never read as a
+# whole.
+#
+# The scan relies on results never nesting within each other, and on text
+# never holding a literal "<" (which XML escapes).  Fragments are parsed as
+# UTF-8, the encoding that AnalysisWriter and Analysis.to_xml() use.
+
+import mmap
+import os
+import re
+import struct
+
+from six import BytesIO, integer_types
+from six.moves import range
+
+from firehose import xmlbackend
+from firehose.hashcache import stat_key
+from firehose.model import AnalysisReader, Issue, Failure, Info, Interner
+
+MAGIC = b'FHOFFS01'
+
+_HEADER = struct.Struct('<8sQQQ')
+
+_ENTRY = struct.Struct('<QQ')
+
+# (number of entries packed per write)
+_CHUNK_SIZE = 65536
+
+_RESULT_CLASSES = {'issue': Issue, 'failure': Failure, 'info': Info}
+
+# Comments and CDATA sections (to be skipped), and the start and end tags
+# of <results> and of the results within it
+_SCAN = re.compile(br'''
+      <!--.*?-->
+    | <!\[CDATA\[.*?\]\]>
+    | <(results|issue|failure|info)
+       (?:\s+[^\s=/>]+\s*=\s*(?:"[^"]*"|'[^']*'))*\s*(/?)>
+    | </(results|issue|failure|info)\s*>
+    ''', re.DOTALL | re.VERBOSE)
+
+def _scan(data):
+    """
+    Generate a (start, end) pair of byte offsets for each result within
+    the given report
+    """
+    in_results = False
+    start = None
+    for match in _SCAN.finditer(data):
+        opened, selfclosing, closed = match.groups()
+        if opened == b'results':
+            if selfclosing:
+                return
+            in_results = True
+        elif closed == b'results':
+            return
+        elif not in_results:
+            continue
+        elif opened is not None:
+            if selfclosing:
+                yield match.start(), match.end()
+            else:
+                start = match.start()
+        elif closed is not None and start is not None:
+            yield start, match.end()
+            start = None
+
+def _map_file(f):
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def build_offset_index(path, indexpath=None):
+    """
+    Scan the report at the given path, writing the offsets of its results
+    to a sidecar file (by default, path + ".offsets"), and returning the
+    number of results
+    """
+    if indexpath is None:
+        indexpath = path + '.offsets'
+    size, mtime_ns, _ = stat_key(path)
+    count = 0
+    # (written to a temporary file, renamed into place once complete)
+    tmppath = '%s.%i.tmp' % (indexpath, os.getpid())
+    try:
+        with open(path, 'rb') as f, open(tmppath, 'wb') as out:
+            out.write(_HEADER.pack(MAGIC, 0, 0, 0))
+            data = _map_file(f)
+            try:
+                chunk = []
+                for start, end in _scan(data):
+                    chunk.append(start)
+                    chunk.append(end)
+                    if len(chunk) == 2 * _CHUNK_SIZE:
+                        out.write(struct.pack('<%iQ' % len(chunk), *chunk))
+                        count += _CHUNK_SIZE
+                        chunk = []
+                out.write(struct.pack('<%iQ' % len(chunk), *chunk))
+                count += len(chunk) // 2
+            finally:
+                data.close()
+            out.seek(0)
+            out.write(_HEADER.pack(MAGIC, size, mtime_ns, count))
+        os.rename(tmppath, indexpath)
+    except (IOError, OSError, ValueError):
+        if os.path.exists(tmppath):
+            os.unlink(tmppath)
+        raise
+    return count
+
+def _read_header(indexpath):
+    with open(indexpath, 'rb') as f:
+        data = f.read(_HEADER.size)
+    if len(data) != _HEADER.size:
+        raise ValueError('truncated offset index: %r' % indexpath)
+    magic, size, mtime_ns, count = _HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError('not an offset index: %r' % indexpath)
+    return size, mtime_ns, count
+
+class OffsetIndex(object):
+    """
+    Random access to the results of the Firehose XML report at the given
+    path, via its sidecar offset index, which is built (or rebuilt) if it
+    is missing or older than the report.
+
+    Indexing gives a single result, and slicing gives a list of results,
+    e.g. index[123456] or index[5000:5100].
+    """
+    def __init__(self, path, indexpath=None):
+        self.path = path
+        if indexpath is None:
+            indexpath = path + '.offsets'
+        self.indexpath = indexpath
+        if not self.is_current():
+            build_offset_index(path, indexpath)
+        self._stat, self._count = self._check()
+
+    def is_current(self):
+        """
+        Is there a sidecar offset index matching the current report?
+        """
+        if not os.path.exists(self.indexpath):
+            return False
+        try:
+            size, mtime_ns, _ = _read_header(self.indexpath)
+        except ValueError:
+            return False
+        return (size, mtime_ns) == stat_key(self.path)[:2]
+
+    def _check(self):
+        size, mtime_ns, count = _read_header(self.indexpath)
+        if (size, mtime_ns) != stat_key(self.path)[:2]:
+            raise ValueError('%r has changed since it was indexed'
+                             % self.path)
+        return (size, mtime_ns), count
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return 'OffsetIndex(%r, %r)' % (self.path, self.indexpath)
+
+    @property
+    def metadata(self):
+        """
+        The Metadata of the report
+        """
+        with open(self.path, 'rb') as f:
+            return AnalysisReader(f).metadata
+
+    def _spans(self, first, count):
+        """
+        Get the (start, end) offsets of count results from the given
+        position onwards
+        """
+        with open(self.indexpath, 'rb') as f:
+            data = _map_file(f)
+            try:
+                flat = struct.unpack_from('<%iQ' % (2 * count), data,
+                                          _HEADER.size + first * _ENTRY.size)
+            finally:
+                data.close()
+        return list(zip(flat[0::2], flat[1::2]))
+
+    def _position(self, position):
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError('result index out of range')
+        return position
+
+    def offsets(self, position):
+        """
+        Get the (start, end) byte offsets of the result at the given
+        position within the report
+        """
+        return self._spans(self._position(position), 1)[0]
+
+    def _parse(self, spans, contiguous):
+        """
+        Map the report into memory, and parse the results at the given
+        spans; if contiguous, the results follow one another, and are
+        parsed in one go (only whitespace and comments can lie between
+        them)
+        """
+        if not spans:
+            return []
+        if self._check()[0] != self._stat:
+            raise ValueError('%r has changed since it was indexed'
+                             % self.path)
+        interner = Interner()
+        with open(self.path, 'rb') as f:
+            data = _map_file(f)
+            try:
+                if contiguous:
+                    nodes = list(xmlbackend.parse(BytesIO(
+                        b'<results>' + data[spans[0][0]:spans[-1][1]]
+                        + b'</results>')))
+                else:
+                    nodes = [xmlbackend.parse(BytesIO(data[start:end]))
+                             for start, end in spans]
+            finally:
+                data.close()
+        return [_RESULT_CLASSES[node.tag].from_xml(node, interner)
+                for node in nodes]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._count)
+            if step == 1:
+                return self._parse(self._spans(start, max(stop - start, 0)),
+                                   True)
+            return self._parse([self._spans(position, 1)[0]
+                                for position in range(start, stop, step)],
+                               False)
+        if not isinstance(key, integer_types):
+            raise TypeError('indices must be integers or slices')
+        return self._parse(self._spans(self._position(key), 1), False)[0]
+
+    def __iter__(self):
+        for start in range(0, self._count, 1000):
+            for result in self[start:start + 1000]:
+                yield result
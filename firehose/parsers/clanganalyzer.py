@@ -28,9 +28,8 @@ import plistlib
 from pprint import pprint
 import sys
 
-from firehose.model import Message, Function, Point, Range, \
-    File, Location, Generator, Metadata, Analysis, Issue, Sut, Trace, \
-    State, Notes, CustomFields
+from firehose.model import Message, Range, Location, Generator, \
+    Metadata, Analysis, Issue, Sut, Trace, CustomFields, Interner
 
 def parse_scandir(resultdir, analyzerversion=None, sut=None):
     """
@@ -61,6 +60,7 @@ def parse_plist(file_path, analyzerversion=None, sut=None, file_=None, stats=Non
                           version=analyzerversion)
     metadata = Metadata(generator, sut, file_, stats)
     analysis = Analysis(metadata, [])
+    interner = Interner()
 
     if 'clang_version' in plist:
         generator.version = plist['clang_version']
@@ -76,53 +76,59 @@ def parse_plist(file_path, analyzerversion=None, sut=None, file_=None, stats=Non
             if key in diagnostic:
                 customfields[key] = diagnostic[key]
 
-        message = Message(text=diagnostic['description'])
+        message = Message.unchecked(text=diagnostic['description'])
 
         loc = diagnostic['location']
-        location = Location(file=File(givenpath=files[loc['file']],
-                                      abspath=None),
+        location = Location.unchecked(file=interner.file(givenpath=files[loc['file']],
+                                                         abspath=None),
 
-                            # FIXME: doesn't tell us function name
-                            # TODO: can we patch this upstream?
-                            function=None,
+                                      # FIXME: doesn't tell us function name
+                                      # TODO: can we patch this upstream?
+                                      function=None,
 
-                            point=Point(int(loc['line']),
-                                        int(loc['col'])))
+                                      point=make_point_from_plist_point(loc, interner))
 
         notes = None
 
-        trace = make_trace(files, diagnostic['path'])
+        # The trace is only built if it's used, but the plist's 'path' is
+        # read (and checked) now, keeping just its compact form:
+        trace = Trace.lazy(make_compact_trace(files, diagnostic['path']),
+                           interner)
 
-        issue = Issue(cwe,
-                      # Use the 'type' field for the testid:
-                      diagnostic['type'],
-                      location, message, notes, trace,
-                      customfields=customfields)
+        issue = Issue.unchecked(cwe,
+                                # Use the 'type' field for the testid:
+                                diagnostic['type'],
+                                location, message, notes, trace,
+                                customfields=customfields)
 
         analysis.results.append(issue)
 
     return analysis
 
-def make_point_from_plist_point(loc):
+def make_point_from_plist_point(loc, interner=None):
     # point:
     #   e.g. {'col': 2, 'file': 0, 'line': 130}
-    return Point(int(loc['line']),
-                 int(loc['col']))
+    if interner is None:
+        interner = Interner()
+    return interner.point(int(loc['line']),
+                          int(loc['col']))
 
-def make_location_from_point(files, loc):
+def make_location_from_point(files, loc, interner=None):
     # loc:
     #   e.g. {'col': 2, 'file': 0, 'line': 130}
-    location = Location(file=File(givenpath=files[loc['file']],
-                                  abspath=None),
+    if interner is None:
+        interner = Interner()
+    location = Location.unchecked(file=interner.file(givenpath=files[loc['file']],
+                                                     abspath=None),
 
-                        # FIXME: doesn't tell us function name
-                        # TODO: can we patch this upstream?
-                        function=Function(''),
+                                  # FIXME: doesn't tell us function name
+                                  # TODO: can we patch this upstream?
+                                  function=interner.function(''),
 
-                        point=make_point_from_plist_point(loc))
+                                  point=make_point_from_plist_point(loc, interner))
     return location
 
-def make_location_from_range(files, range_):
+def make_location_from_range(files, range_, interner=None):
     # range_:
     #    e.g.:
     #     [{'col': 18, 'file': 0, 'line': 165},
@@ -131,32 +137,56 @@ def make_location_from_range(files, range_):
     start = range_[0]
     end = range_[1]
     assert start['file'] == end['file']
+    if interner is None:
+        interner = Interner()
 
     if start == end:
-        point = make_point_from_plist_point(start)
+        point = make_point_from_plist_point(start, interner)
         range_ = None
     else:
         point = None
-        range_ = Range(start=make_point_from_plist_point(start),
-                       end=make_point_from_plist_point(end))
+        range_ = Range.unchecked(start=make_point_from_plist_point(start, interner),
+                                 end=make_point_from_plist_point(end, interner))
 
-    location = Location(file=File(givenpath=files[start['file']],
-                                  abspath=None),
+    location = Location.unchecked(file=interner.file(givenpath=files[start['file']],
+                                                     abspath=None),
 
-                        # FIXME: doesn't tell us function name
-                        # TODO: can we patch this upstream?
-                        function=Function(''),
+                                  # FIXME: doesn't tell us function name
+                                  # TODO: can we patch this upstream?
+                                  function=interner.function(''),
 
-                        point=point,
-                        range_=range_)
+                                  point=point,
+                                  range_=range_)
 
     return location
 
-def make_trace(files, path):
+def make_trace(files, path, interner=None):
     """
     Construct a Trace instance from the .plist's 'path' list
     """
-    trace = Trace([])
+    return Trace.lazy(make_compact_trace(files, path), interner).materialize()
+
+def make_compact_location(files, start, end=None):
+    """
+    Get the fields of a location within the compact form of a trace (see
+    Trace.lazy) from a plist point, or from the endpoints of a range
+    """
+    # FIXME: doesn't tell us function name
+    # TODO: can we patch this upstream?
+    if end is None or start == end:
+        return (files[start['file']], None, None, None, '',
+                int(start['line']), int(start['col']), None, None)
+    assert start['file'] == end['file']
+    return (files[start['file']], None, None, None, '',
+            int(start['line']), int(start['col']),
+            int(end['line']), int(end['col']))
+
+def make_compact_trace(files, path):
+    """
+    Get the compact form of the trace (see Trace.lazy) given by the .plist's
+    'path' list
+    """
+    fields = []
     lastlocation = None
     for node in path:
         if 0:
@@ -177,12 +207,8 @@ def make_trace(files, path):
             #   node['extended_message']
             #   node['ranges']
 
-            loc = node['location']
-            location = make_location_from_point(files, loc)
-
-            notes = Notes(node['message'])
-            trace.add_state(State(location, notes))
-
+            location = make_compact_location(files, node['location'])
+            fields += location + (node['message'], )
             lastlocation = location
 
         elif kind == 'control':
@@ -196,17 +222,19 @@ def make_trace(files, path):
             for edge in edges:
                 edge_start = edge['start']
                 edge_end = edge['end']
+                assert len(edge_start) == 2
+                assert len(edge_end) == 2
 
-                startloc = make_location_from_range(files, edge_start)
-                endloc = make_location_from_range(files, edge_end)
+                startloc = make_compact_location(files, *edge_start)
+                endloc = make_compact_location(files, *edge_end)
 
                 if startloc != lastlocation:
-                    trace.add_state(State(startloc, None))
-                trace.add_state(State(endloc, None))
+                    fields += startloc + (None, )
+                fields += endloc + (None, )
                 lastlocation = endloc
         else:
             raise ValueError('unknown kind: %r' % kind)
-    return trace
+    return tuple(fields)
 
 if __name__ == '__main__':
     if len(sys.argv) != 2:
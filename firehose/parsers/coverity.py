@@ -25,9 +25,9 @@
 import json
 from pprint import pprint
 
-from firehose.model import Message, Function, Point, Range, \
-    File, Location, Generator, Metadata, Analysis, Issue, Sut, Trace, \
-    State, Notes, CustomFields
+from firehose.model import Message, Range, Location, Generator, \
+    Metadata, Analysis, Issue, Sut, Trace, State, Notes, CustomFields, \
+    Interner
 
 def parse_json_v2(path):
     """
@@ -43,6 +43,7 @@ def parse_json_v2(path):
     generator = Generator(name='coverity')
     metadata = Metadata(generator, sut=None, file_=None, stats=None)
     analysis = Analysis(metadata, [])
+    interner = Interner()
 
     for issue in js['issues']:
         if 0:
@@ -55,50 +56,68 @@ def parse_json_v2(path):
         testid = issue['checkerName']
 
         # Use the eventDescription of the final event for the message:
-        message = Message(text=issue['events'][-1]['eventDescription'])
+        message = Message.unchecked(text=issue['events'][-1]['eventDescription'])
 
-        location = Location(file=File(givenpath=issue['mainEventFilePathname'],
-                                      abspath=None),
+        location = Location.unchecked(file=interner.file(givenpath=issue['mainEventFilePathname'],
+                                                         abspath=None),
 
-                            function=Function(name=issue['functionDisplayName']),
+                                      function=interner.function(name=issue['functionDisplayName']),
 
-                            point=Point(int(issue['mainEventLineNumber']),
-                                        int(0)))
+                                      point=interner.point(int(issue['mainEventLineNumber']),
+                                                           int(0)))
 
         notes = None
 
-        trace = make_trace(issue)
+        # The trace is only built if it's used, but the events are read
+        # (and checked) now, keeping just their compact form:
+        trace = Trace.lazy(make_compact_trace(issue), interner)
 
         customfields = CustomFields()
         for key in ['mergeKey', 'subcategory', 'domain']:
             if key in issue:
                 customfields[key] = issue[key]
 
-        issue = Issue(cwe, testid,
-                      location, message, notes, trace,
-                      customfields=customfields)
+        issue = Issue.unchecked(cwe, testid,
+                                location, message, notes, trace,
+                                customfields=customfields)
 
         analysis.results.append(issue)
 
     return analysis
 
-def make_state(event):
+def make_state(event, interner=None):
     """
     Construct a State instance from an event within the JSON
     """
-    loc = Location(file=File(givenpath=event['filePathname'],
-                             abspath=None),
-                   function=None,
-                   point=Point(int(event['lineNumber']),
-                               int(0)))
-    notes = Notes(text=event['eventDescription'])
-    return State(loc, notes)
-
-def make_trace(issue):
+    if interner is None:
+        interner = Interner()
+    loc = Location.unchecked(file=interner.file(givenpath=event['filePathname'],
+                                                abspath=None),
+                             function=None,
+                             point=interner.point(int(event['lineNumber']),
+                                                  int(0)))
+    notes = Notes.unchecked(text=event['eventDescription'])
+    return State.unchecked(loc, notes)
+
+def make_compact_trace(issue):
+    """
+    Get the compact form of the trace (see Trace.lazy) given by an issue
+    within the JSON
+    """
+    fields = []
+    for event in issue['events']:
+        fields += (event['filePathname'], None, None, None, None,
+                   int(event['lineNumber']), 0, None, None,
+                   event['eventDescription'])
+    return tuple(fields)
+
+def make_trace(issue, interner=None):
     """
     Construct a Trace instance from an issue within the JSON
     """
+    if interner is None:
+        interner = Interner()
     trace = Trace([])
     for event in issue['events']:
-        trace.add_state(make_state(event))
+        trace.add_state(make_state(event, interner))
     return trace
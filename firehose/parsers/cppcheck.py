@@ -19,11 +19,10 @@
 #   USA
 
 import sys
-import xml.etree.ElementTree as ET
 
-from firehose.model import Message, Function, Point, \
-    File, Location, Generator, Metadata, Analysis, Issue, Notes, Failure, \
-    CustomFields
+from firehose import xmlbackend
+from firehose.model import Message, Location, Generator, Metadata, \
+    Analysis, Issue, Notes, Failure, CustomFields, Interner
 
 # Parser for output from cppcheck:
 #   http://sourceforge.net/apps/mediawiki/cppcheck/index.php?title=Main_Page
@@ -31,8 +30,7 @@ from firehose.model import Message, Function, Point, \
 #   cppcheck PATH_TO_SOURCES --xml --xml-version=2
 
 def parse_file(fileobj, sut=None, file_=None, stats=None):
-    tree = ET.parse(fileobj)
-    root = tree.getroot()
+    root = xmlbackend.parse(fileobj)
     node_cppcheck = root.find('cppcheck')
     version = node_cppcheck.get('version')
     node_errors = root.find('errors')
@@ -41,6 +39,7 @@ def parse_file(fileobj, sut=None, file_=None, stats=None):
                           version=node_cppcheck.get('version'))
     metadata = Metadata(generator, sut, file_, stats)
     analysis = Analysis(metadata, [])
+    interner = Interner()
 
     for node_error in node_errors.findall('error'):
         # e.g.:
@@ -59,14 +58,18 @@ def parse_file(fileobj, sut=None, file_=None, stats=None):
 
         location_nodes = list(node_error.findall('location'))
         for node_location in location_nodes:
-            location=Location(file=File(node_location.get('file'), None),
+            # (the Interner trusts its arguments)
+            path = node_location.get('file')
+            if path is None:
+                raise ValueError('<location> without a file')
+            location=Location(file=interner.file(path, None),
 
                               # FIXME: doesn't tell us function name
                               # TODO: can we patch this upstream?
                               function=None,
 
                               # doesn't emit column
-                              point=Point(int(node_location.get('line')), 0)) # FIXME: bogus column
+                              point=interner.point(int(node_location.get('line')), 0)) # FIXME: bogus column
             issue = Issue(None, testid, location, message, notes, None,
                           severity=node_error.get('severity'))
             analysis.results.append(issue)
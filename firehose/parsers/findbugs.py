@@ -19,10 +19,10 @@
 
 import re
 import sys
-import xml.etree.ElementTree as ET
 
-from firehose.model import Message, Function, Point, \
-    File, Location, Metadata, Generator, Issue, Analysis
+from firehose import xmlbackend
+from firehose.model import Message, Location, Metadata, Generator, \
+    Issue, Analysis, Interner
 
 DEBUG=False
 
@@ -45,19 +45,23 @@ def parse_file(data_file_obj, findbugs_version=None, sut=None, file_=None,
             version = findbugs_version)
     metadata = Metadata(generator, sut, file_, stats)
     analysis = Analysis(metadata, [])
+    interner = Interner()
 
     def parse_BugInstance(bugInstance):
         message = Message(bugInstance.find("LongMessage").text)
         # findbugs has no column information
         sourceLine = bugInstance.find("SourceLine")
-        point = Point(int(sourceLine.get("start")), 0)
+        point = interner.point(int(sourceLine.get("start")), 0)
         path = sourceLine.get("sourcepath")
-        path = File(path, None)
+        # (the Interner trusts its arguments)
+        if path is None:
+            raise ValueError('<SourceLine> without a sourcepath')
+        path = interner.file(path, None)
         method = bugInstance.find("Method")
-        if method:
+        if method is not None and len(method) > 0:
             function = method.find("Message").text
             tmpIndex = function.rfind("In method ") + len("In method ") - 1
-            function = Function(function[tmpIndex+1:])
+            function = interner.function(function[tmpIndex+1:])
         else:
             function = None
         location = Location(path, function, point)
@@ -65,8 +69,7 @@ def parse_file(data_file_obj, findbugs_version=None, sut=None, file_=None,
             print(str(location)+" "+str(message))
         return Issue(None, None, location, message, None, None)
 
-    tree = ET.parse(data_file_obj)
-    root = tree.getroot()
+    root = xmlbackend.parse(data_file_obj)
     for bugInstance in root.findall("BugInstance"):
         issue=parse_BugInstance(bugInstance)
         if issue:
@@ -19,8 +19,8 @@
 import sys
 import re
 from subprocess import check_output
-from firehose.model import Message, Point, \
-    File, Location, Generator, Metadata, Analysis, Issue
+from firehose.model import Message, Location, Generator, Metadata, \
+    Analysis, Issue, Interner
 
 
 def main():
@@ -56,6 +56,7 @@ def parse_file(infile):
                           version=get_flawfinder_version(line))
     metadata = Metadata(generator, None, None, None)
     analysis = Analysis(metadata, [])
+    interner = Interner()
 
     # A regex for "filename:linenum:"
     ISSUE_LINE_PATTERN = r"(\S.*)\:([0-9]+)\:"
@@ -80,9 +81,9 @@ def parse_file(infile):
             issue_severity = m.group(3)
             testid = m.group(4)
 
-            location = Location(file=File(issue_path, None),
+            location = Location(file=interner.file(issue_path, None),
                                 function=None,
-                                point=Point(int(issue_line), 0))
+                                point=interner.point(int(issue_line), 0))
 
             message_line = infile.readline()
             issue_message = ""
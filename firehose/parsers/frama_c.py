@@ -2,8 +2,8 @@
 import re
 import sys
 
-from firehose.model import Message, Point, \
-    File, Location, Metadata, Generator, Issue, Analysis
+from firehose.model import Message, Location, Metadata, Generator, \
+    Issue, Analysis, Interner
 
 # Parser for warnings emitted by frama-c
 # Frama-c allows for multiple analysis, including the following:
@@ -58,28 +58,33 @@ def parse_file(data_file, sut=None, file_=None, stats=None):
     generator = Generator(name='frama-c')
     metadata = Metadata(generator, sut, file_, stats)
     analysis = Analysis(metadata, [])
+    interner = Interner()
 
     for line in data_file.readlines():
         match_warning = FRAMA_C_SPARECODE_PATTERN.match(line)
 
         if match_warning:
-            issue = parse_warning(match_warning)
+            issue = parse_warning(match_warning, interner)
             analysis.results.append(issue)
     return analysis
 
 
-def parse_warning(match_warning):
+def parse_warning(match_warning, interner=None):
     """
     :param match_warning:  the matched object
     :type  match_warning:  SRE_Match
+    :param interner:  table of shared File/Function/Point instances
+    :type  interner:  Interner
     :param sut:   metadata about the software-under-test
     :type  sut:   Sut
 
     :return:    Issue
     """
+    if interner is None:
+        interner = Interner()
     message = Message(match_warning.group('message'))
-    point = Point(int(match_warning.group('line')), 0)
-    path = File(match_warning.group('path'), None)
+    point = interner.point(int(match_warning.group('line')), 0)
+    path = interner.file(match_warning.group('path'), None)
     location = Location(file=path, function=None, point=point)
     return Issue(
         cwe=None, testid=None, location=location, message=message, notes=None,
@@ -20,8 +20,8 @@
 import re
 import sys
 
-from firehose.model import Message, Function, Point, \
-    File, Location, Metadata, Generator, Issue, Analysis
+from firehose.model import Message, Location, Metadata, Generator, \
+    Issue, Analysis, Interner
 
 # Parser for warnings emitted by GCC
 # The code that generates these warnings can be seen within gcc's own
@@ -72,6 +72,7 @@ def parse_file(data_file, gccversion=None, sut=None, file_=None, stats=None):
                           version=gccversion)
     metadata = Metadata(generator, sut, file_, stats)
     analysis = Analysis(metadata, [])
+    interner = Interner()
 
     current_func_name = None
     for line in data_file.readlines():
@@ -85,7 +86,7 @@ def parse_file(data_file, gccversion=None, sut=None, file_=None, stats=None):
 
         # if we think the next line might describe a warning
         elif current_func_name is not None:
-            issue = parse_warning(line, current_func_name)
+            issue = parse_warning(line, current_func_name, interner)
             if issue:
                 analysis.results.append(issue)
             else:
@@ -94,12 +95,14 @@ def parse_file(data_file, gccversion=None, sut=None, file_=None, stats=None):
     return analysis
                 
             
-def parse_warning(line, func_name):
+def parse_warning(line, func_name, interner=None):
     """
     :param line:        current line read from file
     :type  line:        basestring
     :param func_name:   name of the current function
     :type  func_name:   basestring
+    :param interner:    table of shared File/Function/Point instances
+    :type  interner:    Interner
     :param gccversion:   version of GCC that generated this report
     :type  gccversion:   str
     :param sut:   metadata about the software-under-test
@@ -109,18 +112,21 @@ def parse_warning(line, func_name):
     """
     match = GCC_PATTERN.match(line)
     if match:
+        if interner is None:
+            interner = Interner()
+
         text = match.group('message')
         # GCC 10 onwards can (optionally) append a CWE id to the message.
         # Extract it if it is present.
         cwe_match = CWE_SUB_PATTERN.match(text)
         if cwe_match:
-            message = Message(cwe_match.group('message'))
+            message = Message.unchecked(cwe_match.group('message'))
             cwe = int(cwe_match.group('cwe'))
         else:
-            message = Message(text)
+            message = Message.unchecked(text)
             cwe = None
 
-        func = Function(func_name)
+        func = interner.function(func_name)
         try:
             column = int(match.group('column'))
         except ValueError:
@@ -136,11 +142,11 @@ def parse_warning(line, func_name):
         else:
             switch = None
 
-        point = Point(int(match.group('line')), column)
-        path = File(match.group('path'), None)
-        location = Location(path, func, point)
+        point = interner.point(int(match.group('line')), column)
+        path = interner.file(match.group('path'), None)
+        location = Location.unchecked(path, func, point)
 
-        return Issue(cwe, switch, location, message, None, None)
+        return Issue.unchecked(cwe, switch, location, message, None, None)
 
 
 if __name__ == '__main__':
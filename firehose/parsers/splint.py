@@ -24,9 +24,9 @@ import csv
 import os
 import re
 
-from firehose.model import Message, Function, Point, Range, \
-    File, Location, Generator, Metadata, Analysis, Issue, Sut, Trace, \
-    State, Notes, CustomFields
+from firehose.model import Message, Function, Range, Location, \
+    Generator, Metadata, Analysis, Issue, Sut, Trace, State, Notes, \
+    CustomFields, Interner
 
 FIELDS = ['warning', 'flag_code', 'flag_name', 'priority',
           'file', 'line', 'column',
@@ -34,15 +34,17 @@ FIELDS = ['warning', 'flag_code', 'flag_name', 'priority',
 WARNING_TEXT_IDX = FIELDS.index('warning_text')
 
 class Row(namedtuple('Row', FIELDS)):
-    def to_issue(self):
+    def to_issue(self, interner=None):
         """
         Generate an Issue from this csv row.
         """
-        location = Location(file=File(givenpath=self.file,
-                                      abspath=None),
+        if interner is None:
+            interner = Interner()
+        location = Location(file=interner.file(givenpath=self.file,
+                                               abspath=None),
                             function=None, # FIXME
-                            point=Point(int(self.line),
-                                        int(self.column)))
+                            point=interner.point(int(self.line),
+                                                 int(self.column)))
         return Issue(cwe=None,
                      testid=self.flag_name,
                      location=location,
@@ -79,6 +81,7 @@ def parse_splint_csv(path):
     generator = Generator(name='splint')
     metadata = Metadata(generator, None, None, None)
     analysis = Analysis(metadata, [])
+    interner = Interner()
     with open(path, 'r') as f:
         reader = csv.reader(f)
         for raw_row in reader:
@@ -86,7 +89,7 @@ def parse_splint_csv(path):
             if raw_row[0] == 'Warning':
                 continue
             rowobj = parse_row(raw_row)
-            analysis.results.append(rowobj.to_issue())
+            analysis.results.append(rowobj.to_issue(interner))
 
     return analysis
 
@@ -0,0 +1,615 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+
+# Storage of many analyses in an SQLite database, for answering questions
+# about years of reports without re-parsing their XML.
+#
+# The schema is normalized: each distinct generator, sut, file (given
+# path, absolute path and hash) and function name is stored once, and
+# referred to by id from the analyses, results and trace states.  A
+# location is stored inline, as the ids of its file and function and the
+# line and column of its point or of the ends of its range.
+#
+# Ingestion happens in batches: all of the rows for the analyses passed to
+# a single add_analyses() call are inserted with executemany() within one
+# transaction.  The database is put in WAL mode, so that queries can run
+# whilst another process is ingesting.
+#
+# Queries return model objects, which don't refer back to the database: the
+# trace states of the results are read along with them, in batches, rather
+# than one query per trace.
+
+import json
+import sqlite3
+
+from six import iteritems
+
+from firehose.model import Analysis, Metadata, Generator, Stats, Issue, \
+    Failure, Info, Location, Message, Notes, Trace, State, Range, File, \
+    Hash, SourceRpm, DebianBinary, DebianSource, CustomFields, Interner
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS generators (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    version TEXT
+);
+CREATE TABLE IF NOT EXISTS suts (
+    id INTEGER PRIMARY KEY,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    release TEXT,
+    buildarch TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    givenpath TEXT NOT NULL,
+    abspath TEXT,
+    hash_alg TEXT,
+    hexdigest TEXT
+);
+CREATE TABLE IF NOT EXISTS functions (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY,
+    generator_id INTEGER NOT NULL REFERENCES generators(id),
+    sut_id INTEGER REFERENCES suts(id),
+    file_id INTEGER REFERENCES files(id),
+    wallclocktime REAL,
+    customfields TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    analysis_id INTEGER NOT NULL REFERENCES analyses(id),
+    position INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    testid TEXT,
+    failureid TEXT,
+    infoid TEXT,
+    cwe INTEGER,
+    severity TEXT,
+    file_id INTEGER REFERENCES files(id),
+    function_id INTEGER REFERENCES functions(id),
+    line INTEGER,
+    column INTEGER,
+    end_line INTEGER,
+    end_column INTEGER,
+    message TEXT,
+    notes TEXT,
+    has_trace INTEGER NOT NULL,
+    customfields TEXT
+);
+CREATE TABLE IF NOT EXISTS states (
+    result_id INTEGER NOT NULL REFERENCES results(id),
+    position INTEGER NOT NULL,
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    function_id INTEGER REFERENCES functions(id),
+    line INTEGER,
+    column INTEGER,
+    end_line INTEGER,
+    end_column INTEGER,
+    notes TEXT,
+    PRIMARY KEY (result_id, position)
+);
+CREATE INDEX IF NOT EXISTS generators_by_name ON generators(name);
+CREATE INDEX IF NOT EXISTS suts_by_name ON suts(name);
+CREATE INDEX IF NOT EXISTS files_by_givenpath ON files(givenpath);
+CREATE INDEX IF NOT EXISTS analyses_by_sut ON analyses(sut_id);
+CREATE INDEX IF NOT EXISTS results_by_analysis ON results(analysis_id);
+CREATE INDEX IF NOT EXISTS results_by_file ON results(file_id);
+CREATE INDEX IF NOT EXISTS results_by_testid ON results(testid);
+CREATE INDEX IF NOT EXISTS results_by_cwe ON results(cwe);
+'''
+
+_SUT_TYPES = {'source-rpm': SourceRpm,
+              'debian-binary': DebianBinary,
+              'debian-source': DebianSource}
+
+_SUT_TYPE_NAMES = dict((cls, name) for name, cls in iteritems(_SUT_TYPES))
+
+# The columns of the "results" table selected to build results, in order
+_RESULT_COLUMNS = ('id', 'type', 'testid', 'failureid', 'infoid', 'cwe',
+                   'severity', 'file_id', 'function_id', 'line', 'column',
+                   'end_line', 'end_column', 'message', 'notes', 'has_trace',
+                   'customfields')
+
+# Criteria accepted by query(), and the SQL expressions they constrain
+CRITERIA = {'analysis': 'results.analysis_id',
+            'file': 'files.givenpath',
+            'function': 'functions.name',
+            'testid': 'results.testid',
+            'cwe': 'results.cwe',
+            'severity': 'results.severity',
+            'generator': 'generators.name',
+            'sut': 'suts.name'}
+
+# Queries giving the distinct values of each criterion (or a superset of
+# them: the files and functions of trace states and of the analyses
+# themselves are included)
+_VALUES = {'analysis': 'SELECT id FROM analyses',
+           'file': 'SELECT DISTINCT givenpath FROM files',
+           'function': 'SELECT name FROM functions',
+           'testid': 'SELECT DISTINCT testid FROM results',
+           'cwe': 'SELECT DISTINCT cwe FROM results',
+           'severity': 'SELECT DISTINCT severity FROM results',
+           'generator': 'SELECT DISTINCT name FROM generators',
+           'sut': 'SELECT DISTINCT name FROM suts'}
+
+# The most ids passed as parameters to a single query
+_BATCH_SIZE = 500
+
+def _location_columns(location, file_id, function_id):
+    """
+    Get the (file_id, function_id, line, column, end_line, end_column)
+    columns for a Location: the line and column of its point, or of the
+    start and end of its range
+    """
+    point = location.point
+    if point is not None:
+        return (file_id, function_id, point.line, point.column, None, None)
+    range_ = location.range_
+    if range_ is not None:
+        return (file_id, function_id, range_.start.line, range_.start.column,
+                range_.end.line, range_.end.column)
+    return (file_id, function_id, None, None, None, None)
+
+def _dump_customfields(customfields):
+    if customfields is None:
+        return None
+    return json.dumps(customfields)
+
+def _load_customfields(text):
+    if text is None:
+        return None
+    return json.loads(text, object_pairs_hook=CustomFields)
+
+class Store(object):
+    """
+    A database of analyses, stored in SQLite at the given path (created if
+    need be).  It can be used as a context manager, closing the database
+    on exit.
+    """
+    def __init__(self, path, timeout=60.0):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=timeout)
+        try:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+        except sqlite3.DatabaseError:
+            # e.g. on a network filesystem
+            pass
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        with self.conn:
+            self.conn.executescript(_SCHEMA)
+        # Caches of the ids of the rows of the lookup tables, by the values
+        # within them
+        self._ids = {'generators': {}, 'suts': {}, 'files': {},
+                     'functions': {}}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    #
+    # Ingestion
+    #
+
+    def _get_id(self, table, columns, values):
+        """
+        Get the id of the row of the given lookup table holding the given
+        values, inserting it if need be
+        """
+        cache = self._ids[table]
+        result = cache.get(values)
+        if result is None:
+            # ("IS" rather than "=", so that NULLs match)
+            row = self.conn.execute(
+                'SELECT id FROM %s WHERE %s' % (table,
+                                               ' AND '.join('%s IS ?' % column
+                                                            for column in columns)),
+                values).fetchone()
+            if row is not None:
+                result = row[0]
+            else:
+                result = self.conn.execute(
+                    'INSERT INTO %s (%s) VALUES (%s)'
+                    % (table, ', '.join(columns),
+                       ', '.join('?' for column in columns)),
+                    values).lastrowid
+            cache[values] = result
+        return result
+
+    def _file_id(self, file_):
+        if file_ is None:
+            return None
+        hash_ = file_.hash_
+        return self._get_id('files',
+                            ('givenpath', 'abspath', 'hash_alg', 'hexdigest'),
+                            (file_.givenpath, file_.abspath,
+                             hash_.alg if hash_ is not None else None,
+                             hash_.hexdigest if hash_ is not None else None))
+
+    def _function_id(self, function):
+        if function is None:
+            return None
+        return self._get_id('functions', ('name', ), (function.name, ))
+
+    def _sut_id(self, sut):
+        if sut is None:
+            return None
+        return self._get_id('suts',
+                            ('type', 'name', 'version', 'release',
+                             'buildarch'),
+                            (_SUT_TYPE_NAMES[sut.__class__], sut.name,
+                             sut.version, sut.release,
+                             getattr(sut, 'buildarch', None)))
+
+    def add_analyses(self, analyses):
+        """
+        Add the given Analysis instances to the store, within a single
+        transaction, returning the list of their ids
+        """
+        analysis_rows = []
+        result_rows = []
+        state_rows = []
+        ids = []
+        file_id = self._file_id
+        function_id = self._function_id
+        try:
+            # Take the write lock up front, so that the ids allocated below
+            # can't be taken by another process
+            self.conn.execute('BEGIN IMMEDIATE')
+            next_analysis_id = self.conn.execute(
+                'SELECT COALESCE(MAX(id), 0) + 1 FROM analyses').fetchone()[0]
+            next_result_id = self.conn.execute(
+                'SELECT COALESCE(MAX(id), 0) + 1 FROM results').fetchone()[0]
+            for analysis in analyses:
+                analysis_id = next_analysis_id
+                next_analysis_id += 1
+                ids.append(analysis_id)
+                metadata = analysis.metadata
+                generator = metadata.generator
+                analysis_rows.append(
+                    (analysis_id,
+                     self._get_id('generators', ('name', 'version'),
+                                  (generator.name, generator.version)),
+                     self._sut_id(metadata.sut),
+                     file_id(metadata.file_),
+                     (metadata.stats.wallclocktime
+                      if metadata.stats is not None else None),
+                     _dump_customfields(analysis.customfields)))
+                for position, result in enumerate(analysis.results):
+                    result_id = next_result_id
+                    next_result_id += 1
+                    location = result.location
+                    if location is not None:
+                        location_columns = _location_columns(
+                            location, file_id(location.file),
+                            function_id(location.function))
+                    else:
+                        location_columns = (None, ) * 6
+                    message = result.message
+                    message = message.text if message is not None else None
+                    if isinstance(result, Issue):
+                        trace = result.trace
+                        notes = result.notes
+                        result_rows.append(
+                            (result_id, analysis_id, position, 'issue',
+                             result.testid, None, None, result.cwe,
+                             result.severity)
+                            + location_columns
+                            + (message,
+                               notes.text if notes is not None else None,
+                               trace is not None,
+                               _dump_customfields(result.customfields)))
+                        if trace is not None:
+                            for state_position, state in \
+                                    enumerate(trace.states):
+                                state_location = state.location
+                                state_rows.append(
+                                    (result_id, state_position)
+                                    + _location_columns(
+                                        state_location,
+                                        file_id(state_location.file),
+                                        function_id(state_location.function))
+                                    + (state.notes.text
+                                       if state.notes is not None
+                                       else None, ))
+                    else:
+                        is_failure = isinstance(result, Failure)
+                        result_rows.append(
+                            (result_id, analysis_id, position,
+                             'failure' if is_failure else 'info',
+                             None,
+                             result.failureid if is_failure else None,
+                             None if is_failure else result.infoid,
+                             None, None)
+                            + location_columns
+                            + (message, None, False,
+                               _dump_customfields(result.customfields)))
+            self.conn.executemany(
+                'INSERT INTO analyses (id, generator_id, sut_id, file_id,'
+                ' wallclocktime, customfields) VALUES (?, ?, ?, ?, ?, ?)',
+                analysis_rows)
+            self.conn.executemany(
+                'INSERT INTO results (id, analysis_id, position, type,'
+                ' testid, failureid, infoid, cwe, severity, file_id,'
+                ' function_id, line, column, end_line, end_column, message,'
+                ' notes, has_trace, customfields)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,'
+                ' ?, ?)',
+                result_rows)
+            self.conn.executemany(
+                'INSERT INTO states (result_id, position, file_id,'
+                ' function_id, line, column, end_line, end_column, notes)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                state_rows)
+            self.conn.commit()
+        except:
+            self.conn.rollback()
+            # The cached ids of any rows inserted into the lookup tables
+            # were rolled back too:
+            for cache in self._ids.values():
+                cache.clear()
+            raise
+        return ids
+
+    def add_analysis(self, analysis):
+        """
+        Add the given Analysis to the store, returning its id
+        """
+        return self.add_analyses([analysis])[0]
+
+    #
+    # Queries
+    #
+
+    def analysis_ids(self, **criteria):
+        """
+        Get the ids of the stored analyses, optionally just those with the
+        given "generator" and/or "sut" names
+        """
+        unknown = set(criteria) - set(['generator', 'sut'])
+        if unknown:
+            raise ValueError('unknown criteria: %s'
+                             % ', '.join(sorted(unknown)))
+        where, params = _where(criteria)
+        return [row[0] for row in self.conn.execute(
+            'SELECT analyses.id FROM analyses'
+            ' LEFT JOIN generators ON generators.id = analyses.generator_id'
+            ' LEFT JOIN suts ON suts.id = analyses.sut_id'
+            ' %s ORDER BY analyses.id' % where, params)]
+
+    def get_analysis(self, analysis_id):
+        """
+        Get the stored Analysis with the given id, with its results
+        """
+        row = self.conn.execute(
+            'SELECT generator_id, sut_id, file_id, wallclocktime,'
+            ' customfields FROM analyses WHERE id = ?',
+            (analysis_id, )).fetchone()
+        if row is None:
+            raise KeyError(analysis_id)
+        generator_id, sut_id, file_id, wallclocktime, customfields = row
+        loader = _Loader(self.conn)
+        metadata = Metadata(loader.generator(generator_id),
+                            loader.sut(sut_id),
+                            loader.file(file_id),
+                            Stats(wallclocktime)
+                            if wallclocktime is not None else None)
+        return Analysis(metadata,
+                        self.query(analysis=analysis_id, _loader=loader),
+                        _load_customfields(customfields))
+
+    def query(self, _loader=None, **criteria):
+        """
+        Get the stored results matching all of the given criteria (each
+        being a key from CRITERIA, and a value, or a set, list or tuple of
+        acceptable values), ordered by analysis and then by position
+        within it, e.g. store.query(sut='python-ethtool', cwe=401)
+        """
+        sql, params = self._select(
+            ', '.join('results.%s' % column for column in _RESULT_COLUMNS),
+            criteria)
+        loader = _loader or _Loader(self.conn)
+        rows = self.conn.execute(
+            sql + ' ORDER BY results.analysis_id, results.position',
+            params).fetchall()
+        traces = loader.traces([row[0] for row in rows if row[15]])
+        return [loader.result(row, traces.get(row[0])) for row in rows]
+
+    def count(self, **criteria):
+        """
+        Get the number of stored results matching the given criteria (as
+        for query)
+        """
+        sql, params = self._select('COUNT(*)', criteria)
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def values(self, key):
+        """
+        Get the list of the distinct values of the given criterion within
+        the store (possibly including values that no result has)
+        """
+        if key not in _VALUES:
+            raise ValueError('unknown key: %r' % key)
+        return [row[0] for row in self.conn.execute(_VALUES[key])]
+
+    def _select(self, columns, criteria):
+        unknown = set(criteria) - set(CRITERIA)
+        if unknown:
+            raise ValueError('unknown criteria: %s'
+                             % ', '.join(sorted(unknown)))
+        # (outer joins, so that results without a location, function or
+        # sut can still be found, and matched by None)
+        joins = []
+        if 'file' in criteria:
+            joins.append('LEFT JOIN files ON files.id = results.file_id')
+        if 'function' in criteria:
+            joins.append('LEFT JOIN functions'
+                         ' ON functions.id = results.function_id')
+        if 'generator' in criteria or 'sut' in criteria:
+            joins.append('LEFT JOIN analyses'
+                         ' ON analyses.id = results.analysis_id')
+            if 'generator' in criteria:
+                joins.append('LEFT JOIN generators'
+                             ' ON generators.id = analyses.generator_id')
+            if 'sut' in criteria:
+                joins.append('LEFT JOIN suts ON suts.id = analyses.sut_id')
+        where, params = _where(criteria)
+        return ('SELECT %s FROM results %s %s'
+                % (columns, ' '.join(joins), where)), params
+
+def _where(criteria):
+    """
+    Build the WHERE clause (and its parameters) for the given criteria
+    """
+    clauses = []
+    params = []
+    for key, value in sorted(criteria.items()):
+        column = CRITERIA[key]
+        if isinstance(value, (set, frozenset, list, tuple)):
+            values = [item for item in value if item is not None]
+            alternatives = []
+            if values:
+                alternatives.append('%s IN (%s)'
+                                    % (column, ', '.join('?' for _ in values)))
+                params.extend(values)
+            if len(values) < len(value):
+                alternatives.append('%s IS NULL' % column)
+            clauses.append('(%s)' % ' OR '.join(alternatives)
+                           if alternatives else '0')
+        elif value is None:
+            clauses.append('%s IS NULL' % column)
+        else:
+            clauses.append('%s = ?' % column)
+            params.append(value)
+    if not clauses:
+        return '', params
+    return 'WHERE ' + ' AND '.join(clauses), params
+
+class _Loader(object):
+    """
+    Builds model objects from rows, sharing the objects for each distinct
+    generator, sut, file and function (and point, via an Interner)
+    """
+    def __init__(self, conn):
+        self.conn = conn
+        self.interner = Interner()
+        self.files = {}
+        self.functions = {}
+
+    def generator(self, generator_id):
+        name, version = self.conn.execute(
+            'SELECT name, version FROM generators WHERE id = ?',
+            (generator_id, )).fetchone()
+        return Generator(name, version)
+
+    def sut(self, sut_id):
+        if sut_id is None:
+            return None
+        row = self.conn.execute(
+            'SELECT type, name, version, release, buildarch FROM suts'
+            ' WHERE id = ?', (sut_id, )).fetchone()
+        cls = _SUT_TYPES[row[0]]
+        if cls is DebianSource:
+            return DebianSource(row[1], row[2], row[3])
+        return cls(*row[1:])
+
+    def file(self, file_id):
+        if file_id is None:
+            return None
+        result = self.files.get(file_id)
+        if result is None:
+            givenpath, abspath, alg, hexdigest = self.conn.execute(
+                'SELECT givenpath, abspath, hash_alg, hexdigest FROM files'
+                ' WHERE id = ?', (file_id, )).fetchone()
+            result = self.files[file_id] = File.unchecked(
+                givenpath, abspath,
+                Hash.unchecked(alg, hexdigest) if alg is not None else None)
+        return result
+
+    def function(self, function_id):
+        if function_id is None:
+            return None
+        result = self.functions.get(function_id)
+        if result is None:
+            name, = self.conn.execute(
+                'SELECT name FROM functions WHERE id = ?',
+                (function_id, )).fetchone()
+            result = self.functions[function_id] = self.interner.function(name)
+        return result
+
+    def location(self, file_id, function_id, line, column, end_line,
+                 end_column):
+        if file_id is None:
+            return None
+        point = range_ = None
+        if end_line is not None:
+            range_ = Range.unchecked(self.interner.point(line, column),
+                                     self.interner.point(end_line,
+                                                         end_column))
+        elif line is not None:
+            point = self.interner.point(line, column)
+        return Location.unchecked(self.file(file_id),
+                                  self.function(function_id), point, range_)
+
+    def result(self, row, trace):
+        (result_id, type_, testid, failureid, infoid, cwe, severity,
+         file_id, function_id, line, column, end_line, end_column, message,
+         notes, has_trace, customfields) = row
+        location = self.location(file_id, function_id, line, column,
+                                 end_line, end_column)
+        message = Message.unchecked(message) if message is not None else None
+        customfields = _load_customfields(customfields)
+        if type_ == 'issue':
+            return Issue.unchecked(
+                cwe, testid, location, message,
+                Notes.unchecked(notes) if notes is not None else None,
+                trace, severity, customfields)
+        if type_ == 'failure':
+            return Failure.unchecked(failureid, location, message,
+                                     customfields)
+        return Info.unchecked(infoid, location, message, customfields)
+
+    def traces(self, result_ids):
+        """
+        Get a dict mapping each of the given result ids to its Trace,
+        reading the states of up to _BATCH_SIZE traces per query
+        """
+        traces = {}
+        for i in range(0, len(result_ids), _BATCH_SIZE):
+            batch = result_ids[i:i + _BATCH_SIZE]
+            for result_id in batch:
+                traces[result_id] = Trace.unchecked([])
+            for row in self.conn.execute(
+                    'SELECT result_id, file_id, function_id, line, column,'
+                    ' end_line, end_column, notes FROM states'
+                    ' WHERE result_id IN (%s) ORDER BY result_id, position'
+                    % ', '.join('?' for _ in batch), batch):
+                traces[row[0]].states.append(State.unchecked(
+                    self.location(*row[1:7]),
+                    Notes.unchecked(row[7]) if row[7] is not None else None))
+        return traces
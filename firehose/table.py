@@ -0,0 +1,317 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# A columnar representation of the issues within very large analyses.
+#
+# Holding millions of Issue instances as object graphs takes a lot of
+# memory; a ResultTable instead holds one typed array per field, with every
+# string (test IDs, severities, paths, function names, messages and notes)
+# replaced by its index within a single StringPool.  Issue instances can be
+# materialized from individual rows on demand.  Each column queried by
+# select() gets an index of the rows holding each value, built on first use.
+#
+# Only the fields listed in ResultTable.COLUMNS are stored: the trace, the
+# end of any range (its start is stored as the line and column), the
+# absolute path and hash of the file, and any custom fields of
+# each issue are dropped.  Failures and Infos are skipped.
+
+from array import array
+from collections import Counter
+from itertools import chain
+
+from six.moves import range
+
+from firehose.model import Issue, Location, Message, Notes, Result, Interner
+
+# The value used in the columns to represent None
+NONE = -1
+
+class StringPool(object):
+    """
+    A table of distinct strings, each identified by its index
+    """
+    __slots__ = ('strings', 'indices')
+
+    def __init__(self):
+        self.strings = []
+        self.indices = {}
+
+    def intern(self, value):
+        """
+        Get the index of the given string (or NONE for None), adding it to
+        the pool if it isn't already present
+        """
+        if value is None:
+            return NONE
+        index = self.indices.get(value)
+        if index is None:
+            index = self.indices[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def find(self, value):
+        """
+        Get the index of the given string (or NONE for None), or None if
+        it isn't within the pool
+        """
+        if value is None:
+            return NONE
+        return self.indices.get(value)
+
+    def __getitem__(self, index):
+        if index == NONE:
+            return None
+        return self.strings[index]
+
+    def __len__(self):
+        return len(self.strings)
+
+class ResultTable(object):
+    """
+    A columnar table of issues.
+
+    Each of the COLUMNS is an array of ints: the columns in STRING_COLUMNS
+    hold indices into the "pool" StringPool; the others hold the values
+    themselves.  Missing values are represented by NONE.
+    """
+    COLUMNS = ('cwe', 'testid', 'severity', 'file', 'function', 'line',
+               'column', 'message', 'notes')
+    STRING_COLUMNS = frozenset(('testid', 'severity', 'file', 'function',
+                                'message', 'notes'))
+
+    def __init__(self):
+        self.pool = StringPool()
+        self.columns = dict((name, array('l')) for name in self.COLUMNS)
+        self.interner = Interner()
+        self._indexes = {}
+
+    @classmethod
+    def from_analysis(cls, analysis):
+        return cls.from_results(analysis.results)
+
+    @classmethod
+    def from_results(cls, results):
+        """
+        Build a table from an iterable of Result instances, such as an
+        AnalysisReader (from Analysis.iter_results) or a JsonLinesReader,
+        so that the issues never need to all be in memory at once
+        """
+        table = cls()
+        table.extend(results)
+        return table
+
+    def __len__(self):
+        return len(self.columns['message'])
+
+    def append(self, cwe, testid, severity, file, function, line, column,
+               message, notes=None):
+        """
+        Add a row from the given plain values (with None for missing
+        values), for use by parsers that don't need to build an Issue for
+        each row
+        """
+        intern = self.pool.intern
+        columns = self.columns
+        columns['cwe'].append(NONE if cwe is None else cwe)
+        columns['testid'].append(intern(testid))
+        columns['severity'].append(intern(severity))
+        columns['file'].append(intern(file))
+        columns['function'].append(intern(function))
+        columns['line'].append(NONE if line is None else line)
+        columns['column'].append(NONE if column is None else column)
+        columns['message'].append(intern(message))
+        columns['notes'].append(intern(notes))
+
+    def append_issue(self, issue):
+        assert isinstance(issue, Issue)
+        location = issue.location
+        function = location.function
+        self.append(issue.cwe,
+                    issue.testid,
+                    issue.severity,
+                    location.file.givenpath,
+                    function.name if function is not None else None,
+                    location.line,
+                    location.column,
+                    issue.message.text,
+                    issue.notes.text if issue.notes is not None else None)
+
+    def extend(self, results):
+        for result in results:
+            assert isinstance(result, Result)
+            if isinstance(result, Issue):
+                self.append_issue(result)
+
+    def values(self, name):
+        """
+        Get the values of the named column, as a list of ints or strings
+        (with None for missing values)
+        """
+        column = self.columns[name]
+        if name in self.STRING_COLUMNS:
+            strings = self.pool.strings
+            return [strings[index] if index != NONE else None
+                    for index in column]
+        return [value if value != NONE else None for value in column]
+
+    def get(self, row, name):
+        """
+        Get the value of the named column for the given row
+        """
+        value = self.columns[name][row]
+        if name in self.STRING_COLUMNS:
+            return self.pool[value]
+        return value if value != NONE else None
+
+    def select(self, **criteria):
+        """
+        Get the indices of the rows whose values match all of the given
+        criteria, each being a column name and a value (or a set/list/tuple
+        of acceptable values), e.g.:
+
+          table.select(testid='null-deref', file=('foo.c', 'bar.c'))
+        """
+        # Resolve each criterion to the lists of matching rows (from the
+        # column's index), then start from the most selective criterion
+        # and check the rows that it matched against the others, so that
+        # as few rows as possible are examined
+        selections = []
+        for name, wanted in criteria.items():
+            if not isinstance(wanted, (set, frozenset, list, tuple)):
+                wanted = (wanted, )
+            if name in self.STRING_COLUMNS:
+                wanted = set(self.pool.find(value) for value in wanted)
+                wanted.discard(None)
+            else:
+                wanted = set(NONE if value is None else value
+                             for value in wanted)
+            index = self._index(name)
+            matches = [index[value] for value in wanted if value in index]
+            count = sum(len(rows) for rows in matches)
+            if not count:
+                return []
+            selections.append((count, name, wanted, matches))
+        if not selections:
+            return list(range(len(self)))
+        selections.sort(key=lambda selection: selection[:2])
+        _, _, _, matches = selections[0]
+        if len(matches) == 1:
+            rows = matches[0].tolist()
+        else:
+            rows = sorted(chain.from_iterable(matches))
+        for _, name, wanted, _ in selections[1:]:
+            column = self.columns[name]
+            rows = [row for row in rows if column[row] in wanted]
+            if not rows:
+                break
+        return rows
+
+    def _index(self, name):
+        """
+        Get a dict mapping each value of the named column to an array of
+        the rows holding it, building it on first use and bringing it up
+        to date with any rows appended since
+        """
+        column = self.columns[name]
+        size, index = self._indexes.get(name, (0, None))
+        if index is None:
+            index = {}
+        for row in range(size, len(column)):
+            value = column[row]
+            rows = index.get(value)
+            if rows is None:
+                rows = index[value] = array('l')
+            rows.append(row)
+        self._indexes[name] = (len(column), index)
+        return index
+
+    def take(self, rows):
+        """
+        Get a new table holding just the given rows (sharing this table's
+        StringPool)
+        """
+        table = self.__class__.__new__(self.__class__)
+        table.pool = self.pool
+        table.interner = self.interner
+        table._indexes = {}
+        table.columns = {}
+        for name, column in self.columns.items():
+            table.columns[name] = array('l', [column[row] for row in rows])
+        return table
+
+    def count_by(self, *names):
+        """
+        Count the rows by the values of the named columns, returning a
+        Counter whose keys are the values (or tuples of values, if more
+        than one column is named)
+        """
+        if len(names) == 1:
+            counts = Counter(self.columns[names[0]])
+            decode = lambda key: self._decode(names[0], key)
+        else:
+            counts = Counter(zip(*[self.columns[name] for name in names]))
+            decode = lambda key: tuple(self._decode(name, value)
+                                       for name, value in zip(names, key))
+        return Counter(dict((decode(key), count)
+                            for key, count in counts.items()))
+
+    def _decode(self, name, value):
+        if name in self.STRING_COLUMNS:
+            return self.pool[value]
+        return value if value != NONE else None
+
+    def issue(self, row):
+        """
+        Materialize the given row as an Issue
+        """
+        columns = self.columns
+        pool = self.pool
+        interner = self.interner
+        function = pool[columns['function'][row]]
+        line = columns['line'][row]
+        column = columns['column'][row]
+        notes = pool[columns['notes'][row]]
+        cwe = columns['cwe'][row]
+        location = Location(
+            interner.file(pool[columns['file'][row]], None),
+            interner.function(function) if function is not None else None,
+            interner.point(line, column) if line != NONE else None)
+        return Issue(cwe if cwe != NONE else None,
+                     pool[columns['testid'][row]],
+                     location,
+                     Message(pool[columns['message'][row]]),
+                     Notes(notes) if notes is not None else None,
+                     None,
+                     pool[columns['severity'][row]])
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return self.issue(row)
+
+    def issues(self, rows=None):
+        """
+        Generate Issue instances for the given rows (or for all rows)
+        """
+        if rows is None:
+            rows = range(len(self))
+        for row in rows:
+            yield self.issue(row)
+
+    __iter__ = issues
@@ -0,0 +1,166 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+
+# In-process validation of Firehose XML documents, for checking many
+# reports without spawning "xmllint --relaxng firehose.rng" for each.
+#
+# With lxml, documents are validated against the Relax NG schema
+# (firehose.rng), which is compiled once per process.  Without lxml, or
+# without the schema (which is shipped alongside the sources, rather than
+# installed with the package), a fallback checker is used instead: each
+# document is read with Analysis.from_xml, and the resulting objects are
+# checked against the types in the model's attrs metadata (see
+# JsonMixin.validate).  The fallback is less strict than the schema: e.g.
+# it ignores unrecognized elements, as the reader does.
+#
+# Batches of documents are validated in a pool of worker processes.
+#
+# Usage:
+#   python -m firehose.validate [-j JOBS] [--schema SCHEMA] FILE...
+
+import argparse
+from multiprocessing import Pool
+import os
+import sys
+
+from six.moves import map
+
+from firehose.model import Analysis
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+# The schema, within the source tree
+DEFAULT_SCHEMA = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'firehose.rng')
+
+class RelaxNGValidator(object):
+    """
+    Validates documents against a Relax NG schema, using lxml
+    """
+    def __init__(self, schema_path=DEFAULT_SCHEMA):
+        self.schema_path = schema_path
+        self.relaxng = lxml_etree.RelaxNG(lxml_etree.parse(schema_path))
+        self.parser = lxml_etree.XMLParser(huge_tree=True)
+
+    def validate_file(self, path):
+        """
+        Validate the document at the given path, returning a list of
+        descriptions of the problems found (empty if it is valid)
+        """
+        try:
+            doc = lxml_etree.parse(path, self.parser)
+        except lxml_etree.XMLSyntaxError as exc:
+            return ['%s: %s' % (path, exc)]
+        if self.relaxng.validate(doc):
+            return []
+        return ['%s:%i: %s' % (path, entry.line, entry.message)
+                for entry in self.relaxng.error_log]
+
+class AttrsValidator(object):
+    """
+    Validates documents by reading them as an Analysis, and checking the
+    types of the attributes of the resulting objects against the model's
+    attrs metadata
+    """
+    def validate_file(self, path):
+        try:
+            with open(path, 'rb') as f:
+                analysis = Analysis.from_xml(f)
+        except (SyntaxError, ValueError, TypeError, AttributeError,
+                AssertionError, KeyError) as exc:
+            # (SyntaxError covers the parse errors of both XML backends)
+            return ['%s: %s' % (path, str(exc) or exc.__class__.__name__)]
+        return ['%s: %s' % (path, error) for error in analysis.iter_errors()]
+
+def get_validator(schema_path=None):
+    """
+    Get a validator for the given schema (by default, firehose.rng): a
+    RelaxNGValidator if lxml is available, or otherwise an AttrsValidator
+    (as is also used if no schema path was given and the default schema
+    can't be found)
+    """
+    if lxml_etree is not None:
+        if schema_path is not None:
+            return RelaxNGValidator(schema_path)
+        if os.path.exists(DEFAULT_SCHEMA):
+            return RelaxNGValidator(DEFAULT_SCHEMA)
+    return AttrsValidator()
+
+# The validator of each worker process
+_validator = None
+
+def _init_worker(schema_path):
+    global _validator
+    _validator = get_validator(schema_path)
+
+def _validate_file(path):
+    return _validator.validate_file(path)
+
+def validate_files(paths, schema_path=None, processes=None):
+    """
+    Validate the documents at the given paths, generating a (path, list
+    of problems) pair for each, in order.
+
+    The documents are validated in a pool of the given number of worker
+    processes (by default, one per CPU), each compiling the schema once;
+    with processes=1 they are validated within this process.
+    """
+    paths = list(paths)
+    if processes == 1:
+        validator = get_validator(schema_path)
+        for path, errors in zip(paths, map(validator.validate_file, paths)):
+            yield path, errors
+        return
+    pool = Pool(processes, _init_worker, (schema_path, ))
+    try:
+        # (small chunks: thousands of small documents are typical)
+        for path, errors in zip(paths, pool.imap(_validate_file, paths,
+                                                 chunksize=16)):
+            yield path, errors
+    finally:
+        pool.close()
+        pool.join()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Validate Firehose XML documents')
+    parser.add_argument('files', metavar='FILE', nargs='+',
+                        help='Firehose XML document to validate')
+    parser.add_argument('--schema', metavar='SCHEMA', default=None,
+                        help='the Relax NG schema to validate against'
+                             ' (default: firehose.rng)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='number of worker processes'
+                        ' (default: one per CPU)')
+    args = parser.parse_args(argv)
+    num_invalid = 0
+    for path, errors in validate_files(args.files, args.schema, args.jobs):
+        if errors:
+            num_invalid += 1
+            for error in errors:
+                sys.stderr.write('%s\n' % error)
+            sys.stderr.write('%s fails to validate\n' % path)
+    sys.stderr.write('%i of %i documents valid\n'
+                     % (len(args.files) - num_invalid, len(args.files)))
+    return 1 if num_invalid else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
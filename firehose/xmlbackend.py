@@ -0,0 +1,105 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Pluggable backend for parsing XML.
+#
+# Parsing can be done either with the standard library's
+# xml.etree.ElementTree ("etree"), or with lxml ("lxml") when it is
+# installed.  The backend can be chosen via set_backend(), or via the
+# FIREHOSE_XML_BACKEND environment variable.
+#
+# The default is "etree": although lxml parses the raw XML about twice as
+# fast, every access to an lxml element from Python creates a proxy
+# object, so that building the model from the tree is slower, and uses
+# more memory; overall (see benchmarks/xml_backends.py) Analysis.from_xml
+# takes about as long with either backend, and Analysis.iter_results is
+# faster with "etree".  lxml remains useful where the raw parse dominates,
+# e.g. for large cppcheck/findbugs reports.
+#
+# Both backends produce elements supporting the same subset of the
+# ElementTree API (find, findall, get, iteration, tag and text) that the
+# firehose code relies on.  Comments and processing instructions are
+# dropped by both, so that iterating over an element only yields elements.
+#
+# Serialization always uses xml.etree.ElementTree, so that the bytes
+# written for a given report don't depend on which backend is in use.
+
+import os
+import xml.etree.ElementTree as ElementTree
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+class EtreeBackend(object):
+    name = 'etree'
+
+    def parse(self, source):
+        """
+        Parse the given filename or file-like object, returning the root
+        element
+        """
+        return ElementTree.parse(source).getroot()
+
+    def iterparse(self, source, events):
+        return ElementTree.iterparse(source, events=events)
+
+class LxmlBackend(object):
+    name = 'lxml'
+
+    def __init__(self):
+        # huge_tree: lift libxml2's limits on the depth of the tree and
+        # the size of text nodes, which large reports can exceed
+        self.parser = lxml_etree.XMLParser(remove_comments=True,
+                                           remove_pis=True,
+                                           huge_tree=True)
+
+    def parse(self, source):
+        return lxml_etree.parse(source, self.parser).getroot()
+
+    def iterparse(self, source, events):
+        return lxml_etree.iterparse(source, events=events,
+                                    remove_comments=True,
+                                    remove_pis=True,
+                                    huge_tree=True)
+
+BACKENDS = {'etree': EtreeBackend}
+if lxml_etree is not None:
+    BACKENDS['lxml'] = LxmlBackend
+
+_backend = None
+
+def set_backend(name):
+    """
+    Select the named backend ("lxml" or "etree") for subsequent parsing
+    """
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError('unavailable XML backend: %r' % name)
+    _backend = BACKENDS[name]()
+
+def get_backend():
+    return _backend
+
+def parse(source):
+    return _backend.parse(source)
+
+def iterparse(source, events=('end', )):
+    return _backend.iterparse(source, events)
+
+set_backend(os.environ.get('FIREHOSE_XML_BACKEND', 'etree'))
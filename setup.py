@@ -24,6 +24,10 @@ setup(name='firehose',
     description='Library for working with output from static code analyzers',
     packages=['firehose',
               'firehose.parsers'],
+    extras_require={
+        # faster XML parsing (see firehose/xmlbackend.py)
+        'lxml': ['lxml'],
+    },
     license='LGPL2.1 or later',
     author='David Malcolm <dmalcolm@redhat.com>',
     url='https://github.com/fedora-static-analysis/firehose',
@@ -0,0 +1,137 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+# Factories for the small hand-built reports used by the tests
+
+from firehose.model import Analysis, Issue, Metadata, Generator, SourceRpm, \
+    Location, File, Function, Point, Range, Message, Notes, Trace, State, \
+    Stats, Failure, Info, CustomFields
+
+def make_issue(path='foo.c', testid='test', cwe=None, severity=None,
+               function='f', line=10, column=1, end_line=None,
+               message='message', notes=None):
+    """
+    Make an Issue at the given line (or, with end_line, over the given
+    range of lines)
+    """
+    if end_line is None:
+        point, range_ = Point(line, column), None
+    else:
+        point, range_ = None, Range(Point(line, column),
+                                    Point(end_line, column))
+    return Issue(cwe, testid,
+                 Location(File(path, None),
+                          Function(function) if function is not None else None,
+                          point, range_),
+                 Message(message),
+                 Notes(notes) if notes is not None else None,
+                 None, severity)
+
+def make_analysis(results, generator='checker', sut=None):
+    return Analysis(Metadata(Generator(generator), sut, None, None),
+                    results)
+
+def make_simple_analysis():
+    """
+    Construct a minimal Analysis instance
+    """
+    a = Analysis(metadata=Metadata(generator=Generator(name='cpychecker'),
+                                   sut=None,
+                                   file_=None,
+                                   stats=None),
+                 results=[Issue(cwe=None,
+                                testid=None,
+                                location=Location(file=File('foo.c', None),
+                                                  function=None,
+                                                  point=Point(10, 15)),
+                                message=Message(text='something bad involving pointers'),
+                                notes=None,
+                                trace=None)])
+    return a, a.results[0]
+
+def make_complex_analysis():
+    """
+    Construct a Analysis instance that uses all features
+    """
+    a = Analysis(metadata=Metadata(generator=Generator(name='cpychecker',
+                                                       version='0.11'),
+                                   sut=SourceRpm(name='python-ethtool',
+                                                 version='0.7',
+                                                 release='4.fc19',
+                                                 buildarch='x86_64'),
+                                   file_=File(givenpath='foo.c',
+                                              abspath='/home/david/coding/foo.c'),
+                                   stats=Stats(wallclocktime=0.4)),
+                 results=[Issue(cwe=681,
+                                testid='refcount-too-high',
+                                location=Location(file=File(givenpath='foo.c',
+                                                            abspath='/home/david/coding/foo.c'),
+                                                  function=Function('bar'),
+                                                  point=Point(10, 15)),
+                                message=Message(text='something bad involving pointers'),
+                                notes=Notes('here is some explanatory text'),
+                                trace=Trace([State(location=Location(file=File('foo.c', None),
+                                                                     function=Function('bar'),
+                                                                     point=Point(7, 12)),
+                                                   notes=Notes('first we do this')),
+                                             State(location=Location(file=File('foo.c', None),
+                                                                     function=Function('bar'),
+                                                                     point=Point(8, 10)),
+                                                   notes=Notes('then we do that')),
+                                             State(location=Location(file=File('foo.c', None),
+                                                                     function=Function('bar'),
+                                                                     range_=Range(Point(10, 15),
+                                                                                  Point(10, 25))),
+                                                   notes=Notes('then it crashes here'))
+                                             ]),
+                                severity='really bad',
+                                customfields=CustomFields(foo='bar')),
+                          ],
+                 customfields=CustomFields(gccinvocation='gcc -I/usr/include/python2.7 -c foo.c'),
+                 )
+    return a, a.results[0]
+
+def make_failed_analysis():
+    a = Analysis(metadata=Metadata(generator=Generator(name='yet-another-checker'),
+                                   sut=None,
+                                   file_=None,
+                                   stats=None),
+                 results=[Failure(failureid='out-of-memory',
+                                  location=Location(file=File('foo.c', None),
+                                                    function=Function('something_complicated'),
+                                                    point=Point(10, 15)),
+                                  message=Message('out of memory'),
+                                  customfields=CustomFields(stdout='sample stdout',
+                                                            stderr='sample stderr',
+                                                            returncode=-9)) # (killed)
+                          ])
+    return a, a.results[0]
+
+def make_info():
+    a = Analysis(metadata=Metadata(generator=Generator(name='an-invented-checker'),
+                                   sut=None,
+                                   file_=None,
+                                   stats=None),
+                 results=[Info(infoid='gimple-stats',
+                               location=Location(file=File('bar.c', None),
+                                                 function=Function('sample_function'),
+                                                 point=Point(10, 15)),
+                               message=Message('sample message'),
+                               customfields=CustomFields(num_stmts=57,
+                                                         num_basic_blocks=10))
+                          ])
+    return a, a.results[0]
@@ -18,7 +18,7 @@
 import os
 import unittest
 
-from firehose.parsers.clanganalyzer import parse_plist
+from firehose.parsers.clanganalyzer import parse_plist, make_compact_trace
 from firehose.model import Analysis, Issue, Sut, Trace
 
 class TestParsePlist(unittest.TestCase):
@@ -49,7 +49,12 @@ class TestParsePlist(unittest.TestCase):
         self.assertEqual(w0.location.function, None)
         self.assertEqual(w0.location.line, 130)
         self.assertEqual(w0.location.column, 2)
+        # The trace is decoded on first access (until then, only its
+        # compact form is held, rather than the plist's 'path'):
+        self.assertTrue(w0.has_lazy_trace)
+        self.assertIsInstance(w0._trace.args[0], tuple)
         self.assertNotEqual(w0.trace, None)
+        self.assertFalse(w0.has_lazy_trace)
         self.assertEqual(len(w0.trace.states), 1)
         s0 = w0.trace.states[0]
         self.assertEqual(s0.location.file.givenpath,
@@ -225,5 +230,28 @@ class TestParsePlist(unittest.TestCase):
         self.assertEqual(w0.customfields['issue_context'], 'out_of_bounds')
         self.assertEqual(w0.customfields['issue_context_kind'], 'function')
 
+    def test_bad_path(self):
+        # Problems with the 'path' are reported when parsing it, rather
+        # than when the trace is first used:
+        with self.assertRaises(ValueError):
+            make_compact_trace(['foo.c'], [{'kind': 'bogus'}])
+        with self.assertRaises(ValueError):
+            make_compact_trace(['foo.c'],
+                               [{'kind': 'event', 'message': 'message',
+                                 'location': {'file': 0, 'line': 'x',
+                                              'col': 1}}])
+
+    def test_interning(self):
+        # Identical File, Function and Point values within a report
+        # should share a single instance:
+        a = self.parse_example('report-002.plist')
+        w0 = a.results[0]
+        states = w0.trace.states
+        self.assertIs(w0.location.file, states[0].location.file)
+        for state in states[1:]:
+            self.assertIs(state.location.file, states[0].location.file)
+            self.assertIs(state.location.function,
+                          states[0].location.function)
+
 if __name__ == '__main__':
     unittest.main()
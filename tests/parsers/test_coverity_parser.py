@@ -22,7 +22,7 @@
 import os
 import unittest
 
-from firehose.parsers.coverity import parse_json_v2
+from firehose.parsers.coverity import parse_json_v2, make_compact_trace
 from firehose.model import Analysis, Issue, Sut, Trace
 
 class TestParseJsonV2(unittest.TestCase):
@@ -54,7 +54,12 @@ class TestParseJsonV2(unittest.TestCase):
         self.assertEqual(w0.location.function.name, 'test')
         self.assertEqual(w0.location.line, 13)
         self.assertEqual(w0.location.column, 0)
+        # The trace is decoded on first access (until then, only its
+        # compact form is held, rather than the events):
+        self.assertTrue(w0.has_lazy_trace)
+        self.assertIsInstance(w0._trace.args[0], tuple)
         self.assertNotEqual(w0.trace, None)
+        self.assertFalse(w0.has_lazy_trace)
         self.assertEqual(len(w0.trace.states), 5)
         s0 = w0.trace.states[0]
         self.assertEqual(s0.location.file.givenpath, exp_path)
@@ -71,5 +76,15 @@ class TestParseJsonV2(unittest.TestCase):
         self.assertEqual(w0.customfields['subcategory'], 'none')
         self.assertEqual(w0.customfields['domain'], 'STATIC_C')
 
+    def test_bad_events(self):
+        # Problems with the events are reported when parsing them, rather
+        # than when the trace is first used:
+        with self.assertRaises(ValueError):
+            make_compact_trace({'events': [{'filePathname': 'foo.c',
+                                            'lineNumber': 'x',
+                                            'eventDescription': 'leak'}]})
+        with self.assertRaises(KeyError):
+            make_compact_trace({'events': [{'filePathname': 'foo.c'}]})
+
 if __name__ == '__main__':
     unittest.main()
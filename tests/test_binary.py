@@ -0,0 +1,120 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+import glob
+import unittest
+
+from six import BytesIO
+
+from firehose import binary
+from firehose.model import Analysis, Metadata, Generator, Stats, \
+    CustomFields
+
+from tests.helpers import make_simple_analysis, make_complex_analysis, \
+    make_failed_analysis, make_info
+
+class BinaryTests(unittest.TestCase):
+    def assertRoundTrips(self, a):
+        data = binary.dumps(a)
+        self.assertTrue(data.startswith(binary.MAGIC))
+        self.assertEqual(binary.loads(data), a)
+        output = BytesIO()
+        binary.dump(a, output)
+        self.assertEqual(output.getvalue(), data)
+        self.assertEqual(binary.load(BytesIO(data)), a)
+
+    def test_roundtrip(self):
+        for a, _ in [make_simple_analysis(),
+                     make_complex_analysis(),
+                     make_failed_analysis(),
+                     make_info()]:
+            self.assertRoundTrips(a)
+
+    def test_examples(self):
+        for filename in sorted(glob.glob('examples/example-*.xml')):
+            self.assertRoundTrips(Analysis.from_xml(filename))
+
+    def test_values(self):
+        # Negative and large ints, floats, non-ASCII strings, and empty
+        # strings and custom fields:
+        a = Analysis(Metadata(Generator(u'\u2603', ''), None, None,
+                              Stats(0.1)),
+                     [],
+                     CustomFields([('negative', -12345678901234567890),
+                                   ('zero', 0),
+                                   ('text', u'caf\xe9'),
+                                   ('empty', '')]))
+        self.assertRoundTrips(a)
+        a.metadata.stats = Stats(-1e300)
+        a.customfields = CustomFields()
+        self.assertRoundTrips(a)
+
+    def test_strings_shared(self):
+        # Each distinct string is only stored once:
+        a = Analysis.from_xml('examples/example-1.xml')
+        data = binary.dumps(a)
+        a.results *= 100
+        self.assertLess(len(binary.dumps(a)), len(data) + 100 * 200)
+
+    def test_bad_data(self):
+        with self.assertRaises(ValueError):
+            binary.loads(b'<analysis/>')
+
+        # Truncated data is rejected wherever it ends, rather than escaping
+        # as StopIteration:
+        a, _ = make_complex_analysis()
+        data = binary.dumps(a)
+        for length in range(len(binary.MAGIC), len(data)):
+            with self.assertRaises(ValueError):
+                binary.loads(data[:length])
+        with self.assertRaises(ValueError):
+            binary.loads(data + b'\x01')
+
+        # ...as is a final varint with its continuation bit set:
+        data = bytearray(data)
+        data[-1] |= 0x80
+        with self.assertRaises(ValueError):
+            binary.loads(bytes(data))
+
+        # ...and a list item tagged 0, which would otherwise pick the last
+        # decoder (Info's, for a result):
+        a, _ = make_info()
+        data = bytearray(binary.dumps(a))
+        pos = len(binary.MAGIC)
+        (numstrings, ), pos = binary.decode_varints(data, pos, 1)
+        _, pos = binary.decode_varints(data, pos, numstrings)
+        (stringdatalen, ), pos = binary.decode_varints(data, pos, 1)
+        pos += stringdatalen
+        ints, _ = binary.decode_varints(data, pos)
+        # (the Analysis, its Metadata, a Generator with no version, no sut,
+        # file or stats, and then one result, an Info)
+        self.assertEqual(ints[:10], [1, 1, 1, 1, 0, 0, 0, 0, 2, 3])
+        ints[9] = 0
+        corrupt = data[:pos]
+        binary.encode_varints(ints, corrupt)
+        with self.assertRaises(ValueError):
+            binary.loads(bytes(corrupt))
+
+    def test_varints(self):
+        values = [0, 1, 127, 128, 300, 2 ** 64 + 1]
+        out = bytearray()
+        binary.encode_varints(values, out)
+        self.assertEqual(binary.decode_varints(out, 0), (values, len(out)))
+        self.assertEqual(binary.decode_varints(out, 0, 3), ([0, 1, 127], 3))
+        with self.assertRaises(ValueError):
+            binary.decode_varints(out[:-1], 0, len(values))
+        with self.assertRaises(ValueError):
+            binary.decode_varints(out[:-1], 0)
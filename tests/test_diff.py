@@ -0,0 +1,101 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+import unittest
+
+from firehose.diff import diff
+from firehose.model import Failure, Message
+
+from tests.helpers import make_issue, make_analysis
+
+class DiffTests(unittest.TestCase):
+    def test_identical(self):
+        results = [make_issue(line=10), make_issue(testid='other', line=20)]
+        d = diff(make_analysis(results),
+                 make_analysis([make_issue(line=10),
+                                make_issue(testid='other', line=20)]))
+        self.assertEqual(d.new, [])
+        self.assertEqual(d.fixed, [])
+        self.assertEqual([old for old, new in d.unchanged], results)
+        for old, new in d.unchanged:
+            self.assertEqual(old, new)
+
+    def test_new_and_fixed(self):
+        old = make_analysis([make_issue(line=10),
+                             make_issue(testid='gone', line=20)])
+        new = make_analysis([make_issue(line=10),
+                             make_issue(testid='added', line=30)])
+        d = diff(old, new)
+        self.assertEqual(d.new, [new.results[1]])
+        self.assertEqual(d.fixed, [old.results[1]])
+        self.assertEqual(d.unchanged, [(old.results[0], new.results[0])])
+        self.assertIn('new=1 results', repr(d))
+
+    def test_line_shifts(self):
+        # Results are still matched when lines have moved, by the closest
+        # line within each (file, function, id, message) bucket:
+        old = make_analysis([make_issue(line=10), make_issue(line=50),
+                             make_issue(line=30, message='other')])
+        new = make_analysis([make_issue(line=15), make_issue(line=56),
+                             make_issue(line=35, message='other'),
+                             make_issue(line=100)])
+        d = diff(old, new)
+        self.assertEqual(sorted((o.location.line, n.location.line)
+                                for o, n in d.unchanged),
+                         [(10, 15), (30, 35), (50, 56)])
+        self.assertEqual(d.new, [new.results[3]])
+        self.assertEqual(d.fixed, [])
+
+        # ...but not when anything else differs:
+        d = diff(make_analysis([make_issue('foo.c', line=10)]),
+                 make_analysis([make_issue('bar.c', line=12)]))
+        self.assertEqual(len(d.new), 1)
+        self.assertEqual(len(d.fixed), 1)
+
+    def test_duplicates(self):
+        # Identical results are matched one-for-one:
+        old = make_analysis([make_issue(line=10), make_issue(line=10)])
+        new = make_analysis([make_issue(line=10), make_issue(line=10),
+                             make_issue(line=10)])
+        d = diff(old, new)
+        self.assertEqual(d.unchanged, [(old.results[0], new.results[0]),
+                                       (old.results[1], new.results[1])])
+        self.assertEqual(d.new, [new.results[2]])
+
+    def test_many_line_shifts(self):
+        # A large bucket of results that have all moved by a line is paired
+        # up in order, each with its nearest neighbour (benchmarks/diff.py
+        # times diffs in which many results have moved)
+        count = 8000
+        # (spaced out so that none of them match exactly by fingerprint)
+        old = make_analysis([make_issue(line=line)
+                             for line in range(10, 10 + 2 * count, 2)])
+        new = make_analysis([make_issue(line=line + 1)
+                             for line in range(10, 10 + 2 * count, 2)])
+        d = diff(old, new)
+        self.assertEqual(d.unchanged, list(zip(old.results, new.results)))
+        self.assertEqual(d.new, [])
+        self.assertEqual(d.fixed, [])
+
+    def test_failures(self):
+        # Failures without a location can be matched:
+        def make_failure():
+            return Failure('crash', None, Message('segfault'), None)
+        d = diff(make_analysis([make_failure()]),
+                 make_analysis([make_failure()], generator='renamed'))
+        self.assertEqual(len(d.unchanged), 1)
+        self.assertEqual(d.new, [])
+        self.assertEqual(d.fixed, [])
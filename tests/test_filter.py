@@ -0,0 +1,179 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from six import StringIO
+
+from firehose.filter import Filter, FilterError, glob_to_regex, main
+from firehose.index import AnalysisIndex
+from firehose.model import Analysis, Failure, Info, Location, File, Point, \
+    Message
+from firehose.store import Store
+
+from tests.helpers import make_issue, make_analysis
+
+def make_example():
+    def issue(path, testid, cwe, severity, line=10):
+        return make_issue(path, testid, cwe, severity, line=line,
+                          message='message about %s' % testid)
+    return make_analysis([issue('src/foo.c', 'leak', 401, '4'),
+                          issue('src/lib/bar.c', 'null', 476, '2'),
+                          issue('src/foo.c', 'unusedVariable', None,
+                                'style', line=20),
+                          issue('tests/test.c', 'leak', 401, '5'),
+                          Failure('crash',
+                                  Location(File('src/foo.c', None),
+                                           None, Point(1, 1)),
+                                  Message('crashed'), None),
+                          Info('stats', None, None, None)],
+                         generator='test')
+
+class FilterTests(unittest.TestCase):
+    def assert_selects(self, text, expected):
+        a = make_example()
+        filter_ = Filter(text)
+        self.assertEqual([a.results.index(r) for r in filter_.select(a)],
+                         expected)
+        # Pushing the expression down into an index gives the same results:
+        self.assertEqual(filter_.select(AnalysisIndex(a)),
+                         filter_.select(a))
+
+    def test_select(self):
+        self.assert_selects('cwe == 401', [0, 3])
+        self.assert_selects('cwe in (401, 476) and file ~ "src/**"', [0, 1])
+        self.assert_selects('file ~ "src/*"', [0, 2, 4])
+        self.assert_selects('file ~ "**/bar.c" or kind == "info"', [1, 5])
+        self.assert_selects('testid != "unusedVariable"', [0, 1, 3, 4, 5])
+        self.assert_selects('testid == null and not kind == "info"', [4])
+        self.assert_selects('cwe not in (401, null)', [1])
+        self.assert_selects('severity >= 3', [0, 3])
+        self.assert_selects('severity in (2, 4)', [0, 1])
+        self.assert_selects('line > 10 or failureid == "crash"', [2, 4])
+        self.assert_selects('message !~ "message about *"', [4, 5])
+        self.assert_selects('(testid == "leak" or testid == "null")'
+                            ' and not (file ~ "tests/**")', [0, 1])
+
+    def test_criteria(self):
+        a = make_example()
+        index = AnalysisIndex(a)
+        filter_ = Filter('cwe in (401, 476) and file ~ "src/**"'
+                         ' and (line > 1 or testid == "leak")')
+        self.assertEqual(filter_.criteria(index.get_index),
+                         {'cwe': set([401, 476]),
+                          'file': set(['src/foo.c', 'src/lib/bar.c'])})
+        self.assertEqual(Filter('cwe == 1 or file == "foo.c"')
+                         .criteria(index.get_index), {})
+
+    def test_errors(self):
+        for text in ['', 'cwe ==', 'colour == "red"', 'cwe == "401"',
+                     'cwe ~ "4*"', 'file ~ 1', 'line < null',
+                     'testid in ("a", 1)', 'cwe == 401 401', '(cwe == 1',
+                     'file == "foo.c', 'cwe $ 1']:
+            with self.assertRaises(FilterError):
+                Filter(text)
+        try:
+            Filter('cwe == 401 and colour == "red"')
+        except FilterError as exc:
+            self.assertEqual(exc.offset, 15)
+
+    def test_glob_to_regex(self):
+        import re
+        for pattern, path, expected in [('src/**', 'src/a/b.c', True),
+                                        ('src/*', 'src/a/b.c', False),
+                                        ('src/*.c', 'src/b.c', True),
+                                        ('**/b.c', 'b.c', True),
+                                        ('**/b.c', 'src/a/b.c', True),
+                                        ('src/?.[ch]', 'src/b.h', True),
+                                        ('src/?.[!ch]', 'src/b.h', False),
+                                        ('a.c', 'a_c', False)]:
+            self.assertEqual(bool(re.match(glob_to_regex(pattern), path)),
+                             expected, (pattern, path))
+
+class FilterStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.dbpath = os.path.join(self.tmpdir, 'reports.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_store(self):
+        a = make_example()
+        with Store(self.dbpath) as store:
+            store.add_analysis(a)
+            for text in ['cwe in (401, 476) and file ~ "src/**"',
+                         'severity >= 3', 'testid != "leak"',
+                         'kind == "failure" or line == 20']:
+                filter_ = Filter(text)
+                self.assertEqual(filter_.select(store), filter_.select(a))
+
+    def test_backends_agree(self):
+        # The same expression selects the same results whichever source it
+        # is given, including comparisons with null (matching results
+        # without a location or function):
+        a = make_example()
+        a.results.append(make_issue('src/main.c', 'leak', 401, '1',
+                                    function='main'))
+        index = AnalysisIndex(a)
+        with Store(self.dbpath) as store:
+            store.add_analysis(a)
+            for text in ['function != "main"', 'function == null',
+                         'function == "main"', 'function !~ "ma*"',
+                         'function in ("main", null)',
+                         'file != "src/foo.c"', 'file == null',
+                         'file in ("src/foo.c", null)',
+                         'kind == "failure" and file == null',
+                         'kind == "failure" and function == null',
+                         'not file ~ "src/**"', 'testid != "leak"',
+                         'cwe == null and file != null']:
+                filter_ = Filter(text)
+                expected = filter_.select(a)
+                self.assertEqual(filter_.select(index), expected, text)
+                self.assertEqual(filter_.select(store), expected, text)
+
+    def run_main(self, argv):
+        stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            main(argv)
+            return sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+
+    def test_main(self):
+        a = make_example()
+        inpath = os.path.join(self.tmpdir, 'in.xml')
+        outpath = os.path.join(self.tmpdir, 'out.xml')
+        with open(inpath, 'wb') as f:
+            a.to_xml().write(f)
+        self.assertEqual(self.run_main(['--count', 'cwe == 401', inpath]),
+                         '2\n')
+        self.run_main(['-o', outpath, 'testid == "leak"', inpath])
+        with open(outpath) as f:
+            self.assertEqual(Analysis.from_xml(f).results,
+                             [a.results[0], a.results[3]])
+
+        with Store(self.dbpath) as store:
+            store.add_analysis(a)
+        self.assertEqual(self.run_main(['--store', self.dbpath,
+                                        'file ~ "tests/*"']),
+                         'tests/test.c:10:1: issue[leak]:'
+                         ' message about leak\n')
@@ -0,0 +1,91 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from firehose.hashcache import HashCache
+from firehose.model import Analysis, Issue, Metadata, Generator, Location, \
+    File, Point, Message
+
+class HashCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.cachepath = os.path.join(self.tmpdir, 'hashes.sqlite')
+        self.srcpath = os.path.join(self.tmpdir, 'foo.c')
+        self.write_source(b'int main(void) { return 0; }\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write_source(self, data):
+        with open(self.srcpath, 'wb') as f:
+            f.write(data)
+        return hashlib.sha1(data).hexdigest()
+
+    def fixup(self, cache):
+        a = Analysis(Metadata(Generator('test'), None, None, None),
+                     [Issue(None, 'test',
+                            Location(File('foo.c', None), None, Point(1, 1)),
+                            Message('message'), None, None)])
+        a.fixup_files(relativedir=self.tmpdir, hashalg='sha1',
+                      hashcache=cache)
+        return a.results[0].location.file.hash_.hexdigest
+
+    def corrupt_cache(self):
+        conn = sqlite3.connect(self.cachepath)
+        with conn:
+            conn.execute("UPDATE hashes SET hexdigest = 'bogus'")
+        conn.close()
+
+    def test_cache(self):
+        expected = hashlib.sha1(b'int main(void) { return 0; }\n').hexdigest()
+        with HashCache(self.cachepath) as cache:
+            self.assertEqual(cache.lookup(self.srcpath, 'sha1'), None)
+            self.assertEqual(self.fixup(cache), expected)
+            self.assertEqual(cache.lookup(self.srcpath, 'sha1'), expected)
+            self.assertEqual(cache.lookup(self.srcpath, 'md5'), None)
+
+        # The cache persists, and is consulted: a (corrupted) entry for the
+        # unchanged file is used without rehashing the file:
+        self.corrupt_cache()
+        with HashCache(self.cachepath) as cache:
+            self.assertEqual(self.fixup(cache), 'bogus')
+
+            # Entries for files that have since changed are ignored:
+            expected = self.write_source(b'int main(void) { return 1; }\n\n')
+            self.assertEqual(self.fixup(cache), expected)
+            self.assertEqual(self.fixup(cache), expected)
+
+    def test_concurrent_use(self):
+        # Several caches (e.g. in different processes) can share the
+        # database:
+        expected = hashlib.sha1(b'int main(void) { return 0; }\n').hexdigest()
+        cache1 = HashCache(self.cachepath)
+        cache2 = HashCache(self.cachepath)
+        try:
+            self.assertEqual(self.fixup(cache1), expected)
+            self.assertEqual(cache2.lookup(self.srcpath, 'sha1'), expected)
+            expected = self.write_source(b'int x;\n')
+            self.assertEqual(self.fixup(cache2), expected)
+            self.assertEqual(cache1.lookup(self.srcpath, 'sha1'), expected)
+        finally:
+            cache1.close()
+            cache2.close()
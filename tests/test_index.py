@@ -0,0 +1,186 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+import unittest
+
+import random
+
+from firehose.index import AnalysisIndex, LineIndex, parse_unified_diff, \
+    results_touched_by_diff
+from firehose.model import Failure, Location, File, Message
+
+from tests.helpers import make_issue, make_analysis
+
+class AnalysisIndexTests(unittest.TestCase):
+    def make_index(self):
+        results = [make_issue('foo.c', 'format', 401, 'high'),
+                   make_issue('bar.c', 'format'),
+                   make_issue('foo.c', 'leak', 401, 'low', function='g'),
+                   Failure('crash', Location(File('foo.c', None), None),
+                           Message('crashed'), None),
+                   make_issue('baz.c', 'leak', 476, 'high')]
+        a = make_analysis(results, generator='test')
+        return results, AnalysisIndex(a)
+
+    def test_query(self):
+        results, index = self.make_index()
+        self.assertEqual(index.query(file='foo.c'),
+                         [results[0], results[2], results[3]])
+        self.assertEqual(index.query(cwe=401), [results[0], results[2]])
+        self.assertEqual(index.query(testid='format', file='foo.c'),
+                         [results[0]])
+        self.assertEqual(index.query(testid=('format', 'leak'),
+                                     severity='high'),
+                         [results[0], results[4]])
+        self.assertEqual(index.query(file='foo.c', function='g'),
+                         [results[2]])
+        self.assertEqual(index.query(file='foo.c', testid=None),
+                         [results[3]])
+        self.assertEqual(index.query(file='nonexistent.c'), [])
+        self.assertEqual(index.query(file='foo.c', cwe=476), [])
+        self.assertEqual(index.query(), results)
+        self.assertEqual(index.positions(severity='high'), [0, 4])
+        self.assertEqual(index.counts('testid'),
+                         {'format': 2, 'leak': 2, None: 1})
+        with self.assertRaises(ValueError):
+            index.query(colour='red')
+
+    def test_lazy(self):
+        results, index = self.make_index()
+        self.assertEqual(index._indexes, {})
+        index.query(file='foo.c')
+        self.assertEqual(list(index._indexes), ['file'])
+
+    def test_append(self):
+        # Indexes are kept consistent as results are appended, whether via
+        # the index or directly:
+        results, index = self.make_index()
+        self.assertEqual(len(index.query(file='foo.c', cwe=401)), 2)
+        new_issue = make_issue('foo.c', 'format', 401)
+        index.append(new_issue)
+        self.assertEqual(index.query(file='foo.c', cwe=401),
+                         [results[0], results[2], new_issue])
+        other_issue = make_issue('qux.c', 'format', 401)
+        index.analysis.results.append(other_issue)
+        self.assertEqual(index.query(file='qux.c'), [other_issue])
+        self.assertEqual(index.query(cwe=401)[-1], other_issue)
+
+        # Other changes need invalidate():
+        del index.analysis.results[0]
+        index.invalidate()
+        self.assertEqual(index.query(testid='format', cwe=401),
+                         [new_issue, other_issue])
+
+class LineIndexTests(unittest.TestCase):
+    def make_analysis(self):
+        results = [make_issue('src/foo.c', 'a', line=10),
+                   make_issue('src/foo.c', 'b', line=20, end_line=30),
+                   make_issue('./src/foo.c', 'c', line=25),
+                   make_issue('src/bar.c', 'd', line=10),
+                   Failure('crash', Location(File('src/foo.c', None), None),
+                           Message('crashed'), None)]
+        return results, make_analysis(results, generator='test')
+
+    def test_overlapping(self):
+        results, a = self.make_analysis()
+        index = LineIndex(a)
+        self.assertEqual(index.overlapping('src/foo.c', 10, 10),
+                         [results[0]])
+        self.assertEqual(index.overlapping('src/foo.c', 11, 19), [])
+        self.assertEqual(index.overlapping('src/foo.c', 5, 20),
+                         [results[0], results[1]])
+        self.assertEqual(index.overlapping('src/foo.c', 30, 40),
+                         [results[1]])
+        self.assertEqual(index.overlapping('src/foo.c', 24, 26),
+                         [results[1], results[2]])
+        self.assertEqual(index.overlapping('src/bar.c', 1, 100),
+                         [results[3]])
+        self.assertEqual(index.overlapping('src/baz.c', 1, 100), [])
+        self.assertEqual(index.touched_by([('src/bar.c', 10, 10),
+                                           ('src/foo.c', 1, 10)]),
+                         [results[0], results[3]])
+
+        # Appended results are picked up:
+        new_issue = make_issue('src/foo.c', 'e', line=15)
+        a.results.append(new_issue)
+        self.assertEqual(index.overlapping('src/foo.c', 11, 19),
+                         [new_issue])
+
+    def test_against_scan(self):
+        rng = random.Random(0)
+        results = []
+        for i in range(500):
+            start = rng.randint(1, 200)
+            end = start + rng.choice([0, 0, 0, 1, 5, 50])
+            results.append(make_issue('foo.c', 'test', line=start,
+                                      end_line=end if end != start
+                                      else None))
+        index = LineIndex(make_analysis(results, generator='test'))
+        for _ in range(200):
+            lo = rng.randint(1, 260)
+            hi = lo + rng.choice([0, 1, 10, 100])
+            expected = []
+            for position, result in enumerate(results):
+                if result.location.point is not None:
+                    start = end = result.location.point.line
+                else:
+                    start = result.location.range_.start.line
+                    end = result.location.range_.end.line
+                if start <= hi and end >= lo:
+                    expected.append(position)
+            self.assertEqual(index.positions('foo.c', lo, hi), expected)
+
+    def test_parse_unified_diff(self):
+        diff = """diff --git a/src/foo.c b/src/foo.c
+--- a/src/foo.c
++++ b/src/foo.c
+@@ -8,6 +8,7 @@ int main(void)
+ context
+ context
+-old
++new
++added
+ context
+ context
+ context
+@@ -30,4 +31,3 @@
+ context
+-removed
+ context
+ context
+--- a/src/removed.c
++++ /dev/null
+@@ -1,2 +0,0 @@
+-gone
+-gone
+--- /dev/null
++++ b/src/new.c
+@@ -0,0 +1,3 @@
++one
++two
++three
+"""
+        hunks = parse_unified_diff(diff.splitlines(True))
+        self.assertEqual(hunks, [('src/foo.c', 10, 11),
+                                 ('src/foo.c', 32, 32),
+                                 ('src/new.c', 1, 3)])
+        self.assertEqual(parse_unified_diff(diff.splitlines(True),
+                                            strip=2)[0],
+                         ('foo.c', 10, 11))
+
+        results, a = self.make_analysis()
+        self.assertEqual(results_touched_by_diff(a, diff.splitlines(True)),
+                         [results[0]])
@@ -0,0 +1,98 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+import os
+import tempfile
+import unittest
+
+from six import StringIO
+
+from firehose.jsonl import JsonLinesWriter, JsonLinesReader, \
+    write_analysis, read_analyses
+from firehose.model import Analysis, Metadata, Generator
+
+from tests.helpers import make_issue, make_simple_analysis, \
+    make_complex_analysis, make_failed_analysis, make_info
+
+class JsonLinesTests(unittest.TestCase):
+    def get_analyses(self):
+        return [make_simple_analysis()[0],
+                make_complex_analysis()[0],
+                make_failed_analysis()[0],
+                make_info()[0]]
+
+    def test_roundtrip(self):
+        for a in self.get_analyses():
+            a.set_custom_field('foo', 'bar')
+            output = StringIO()
+            write_analysis(a, output)
+            lines = output.getvalue().splitlines()
+            self.assertEqual(len(lines), 1 + len(a.results))
+            self.assertEqual(list(read_analyses(StringIO(output.getvalue()))),
+                             [a])
+
+    def test_concatenation(self):
+        # Output from several writers can be concatenated:
+        analyses = self.get_analyses()
+        output = StringIO()
+        for a in analyses:
+            write_analysis(a, output)
+        # (an analysis with no results)
+        empty = Analysis(Metadata(Generator('empty'), None, None, None), [])
+        write_analysis(empty, output)
+        self.assertEqual(list(read_analyses(StringIO(output.getvalue()))),
+                         analyses + [empty])
+
+        reader = JsonLinesReader(StringIO(output.getvalue()))
+        seen = []
+        for result in reader:
+            seen.append((reader.metadata, result))
+        self.assertEqual(seen,
+                         [(a.metadata, result)
+                          for a in analyses for result in a.results])
+        self.assertEqual(reader.metadata, empty.metadata)
+
+    def test_following(self):
+        # Results can be consumed while the file is still being written:
+        fd, path = tempfile.mkstemp(suffix='.jsonl')
+        try:
+            with os.fdopen(fd, 'w') as out, open(path) as in_:
+                metadata = Metadata(Generator('test'), None, None, None)
+                writer = JsonLinesWriter(out, metadata, autoflush=True)
+                reader = JsonLinesReader(in_)
+                self.assertEqual(list(reader), [])
+                self.assertEqual(reader.metadata, metadata)
+
+                writer.write_result(make_issue(line=1))
+                writer.write_result(make_issue(line=2))
+                self.assertEqual(list(reader),
+                                 [make_issue(line=1), make_issue(line=2)])
+                self.assertEqual(list(reader), [])
+
+                # A partially-written line is held back until complete:
+                line = StringIO()
+                JsonLinesWriter(line, metadata).write_result(
+                    make_issue(line=3))
+                line = line.getvalue().splitlines(True)[1]
+                out.write(line[:10])
+                out.flush()
+                self.assertEqual(list(reader), [])
+                out.write(line[10:])
+                out.flush()
+                self.assertEqual(list(reader), [make_issue(line=3)])
+        finally:
+            os.unlink(path)
@@ -0,0 +1,120 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+from multiprocessing.pool import ThreadPool
+import os
+import shutil
+import tempfile
+import unittest
+
+from six import BytesIO
+
+from firehose.merge import merge, merge_metadata, _imap_bounded
+from firehose.model import Analysis, Metadata, Generator, SourceRpm, \
+    Stats, CustomFields
+
+from tests.helpers import make_issue
+
+def make_metadata(generator='checker', version=None, wallclocktime=None):
+    return Metadata(Generator(generator, version),
+                    SourceRpm('foo', '1.0', '1', 'x86_64'), None,
+                    Stats(wallclocktime)
+                    if wallclocktime is not None else None)
+
+class MergeTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write_inputs(self, analyses):
+        paths = []
+        for i, a in enumerate(analyses):
+            path = os.path.join(self.tmpdir, 'input-%i.xml' % i)
+            with open(path, 'wb') as f:
+                a.write_xml(f)
+            paths.append(path)
+        return paths
+
+    def check_merge(self, processes):
+        a1 = Analysis(make_metadata(wallclocktime=1.5),
+                      [make_issue(line=1), make_issue(line=2)],
+                      CustomFields(foo='a'))
+        a2 = Analysis(make_metadata(wallclocktime=2.0),
+                      [make_issue(line=2), make_issue(line=3)],
+                      CustomFields([('foo', 'b'), ('bar', 1)]))
+        # (the same issue, but from another tool, isn't a duplicate)
+        a3 = Analysis(make_metadata('other-checker', '0.1'),
+                      [make_issue(line=1)])
+        output = BytesIO()
+        counts = merge(self.write_inputs([a1, a2, a3]), output,
+                       processes=processes)
+        self.assertEqual(counts, (4, 1))
+
+        merged = Analysis.from_xml(BytesIO(output.getvalue()))
+        self.assertEqual(merged.results,
+                         [make_issue(line=1), make_issue(line=2),
+                          make_issue(line=3), make_issue(line=1)])
+        self.assertEqual(merged.metadata.generator,
+                         Generator('checker, other-checker'))
+        self.assertEqual(merged.metadata.sut, a1.metadata.sut)
+        self.assertEqual(merged.metadata.stats, Stats(3.5))
+        self.assertEqual(merged.customfields,
+                         CustomFields([('generators',
+                                        'checker, other-checker 0.1'),
+                                       ('foo', 'a'),
+                                       ('bar', 1)]))
+
+    def test_merge_in_process(self):
+        self.check_merge(processes=1)
+
+    def test_merge_with_pool(self):
+        self.check_merge(processes=2)
+
+    def test_merge_metadata(self):
+        # A single generator is kept as-is:
+        metadata, customfields = merge_metadata([make_metadata(version='1'),
+                                                 make_metadata(version='1')])
+        self.assertEqual(metadata, make_metadata(version='1'))
+        self.assertEqual(customfields, None)
+
+        # Conflicting suts are dropped:
+        m = make_metadata()
+        m.sut = SourceRpm('bar', '1.0', '1', 'x86_64')
+        metadata, customfields = merge_metadata([make_metadata(), m])
+        self.assertEqual(metadata.sut, None)
+
+    def test_no_inputs(self):
+        with self.assertRaises(ValueError):
+            merge([], BytesIO())
+
+    def test_imap_bounded(self):
+        # Inputs are only taken as earlier results are consumed:
+        taken = []
+        def inputs():
+            for i in range(20):
+                taken.append(i)
+                yield i
+        pool = ThreadPool(2)
+        try:
+            results = _imap_bounded(pool, abs, inputs(), 4)
+            self.assertEqual(next(results), 0)
+            self.assertEqual(len(taken), 5)
+            self.assertEqual(list(results), list(range(1, 20)))
+        finally:
+            pool.close()
+            pool.join()
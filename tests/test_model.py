@@ -16,7 +16,9 @@
 #   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
 #   USA
 
+from collections import OrderedDict
 import glob
+import hashlib
 import os
 import subprocess
 import tempfile
@@ -25,103 +27,17 @@ import unittest
 from six import u, StringIO, BytesIO
 
 from firehose.model import Analysis, Issue, Metadata, Generator, SourceRpm, \
-    Location, File, Function, Point, Message, Notes, Trace, State, Stats, \
-    Failure, Range, DebianSource, DebianBinary, CustomFields, Info
+    Location, File, Function, Point, Message, Notes, Trace, State, \
+    Failure, Range, DebianSource, DebianBinary, CustomFields, Info, \
+    Interner, AnalysisWriter, Sut, Visitor, MultiVisitor, \
+    _get_visitor_overrides
 
-class AnalysisTests(unittest.TestCase):
-    def make_simple_analysis(self):
-        """
-        Construct a minimal Analysis instance
-        """
-        a = Analysis(metadata=Metadata(generator=Generator(name='cpychecker'),
-                                       sut=None,
-                                       file_=None,
-                                       stats=None),
-                     results=[Issue(cwe=None,
-                                    testid=None,
-                                    location=Location(file=File('foo.c', None),
-                                                      function=None,
-                                                      point=Point(10, 15)),
-                                    message=Message(text='something bad involving pointers'),
-                                    notes=None,
-                                    trace=None)])
-        return a, a.results[0]
-
-    def make_complex_analysis(self):
-        """
-        Construct a Analysis instance that uses all features
-        """
-        a = Analysis(metadata=Metadata(generator=Generator(name='cpychecker',
-                                                           version='0.11'),
-                                       sut=SourceRpm(name='python-ethtool',
-                                                     version='0.7',
-                                                     release='4.fc19',
-                                                     buildarch='x86_64'),
-                                       file_=File(givenpath='foo.c',
-                                                  abspath='/home/david/coding/foo.c'),
-                                       stats=Stats(wallclocktime=0.4)),
-                     results=[Issue(cwe=681,
-                                    testid='refcount-too-high',
-                                    location=Location(file=File(givenpath='foo.c',
-                                                                abspath='/home/david/coding/foo.c'),
-                                                      function=Function('bar'),
-                                                      point=Point(10, 15)),
-                                    message=Message(text='something bad involving pointers'),
-                                    notes=Notes('here is some explanatory text'),
-                                    trace=Trace([State(location=Location(file=File('foo.c', None),
-                                                                         function=Function('bar'),
-                                                                         point=Point(7, 12)),
-                                                       notes=Notes('first we do this')),
-                                                 State(location=Location(file=File('foo.c', None),
-                                                                         function=Function('bar'),
-                                                                         point=Point(8, 10)),
-                                                       notes=Notes('then we do that')),
-                                                 State(location=Location(file=File('foo.c', None),
-                                                                         function=Function('bar'),
-                                                                         range_=Range(Point(10, 15),
-                                                                                      Point(10, 25))),
-                                                       notes=Notes('then it crashes here'))
-                                                 ]),
-                                    severity='really bad',
-                                    customfields=CustomFields(foo='bar')),
-                              ],
-                     customfields=CustomFields(gccinvocation='gcc -I/usr/include/python2.7 -c foo.c'),
-                     )
-        return a, a.results[0]
-
-    def make_failed_analysis(self):
-        a = Analysis(metadata=Metadata(generator=Generator(name='yet-another-checker'),
-                                       sut=None,
-                                       file_=None,
-                                       stats=None),
-                     results=[Failure(failureid='out-of-memory',
-                                      location=Location(file=File('foo.c', None),
-                                                        function=Function('something_complicated'),
-                                                        point=Point(10, 15)),
-                                      message=Message('out of memory'),
-                                      customfields=CustomFields(stdout='sample stdout',
-                                                                stderr='sample stderr',
-                                                                returncode=-9)) # (killed)
-                              ])
-        return a, a.results[0]
-
-    def make_info(self):
-        a = Analysis(metadata=Metadata(generator=Generator(name='an-invented-checker'),
-                                       sut=None,
-                                       file_=None,
-                                       stats=None),
-                     results=[Info(infoid='gimple-stats',
-                                   location=Location(file=File('bar.c', None),
-                                                     function=Function('sample_function'),
-                                                     point=Point(10, 15)),
-                                   message=Message('sample message'),
-                                   customfields=CustomFields(num_stmts=57,
-                                                             num_basic_blocks=10))
-                              ])
-        return a, a.results[0]
+from tests.helpers import make_simple_analysis, make_complex_analysis, \
+    make_failed_analysis, make_info
 
+class AnalysisTests(unittest.TestCase):
     def test_creating_simple_analysis(self):
-        a, w = self.make_simple_analysis()
+        a, w = make_simple_analysis()
         self.assertEqual(a.metadata.generator.name, 'cpychecker')
         self.assertEqual(a.metadata.generator.version, None)
         self.assertEqual(a.metadata.sut, None)
@@ -139,7 +55,7 @@ class AnalysisTests(unittest.TestCase):
         self.assertEqual(w.trace, None)
 
     def test_creating_complex_analysis(self):
-        a, w = self.make_complex_analysis()
+        a, w = make_complex_analysis()
         self.assertEqual(a.metadata.generator.name, 'cpychecker')
         self.assertEqual(a.metadata.generator.version, '0.11')
         self.assertIsInstance(a.metadata.sut, SourceRpm)
@@ -178,7 +94,7 @@ class AnalysisTests(unittest.TestCase):
         self.assertEqual(s2.location.column, 15)
 
     def test_making_failed_analysis(self):
-        a, f = self.make_failed_analysis()
+        a, f = make_failed_analysis()
 
         self.assertIsInstance(f, Failure)
         self.assertEqual(f.failureid, 'out-of-memory')
@@ -192,7 +108,7 @@ class AnalysisTests(unittest.TestCase):
         self.assertEqual(f.customfields['returncode'], -9)
 
     def test_making_info(self):
-        a, info = self.make_info()
+        a, info = make_info()
 
         self.assertIsInstance(info, Info)
         self.assertEqual(info.infoid, 'gimple-stats')
@@ -367,16 +283,16 @@ class AnalysisTests(unittest.TestCase):
             # file:
             os.unlink(f.name)
 
-        a, w = self.make_simple_analysis()
+        a, w = make_simple_analysis()
         validate(a.to_xml_bytes())
 
-        a, w = self.make_complex_analysis()
+        a, w = make_complex_analysis()
         validate(a.to_xml_bytes())
 
-        a, w = self.make_failed_analysis()
+        a, w = make_failed_analysis()
         validate(a.to_xml_bytes())
 
-        a, w = self.make_info()
+        a, w = make_info()
         validate(a.to_xml_bytes())
 
     def test_xml_roundtrip(self):
@@ -386,28 +302,28 @@ class AnalysisTests(unittest.TestCase):
             buf = BytesIO(xmlbytes)
             return Analysis.from_xml(buf)
 
-        a1, w = self.make_simple_analysis()
+        a1, w = make_simple_analysis()
         a2 = roundtrip_through_xml(a1)
 
         self.assertEqual(a1.metadata, a2.metadata)
         self.assertEqual(a1.results, a2.results)
         self.assertEqual(a1, a2)
 
-        a3, w = self.make_complex_analysis()
+        a3, w = make_complex_analysis()
         a4 = roundtrip_through_xml(a3)
 
         self.assertEqual(a3.metadata, a4.metadata)
         self.assertEqual(a3.results, a4.results)
         self.assertEqual(a3, a4)
 
-        a5, f = self.make_failed_analysis()
+        a5, f = make_failed_analysis()
         a6 = roundtrip_through_xml(a5)
 
         self.assertEqual(a5.metadata, a6.metadata)
         self.assertEqual(a5.results, a6.results)
         self.assertEqual(a5, a6)
 
-        a7, info = self.make_info()
+        a7, info = make_info()
         a8 = roundtrip_through_xml(a7)
 
         self.assertEqual(a7.metadata, a8.metadata)
@@ -428,28 +344,28 @@ class AnalysisTests(unittest.TestCase):
                 pprint(jsondict)
             return Analysis.from_json(jsondict)
 
-        a1, w = self.make_simple_analysis()
+        a1, w = make_simple_analysis()
         a2 = roundtrip_through_json(a1)
 
         self.assertEqual(a1.metadata, a2.metadata)
         self.assertEqual(a1.results, a2.results)
         self.assertEqual(a1, a2)
 
-        a3, w = self.make_complex_analysis()
+        a3, w = make_complex_analysis()
         a4 = roundtrip_through_json(a3)
 
         self.assertEqual(a3.metadata, a4.metadata)
         self.assertEqual(a3.results, a4.results)
         self.assertEqual(a3, a4)
 
-        a5, f = self.make_failed_analysis()
+        a5, f = make_failed_analysis()
         a6 = roundtrip_through_json(a5)
 
         self.assertEqual(a5.metadata, a6.metadata)
         self.assertEqual(a5.results, a6.results)
         self.assertEqual(a5, a6)
 
-        a7, info = self.make_info()
+        a7, info = make_info()
         a8 = roundtrip_through_json(a7)
 
         self.assertEqual(a7.metadata, a8.metadata)
@@ -462,19 +378,19 @@ class AnalysisTests(unittest.TestCase):
 
     def test_repr(self):
         # Verify that the various __repr__ methods are sane:
-        a, w = self.make_simple_analysis()
+        a, w = make_simple_analysis()
         self.assertIn('Analysis(', repr(a))
         self.assertIn('Issue(', repr(a))
 
-        a, w = self.make_complex_analysis()
+        a, w = make_complex_analysis()
         self.assertIn('Analysis(', repr(a))
         self.assertIn('Issue(', repr(a))
 
-        a, f = self.make_failed_analysis()
+        a, f = make_failed_analysis()
         self.assertIn('Analysis(', repr(a))
         self.assertIn('Failure(', repr(a))
 
-        a, info = self.make_info()
+        a, info = make_info()
         self.assertIn('Analysis(', repr(a))
         self.assertIn('Info(', repr(a))
 
@@ -483,28 +399,177 @@ class AnalysisTests(unittest.TestCase):
             a1, w1 = creator()
             a2, w2 = creator()
             self.assertEqual(hash(a1), hash(a2))
-        compare_hashes(self.make_simple_analysis)
-        compare_hashes(self.make_complex_analysis)
-        compare_hashes(self.make_failed_analysis)
-        compare_hashes(self.make_info)
+            self.assertEqual(hash(w1), hash(w2))
+        compare_hashes(make_simple_analysis)
+        compare_hashes(make_complex_analysis)
+        compare_hashes(make_failed_analysis)
+        compare_hashes(make_info)
+
+    def test_hash_order_sensitive(self):
+        # Swapping fields, or reordering states, gives a different hash:
+        self.assertNotEqual(hash(Point(3, 7)), hash(Point(7, 3)))
+        self.assertNotEqual(hash(Range(Point(1, 2), Point(3, 4))),
+                            hash(Range(Point(3, 4), Point(1, 2))))
+        a, w = make_complex_analysis()
+        states = w.trace.states
+        self.assertNotEqual(hash(Trace(states)),
+                            hash(Trace(list(reversed(states)))))
+        self.assertEqual(hash(CustomFields([('a', 1), ('b', 'c')])),
+                         hash(CustomFields([('a', 1), ('b', 'c')])))
+
+    def test_hash_mutation(self):
+        # Hashes follow changes to an object (or to any object within it):
+        a, w = make_complex_analysis()
+        a2, w2 = make_complex_analysis()
+        self.assertEqual(hash(w), hash(w2))
+        issues = set([w])
+        self.assertIn(w2, issues)
+
+        w2.trace.states[1].location.point.line = 1000
+        self.assertNotEqual(hash(w), hash(w2))
+        self.assertNotIn(w2, issues)
+        w2.trace.states[1].location.point.line = \
+            w.trace.states[1].location.point.line
+        self.assertEqual(hash(w), hash(w2))
+
+        w2.trace.add_state(w2.trace.states[0])
+        self.assertNotEqual(hash(w), hash(w2))
+        w2.trace.states.pop()
+        self.assertEqual(hash(w), hash(w2))
+        # (including changes made to the list of states in-place)
+        w2.trace.states.append(w2.trace.states[0])
+        self.assertNotEqual(hash(w), hash(w2))
+
+        # Hashing doesn't slow down later construction by replacing
+        # __setattr__:
+        self.assertIs(Point.__setattr__, object.__setattr__)
+
+        # fixup_files modifies the (shared) File instances:
+        before = hash(w)
+        a.fixup_files(relativedir=os.path.dirname(__file__))
+        self.assertNotEqual(hash(w), before)
+
+    def test_fingerprint(self):
+        a, w = make_complex_analysis()
+        a2, w2 = make_complex_analysis()
+        fingerprint = w.fingerprint('cpychecker')
+        self.assertEqual(len(fingerprint), 40)
+        self.assertEqual(fingerprint, w2.fingerprint('cpychecker'))
+        self.assertEqual(a.fingerprints(), [fingerprint])
+        self.assertNotEqual(w.fingerprint(), fingerprint)
+
+        # The algorithm is documented, and doesn't vary between processes:
+        self.assertEqual(
+            fingerprint,
+            hashlib.sha1(b'issue\x00cpychecker\x00refcount-too-high\x00681\x00'
+                         b'foo.c\x00bar\x00something bad involving pointers\x00'
+                         b'10').hexdigest())
+
+        # Paths are normalized, and whitespace within messages collapsed:
+        w2.location.file.givenpath = './tests/../foo.c'
+        w2.message.text = ' something bad\n  involving pointers'
+        self.assertEqual(w2.fingerprint('cpychecker'), fingerprint)
+
+        # Line numbers can be ignored:
+        without_line = w.fingerprint('cpychecker', include_line=False)
+        w2.location.point.line = 42
+        self.assertNotEqual(w2.fingerprint('cpychecker'), fingerprint)
+        self.assertEqual(w2.fingerprint('cpychecker', include_line=False),
+                         without_line)
+
+        # Failures and infos have fingerprints too:
+        a, f = make_failed_analysis()
+        a2, i = make_info()
+        self.assertNotEqual(f.fingerprint(), i.fingerprint())
+        self.assertEqual(a.fingerprints(),
+                         [f.fingerprint(a.metadata.generator.name)])
 
     def test_cwe(self):
         # Verify that the CWE methods are sane:
-        a, w = self.make_complex_analysis()
+        a, w = make_complex_analysis()
         self.assertIsInstance(w.cwe, int)
         self.assertEqual(w.get_cwe_str(), 'CWE-681')
         self.assertEqual(w.get_cwe_url(),
                          'http://cwe.mitre.org/data/definitions/681.html')
 
         # Verify that they are sane for a warning without a CWE:
-        a, w = self.make_simple_analysis()
+        a, w = make_simple_analysis()
         self.assertEqual(w.cwe, None)
         self.assertEqual(w.get_cwe_str(), None)
         self.assertEqual(w.get_cwe_url(), None)
 
+    def test_iterators(self):
+        # The iterators yield the same nodes, in the same order, as a
+        # Visitor:
+        class Collector(Visitor):
+            def __init__(self):
+                self.nodes = {'file': [], 'location': [], 'state': [],
+                              'message': []}
+            def visit_file(self, file_):
+                self.nodes['file'].append(file_)
+            def visit_location(self, location):
+                self.nodes['location'].append(location)
+            def visit_state(self, state):
+                self.nodes['state'].append(state)
+            def visit_message(self, message):
+                self.nodes['message'].append(message)
+
+        for a, w in (make_simple_analysis(),
+                     make_complex_analysis(),
+                     make_failed_analysis(),
+                     make_info()):
+            collector = Collector()
+            a.accept(collector)
+            self.assertEqual(list(a.iter_files()), collector.nodes['file'])
+            self.assertEqual(list(a.iter_locations()),
+                             collector.nodes['location'])
+            self.assertEqual(list(a.iter_states()), collector.nodes['state'])
+            self.assertEqual(list(a.iter_messages()),
+                             collector.nodes['message'])
+
+        a, w = make_complex_analysis()
+        self.assertEqual(len(list(a.iter_states())), len(w.trace.states))
+
+    def test_multivisitor(self):
+        class FileCounter(Visitor):
+            def __init__(self):
+                self.log = []
+            def visit_file(self, file_):
+                self.log.append(('file', file_.givenpath))
+
+        class LocationLogger(FileCounter):
+            def visit_location(self, location):
+                self.log.append(('location', location.file.givenpath))
+
+        class MessageLogger(Visitor):
+            def __init__(self):
+                self.log = []
+            def visit_message(self, message):
+                self.log.append(('message', message.text))
+
+        a, w = make_complex_analysis()
+        expected = []
+        for cls in (FileCounter, LocationLogger, MessageLogger):
+            visitor = cls()
+            a.accept(visitor)
+            expected.append(visitor.log)
+        self.assertTrue(all(expected))
+
+        visitors = [FileCounter(), LocationLogger(), MessageLogger()]
+        multi = MultiVisitor(visitors)
+        a.accept(multi)
+        self.assertEqual([visitor.log for visitor in visitors], expected)
+
+        # Only overridden methods are dispatched to:
+        self.assertEqual(_get_visitor_overrides(LocationLogger),
+                         ('visit_file', 'visit_location'))
+        self.assertEqual(_get_visitor_overrides(Visitor), ())
+        self.assertNotIn('visit_point', vars(multi))
+        self.assertEqual(multi.visit_message, visitors[2].visit_message)
+
     def test_fixup_paths(self):
         # Verify that Report.fixup_files() can make paths absolute:
-        a, w = self.make_simple_analysis()
+        a, w = make_simple_analysis()
 
         self.assertEqual(w.location.file.abspath, None)
         a.fixup_files(relativedir='/home/david/coding/test')
@@ -512,7 +577,7 @@ class AnalysisTests(unittest.TestCase):
 
     def test_fixup_hashes(self):
         # Verify that Report.fixup_files() can add hashes to files:
-        a, w = self.make_simple_analysis()
+        a, w = make_simple_analysis()
         w.location.file.givenpath = 'examples/python-src-example.c'
         w.location.file.abspath = None
         self.assertEqual(w.location.file.hash_, None)
@@ -522,15 +587,44 @@ class AnalysisTests(unittest.TestCase):
         self.assertEqual(w.location.file.hash_.hexdigest,
                          'e978c45fc1779e59d5f8c6c0d534fe2d0a5a7c66')
 
+    def test_fixup_hashes_shared(self):
+        # Each distinct path is hashed once, and the Hash is shared by all
+        # of the files referring to it:
+        a, w = make_simple_analysis()
+        w.location.file = File('examples/python-src-example.c', None)
+        w.trace = Trace([State(Location(File('examples/python-src-example.c',
+                                             None), None, Point(i, 1)),
+                               None)
+                         for i in range(5)])
+        a.results.append(Issue(None, 'test',
+                               Location(File('tests/test_model.py', None),
+                                        None, Point(1, 1)),
+                               Message('message'), None, None))
+        for threads in (1, None, 4):
+            a.fixup_files(hashalg='sha1', threads=threads)
+            hashes = [state.location.file.hash_
+                      for state in w.trace.states]
+            self.assertEqual(hashes[0].hexdigest,
+                             'e978c45fc1779e59d5f8c6c0d534fe2d0a5a7c66')
+            for hash_ in hashes + [w.location.file.hash_]:
+                self.assertIs(hash_, hashes[0])
+            with open('tests/test_model.py', 'rb') as f:
+                self.assertEqual(a.results[-1].location.file.hash_.hexdigest,
+                                 hashlib.sha1(f.read()).hexdigest())
+
+        with self.assertRaises(IOError):
+            w.location.file.givenpath = 'nonexistent.c'
+            a.fixup_files(hashalg='sha1')
+
     def test_gcc_output(self):
-        a, w = self.make_simple_analysis()
+        a, w = make_simple_analysis()
 
         output = StringIO()
         w.write_as_gcc_output(output)
         self.assertEqual(output.getvalue(),
                          'foo.c:10:15: warning: something bad involving pointers\n')
 
-        a, w = self.make_complex_analysis()
+        a, w = make_complex_analysis()
         output = StringIO()
         w.write_as_gcc_output(output)
         self.assertMultiLineEqual(output.getvalue(),
@@ -583,10 +677,326 @@ class AnalysisTests(unittest.TestCase):
         # Ensure that an empty <str-field> has value '', rather than None:
         self.assertEqual(a.customfields['test'], '')
 
+    def test_malformed_xml(self):
+        # Missing attributes, text and elements are rejected, rather than
+        # giving objects with None where a value is required:
+        def issue_xml(location, message=b'<message>message</message>'):
+            return (b'<analysis><metadata><generator name="test"/>'
+                    b'</metadata><results><issue>' + message + location +
+                    b'</issue></results></analysis>')
+        point = b'<point line="1" column="1"/>'
+        for xml in [issue_xml(b''),
+                    issue_xml(b'<location><file given-path="foo.c"/>'
+                              + point + b'</location>',
+                              message=b''),
+                    issue_xml(b'<location><file given-path="foo.c"/>'
+                              + point + b'</location>',
+                              message=b'<message/>'),
+                    issue_xml(b'<location>' + point + b'</location>'),
+                    issue_xml(b'<location><file/>' + point + b'</location>'),
+                    issue_xml(b'<location><file given-path="foo.c">'
+                              b'<hash alg="sha1"/></file>'
+                              + point + b'</location>'),
+                    issue_xml(b'<location><file given-path="foo.c"/>'
+                              b'<function/>' + point + b'</location>'),
+                    issue_xml(b'<location><file given-path="foo.c"/>'
+                              b'<point line="1"/></location>'),
+                    issue_xml(b'<location><file given-path="foo.c"/>'
+                              b'<range>' + point + b'</range></location>')]:
+            with self.assertRaises(ValueError):
+                self.parse_xml_bytes(xml)
+
     def test_set_custom_field(self):
-        a, w = self.make_simple_analysis()
+        a, w = make_simple_analysis()
         self.assertEqual(a.customfields, None)
 
         a.set_custom_field('foo', 'bar')
         self.assertNotEqual(a.customfields, None)
         self.assertEqual(a.customfields['foo'], 'bar')
+
+    def test_slots(self):
+        # Model objects use __slots__ rather than a per-instance __dict__:
+        a, w = make_complex_analysis()
+        for obj in [a, a.metadata, a.metadata.generator, a.metadata.sut,
+                    a.metadata.stats, w, w.location, w.location.file,
+                    w.location.function, w.location.point, w.message,
+                    w.notes, w.trace, w.trace.states[0],
+                    w.trace.states[2].location.range_]:
+            self.assertFalse(hasattr(obj, '__dict__'), obj)
+        with self.assertRaises(AttributeError):
+            w.location.point.nonexistent_attribute = 42
+
+        # ...but they can still be copied and pickled, with every protocol
+        # (including 0, the default on Python 2):
+        import copy
+        import pickle
+        self.assertEqual(copy.deepcopy(a), a)
+        hash(a)
+        w.fingerprint()
+        for protocol in [None] + list(range(pickle.HIGHEST_PROTOCOL + 1)):
+            a2 = pickle.loads(pickle.dumps(a, protocol))
+            self.assertEqual(a2, a)
+            self.assertEqual(hash(a2), hash(a))
+            self.assertEqual(a2.results[0].fingerprint(), w.fingerprint())
+
+        # (including those with traces yet to be decoded)
+        a2 = self.parse_xml_bytes(a.to_xml_bytes())
+        self.assertTrue(a2.results[0].has_lazy_trace)
+        a3 = pickle.loads(pickle.dumps(a2, 0))
+        self.assertFalse(a3.results[0].has_lazy_trace)
+        self.assertEqual(a3, a)
+
+    def test_interning(self):
+        # Identical File, Function and Point values within a report are
+        # shared when reading XML:
+        a, w = make_complex_analysis()
+        a2 = self.parse_xml_bytes(a.to_xml_bytes())
+        w2 = a2.results[0]
+        s0, s1, s2 = w2.trace.states
+        self.assertIs(s0.location.file, s1.location.file)
+        self.assertIs(s0.location.function, w2.location.function)
+        self.assertIs(s2.location.range_.start, w2.location.point)
+        self.assertEqual(a2, a)
+
+        # Interned files can still be fixed up in-place:
+        a2.fixup_files(relativedir='/tmp')
+        self.assertEqual(s0.location.file.abspath, '/tmp/foo.c')
+        self.assertEqual(s1.location.file.abspath, '/tmp/foo.c')
+        self.assertIsNot(w2.location.file, s0.location.file)
+        self.assertEqual(w2.location.file.abspath, '/tmp/foo.c')
+
+    def test_interner(self):
+        interner = Interner()
+        f1 = interner.file('foo.c', None)
+        self.assertIs(interner.file('foo.c', None), f1)
+        self.assertIsNot(interner.file('foo.c', '/tmp/foo.c'), f1)
+        self.assertIs(interner.function('bar'), interner.function('bar'))
+        self.assertIs(interner.point(10, 15), interner.point(10, 15))
+        self.assertIsNot(interner.point(10, 15), interner.point(15, 10))
+
+        # An entry that has been modified in-place since it was interned
+        # must not be handed out for the old values:
+        f1.abspath = '/tmp/foo.c'
+        f2 = interner.file('foo.c', None)
+        self.assertIsNot(f2, f1)
+        self.assertEqual(f2.abspath, None)
+        self.assertEqual(f1.abspath, '/tmp/foo.c')
+
+        # Points can be left unshared:
+        interner = Interner(share_points=False)
+        self.assertIsNot(interner.point(10, 15), interner.point(10, 15))
+        self.assertEqual(interner.point(10, 15), Point(10, 15))
+
+    def test_lazy_trace(self):
+        # Traces read from XML or JSON are only decoded on first access,
+        # and are then equal to the originals:
+        a, w = make_complex_analysis()
+        xmlbytes = a.to_xml_bytes()
+        for a2 in (Analysis.from_xml(BytesIO(xmlbytes)),
+                   Analysis.from_json(a.to_json()),
+                   Analysis(a.metadata,
+                            list(Analysis.iter_results(BytesIO(xmlbytes))))):
+            w2 = a2.results[0]
+            self.assertTrue(w2.has_lazy_trace)
+            self.assertEqual(w2.location, w.location)
+            self.assertTrue(w2.has_lazy_trace)
+            self.assertEqual(w2.trace, w.trace)
+            self.assertFalse(w2.has_lazy_trace)
+            self.assertIs(w2.trace, w2.trace)
+
+        # Hashing and comparison decode the trace as needed:
+        a2 = Analysis.from_xml(BytesIO(xmlbytes))
+        self.assertEqual(hash(a2.results[0]), hash(w))
+        a2 = Analysis.from_xml(BytesIO(xmlbytes))
+        self.assertEqual(a2, a)
+
+        # The pending trace is held compactly, rather than as the XML
+        # element or JSON objects that it came from:
+        for a2 in (Analysis.from_xml(BytesIO(xmlbytes)),
+                   Analysis.from_json(a.to_json())):
+            fields = a2.results[0]._trace.args[0]
+            self.assertIsInstance(fields, tuple)
+            self.assertEqual(len(fields), 10 * len(w.trace.states))
+            self.assertEqual(fields[0], 'foo.c')
+
+        # A trace that can't be held compactly (here, with a location
+        # having both a point and a range) is decoded straight away:
+        jsonobj = a.to_json()
+        jsonobj['results'][0]['trace']['states'][0]['location']['range_'] = \
+            Range(Point(1, 2), Point(3, 4)).to_json()
+        a2 = Analysis.from_json(jsonobj)
+        self.assertFalse(a2.results[0].has_lazy_trace)
+        self.assertEqual(a2.results[0].trace.states[0].location.range_,
+                         Range(Point(1, 2), Point(3, 4)))
+
+        # Assigning a trace replaces any pending decoding:
+        a2 = Analysis.from_json(a.to_json())
+        a2.results[0].trace = None
+        self.assertFalse(a2.results[0].has_lazy_trace)
+        self.assertEqual(a2.results[0].trace, None)
+
+    def test_unchecked(self):
+        # unchecked() takes the same arguments as the constructor, but
+        # doesn't check their types:
+        a, w = make_complex_analysis()
+        w2 = Issue.unchecked(w.cwe, w.testid, w.location, w.message,
+                             w.notes, w.trace, severity=w.severity,
+                             customfields=w.customfields)
+        self.assertEqual(w2, w)
+        self.assertEqual(Location.unchecked(File('foo.c', None), None,
+                                            range_=None),
+                         Location(File('foo.c', None), None))
+        with self.assertRaises(AssertionError):
+            Message(42)
+        self.assertEqual(Message.unchecked(42).text, 42)
+
+    def test_validate(self):
+        for creator in [make_simple_analysis,
+                        make_complex_analysis,
+                        make_failed_analysis,
+                        make_info]:
+            a, w = creator()
+            a.validate()
+            self.assertEqual(list(a.iter_errors()), [])
+
+        a, w = make_complex_analysis()
+        w.location.point.line = '10'
+        w.trace.states[1].location = None
+        w.message = Message.unchecked(None)
+        a.set_custom_field('foo', 1.5)
+        self.assertEqual(list(a.iter_errors()),
+                         ["Analysis.results[0].location.point.line:"
+                          " expected int, got '10'",
+                          "Analysis.results[0].message.text: missing",
+                          "Analysis.results[0].trace.states[1].location:"
+                          " missing",
+                          "Analysis.customfields['foo']:"
+                          " expected str or int, got 1.5"])
+        with self.assertRaises(ValueError):
+            a.validate()
+        with self.assertRaises(ValueError):
+            w.validate()
+
+        # (a Failure's location and message are optional)
+        a, w = make_failed_analysis()
+        w.location = w.message = None
+        a.validate()
+
+        a, w = make_simple_analysis()
+        a.metadata.sut = DebianSource.unchecked('python-firehose', '0.3-1',
+                                                None)
+        self.assertEqual(list(a.iter_errors()),
+                         ['Analysis.metadata.sut: Native package with dash'
+                          ' in the version string'])
+
+    def test_iter_results(self):
+        for creator in [make_simple_analysis,
+                        make_complex_analysis,
+                        make_failed_analysis,
+                        make_info]:
+            a, w = creator()
+            a.set_custom_field('foo', 'bar')
+            reader = Analysis.iter_results(BytesIO(a.to_xml_bytes()))
+            self.assertEqual(reader.metadata, a.metadata)
+            self.assertEqual(reader.customfields, None)
+            self.assertEqual(list(reader), a.results)
+            self.assertEqual(reader.customfields, a.customfields)
+
+        # The reader's tables don't grow with the number of distinct
+        # locations:
+        a = Analysis(Metadata(Generator('test'), None, None, None),
+                     [Issue(None, 'test',
+                            Location(File('foo.c', None), Function('f'),
+                                     Point(line, 1)),
+                            Message('message'), None, None)
+                      for line in range(1, 101)])
+        reader = Analysis.iter_results(BytesIO(a.to_xml_bytes()))
+        self.assertEqual(list(reader), a.results)
+        self.assertEqual(len(reader.interner.files), 1)
+        self.assertEqual(reader.interner.points, None)
+
+        for filename in sorted(glob.glob('examples/example-*.xml')):
+            a = Analysis.from_xml(filename)
+            reader = Analysis.iter_results(filename)
+            self.assertEqual(reader.metadata, a.metadata)
+            self.assertEqual(list(reader), a.results)
+            self.assertEqual(reader.customfields, a.customfields)
+
+        with self.assertRaises(ValueError):
+            Analysis.iter_results(BytesIO(b'<analysis><results/></analysis>'))
+
+    def test_analysis_writer(self):
+        for creator in [make_simple_analysis,
+                        make_complex_analysis,
+                        make_failed_analysis,
+                        make_info]:
+            a, w = creator()
+            a.set_custom_field('foo', 'bar')
+
+            # The writer's output should be identical to that of
+            # serializing the whole tree at once:
+            expected = BytesIO()
+            a.to_xml().write(expected, encoding='utf-8')
+            output = BytesIO()
+            with AnalysisWriter(output, a.metadata, a.customfields) as writer:
+                for result in a.results:
+                    writer.write_result(result)
+            self.assertEqual(output.getvalue(), expected.getvalue())
+            self.assertEqual(a.to_xml_bytes(), expected.getvalue())
+
+        # Empty results:
+        a, w = make_simple_analysis()
+        a.results = []
+        output = BytesIO()
+        with AnalysisWriter(output, a.metadata) as writer:
+            pass
+        self.assertEqual(output.getvalue(),
+                         b'<analysis><metadata><generator name="cpychecker" />'
+                         b'</metadata><results /></analysis>')
+        self.assertEqual(output.getvalue(), a.to_xml_bytes())
+
+    def test_streaming_roundtrip(self):
+        a = Analysis.from_xml('examples/example-non-ascii.xml')
+        reader = Analysis.iter_results(BytesIO(a.to_xml_bytes()))
+        output = BytesIO()
+        writer = AnalysisWriter(output, reader.metadata)
+        writer.write_results(reader)
+        writer.customfields = reader.customfields
+        writer.close()
+        self.assertEqual(output.getvalue(), a.to_xml_bytes())
+
+    def test_generated_attrs_methods(self):
+        # The generated to_json should give the same output as walking the
+        # attrs metadata reflectively:
+        def reference_to_json(obj):
+            if isinstance(obj, list):
+                return [reference_to_json(item) for item in obj]
+            if isinstance(obj, CustomFields):
+                return OrderedDict(obj)
+            if not hasattr(obj, 'attrs'):
+                return obj
+            result = {}
+            for attr in obj.attrs:
+                result[attr.name] = reference_to_json(getattr(obj, attr.name))
+            if isinstance(obj, (Issue, Failure, Info, Sut)):
+                result['type'] = obj.__class__.__name__
+            return result
+
+        for creator in [make_simple_analysis,
+                        make_complex_analysis,
+                        make_failed_analysis,
+                        make_info]:
+            a, w = creator()
+            self.assertEqual(a.to_json(), reference_to_json(a))
+
+        # Generated __eq__:
+        a, w = make_complex_analysis()
+        self.assertEqual(Point(1, 2), Point(1, 2))
+        self.assertNotEqual(Point(1, 2), Point(2, 1))
+        self.assertNotEqual(Point(1, 2), None)
+        self.assertNotEqual(Point(1, 2), Function('foo'))
+        self.assertNotEqual(w.location, w.trace.states[0].location)
+        a2, w2 = make_complex_analysis()
+        self.assertEqual(a, a2)
+        w2.trace.states[1].notes = Notes('something else')
+        self.assertNotEqual(a, a2)
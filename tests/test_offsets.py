@@ -0,0 +1,113 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+
+from firehose.model import Analysis
+from firehose.offsets import OffsetIndex, build_offset_index
+
+from tests.helpers import make_issue, make_analysis
+
+EXAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..',
+                                         'examples', 'example-*.xml')))
+
+def make_numbered_analysis(num_results):
+    return make_analysis([make_issue(testid='test%i' % i, line=i + 1,
+                                     message='<issue> #%i' % i)
+                          for i in range(num_results)],
+                         generator='test')
+
+class OffsetIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'report.xml')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, data):
+        with open(self.path, 'wb') as f:
+            f.write(data)
+
+    def test_examples(self):
+        self.assertTrue(EXAMPLES)
+        for example in EXAMPLES:
+            with open(example, 'rb') as f:
+                self.write(f.read())
+            with open(example) as f:
+                expected = Analysis.from_xml(f).results
+            index = OffsetIndex(self.path)
+            self.assertEqual(len(index), len(expected))
+            self.assertEqual(index[:], expected)
+            self.assertEqual([index[i] for i in range(len(index))],
+                             expected)
+            self.assertEqual(list(index), expected)
+            os.unlink(self.path + '.offsets')
+
+    def test_random_access(self):
+        a = make_numbered_analysis(50)
+        self.write(a.to_xml_bytes())
+        index = OffsetIndex(self.path)
+        self.assertTrue(os.path.exists(self.path + '.offsets'))
+        self.assertEqual(len(index), 50)
+        self.assertEqual(index[17], a.results[17])
+        self.assertEqual(index[-1], a.results[-1])
+        self.assertEqual(index[10:20], a.results[10:20])
+        self.assertEqual(index[45:100], a.results[45:])
+        self.assertEqual(index[40:10:-7], a.results[40:10:-7])
+        self.assertEqual(index[20:10], [])
+        self.assertEqual(index.metadata, a.metadata)
+        start, end = index.offsets(3)
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            self.assertTrue(f.read(end - start).startswith(b'<issue'))
+        with self.assertRaises(IndexError):
+            index[50]
+        with self.assertRaises(IndexError):
+            index[-51]
+        with self.assertRaises(TypeError):
+            index['1']
+
+    def test_skips_comments(self):
+        self.write(b'<analysis><metadata><generator name="test"/>'
+                   b'</metadata><!-- <results><info/> -->'
+                   b'<results>'
+                   b'<!-- <issue><message>no</message></issue> -->'
+                   b'<failure failure-id="crash" >'
+                   b'<message><![CDATA[</failure>]]></message></failure>\n'
+                   b'<info info-id="stats"/>'
+                   b'</results></analysis>')
+        self.assertEqual(build_offset_index(self.path), 2)
+        index = OffsetIndex(self.path)
+        self.assertEqual(index[0].failureid, 'crash')
+        self.assertEqual(index[0].message.text, '</failure>')
+        self.assertEqual([result.infoid for result in index[1:]], ['stats'])
+
+    def test_stale(self):
+        self.write(make_numbered_analysis(5).to_xml_bytes())
+        index = OffsetIndex(self.path)
+        self.write(make_numbered_analysis(8).to_xml_bytes())
+        # (ensure that the mtime differs, even on coarse filesystems)
+        os.utime(self.path, (0, 0))
+        with self.assertRaises(ValueError):
+            index[0]
+        # A new OffsetIndex rebuilds the sidecar:
+        index = OffsetIndex(self.path)
+        self.assertEqual(len(index), 8)
@@ -0,0 +1,157 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+
+from firehose.model import Analysis, Issue, Failure, SourceRpm, Location, \
+    File, Message
+from firehose.store import Store
+
+from tests.helpers import make_issue, make_analysis
+
+EXAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..',
+                                         'examples', 'example-*.xml')))
+
+class StoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'reports.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_roundtrip(self):
+        self.assertTrue(EXAMPLES)
+        analyses = []
+        for path in EXAMPLES:
+            with open(path) as f:
+                analyses.append(Analysis.from_xml(f))
+        with Store(self.path) as store:
+            ids = store.add_analyses(analyses[:2])
+            ids += [store.add_analysis(a) for a in analyses[2:]]
+            self.assertEqual(store.analysis_ids(), ids)
+        # (reopening the database)
+        with Store(self.path) as store:
+            for analysis_id, analysis in zip(ids, analyses):
+                loaded = store.get_analysis(analysis_id)
+                self.assertEqual(loaded, analysis)
+                loaded.validate()
+            with self.assertRaises(KeyError):
+                store.get_analysis(max(ids) + 1)
+
+    def test_closed(self):
+        # Results don't refer back to the database, so their traces remain
+        # available once the store is closed:
+        with open(os.path.join(os.path.dirname(__file__), '..', 'examples',
+                               'example-2.xml')) as f:
+            analysis = Analysis.from_xml(f)
+        self.assertTrue(analysis.results[0].trace)
+        with Store(self.path) as store:
+            analysis_id = store.add_analysis(analysis)
+            loaded = store.get_analysis(analysis_id)
+            results = store.query()
+        self.assertEqual(loaded.results[0].trace, analysis.results[0].trace)
+        self.assertEqual(results[0].trace, analysis.results[0].trace)
+        self.assertEqual(loaded, analysis)
+
+    def test_normalized(self):
+        with Store(self.path) as store:
+            store.add_analyses([make_analysis([make_issue('foo.c', 'a'),
+                                               make_issue('foo.c', 'b')]),
+                                make_analysis([make_issue('foo.c', 'a')])])
+            for table, expected in [('generators', 1), ('files', 1),
+                                    ('functions', 1), ('analyses', 2),
+                                    ('results', 3)]:
+                self.assertEqual(store.conn.execute(
+                    'SELECT COUNT(*) FROM %s' % table).fetchone()[0],
+                                 expected)
+
+    def test_query(self):
+        ethtool = SourceRpm('python-ethtool', '0.7', '4.fc19', 'x86_64')
+        with Store(self.path) as store:
+            first, second = store.add_analyses([
+                make_analysis([make_issue('foo.c', 'leak', 401, 'high'),
+                               make_issue('bar.c', 'format'),
+                               Failure('crash',
+                                       Location(File('foo.c', None), None),
+                                       Message('crashed'), None)],
+                              sut=ethtool),
+                make_analysis([make_issue('foo.c', 'leak', 401, 'low',
+                                          function='g')],
+                              generator='other')])
+            self.assertEqual([type(r) for r in store.query(file='foo.c')],
+                             [Issue, Failure, Issue])
+            self.assertEqual([r.location.function.name
+                              for r in store.query(cwe=401)],
+                             ['f', 'g'])
+            self.assertEqual(len(store.query(cwe=401, sut='python-ethtool')),
+                             1)
+            self.assertEqual(len(store.query(generator='other')), 1)
+            self.assertEqual(len(store.query(testid=('format', None))), 2)
+            self.assertEqual(len(store.query(file='foo.c', testid=None)), 1)
+            self.assertEqual(store.query(severity='low', function='g')[0],
+                             make_issue('foo.c', 'leak', 401, 'low',
+                                        function='g'))
+            self.assertEqual(store.query(cwe=476), [])
+            self.assertEqual(store.count(analysis=first), 3)
+            self.assertEqual(store.count(), 4)
+            self.assertEqual(store.analysis_ids(sut='python-ethtool'),
+                             [first])
+            self.assertEqual(store.analysis_ids(generator='other'),
+                             [second])
+            with self.assertRaises(ValueError):
+                store.query(colour='red')
+
+    def test_query_none(self):
+        # Results without a location, function or sut are matched by None:
+        with Store(self.path) as store:
+            store.add_analyses([
+                make_analysis([make_issue('foo.c', 'leak'),
+                               Failure('crash',
+                                       Location(File('foo.c', None), None),
+                                       Message('crashed'), None),
+                               Failure('crash', None, Message('crashed'),
+                                       None)],
+                              sut=SourceRpm('python-ethtool', '0.7',
+                                            '4.fc19', 'x86_64')),
+                make_analysis([make_issue('bar.c', 'leak',
+                                          function='main')])])
+            self.assertEqual(len(store.query(function=None)), 2)
+            self.assertEqual(len(store.query(function=(None, 'main'))), 3)
+            self.assertEqual(store.count(function=None), 2)
+            self.assertEqual(len(store.query(file=None)), 1)
+            self.assertEqual(len(store.query(file=(None, 'bar.c'))), 2)
+            self.assertEqual(len(store.query(sut=None)), 1)
+            self.assertEqual(len(store.query(sut=(None, 'python-ethtool'),
+                                             generator='checker')), 4)
+            self.assertEqual(store.analysis_ids(sut=None), [2])
+
+    def test_rollback(self):
+        with Store(self.path) as store:
+            store.add_analysis(make_analysis([make_issue('foo.c', 'a')]))
+            def analyses():
+                yield make_analysis([make_issue('bar.c', 'b')])
+                raise RuntimeError()
+            with self.assertRaises(RuntimeError):
+                store.add_analyses(analyses())
+            self.assertEqual(store.count(), 1)
+            store.add_analysis(make_analysis([make_issue('bar.c', 'b')]))
+            self.assertEqual([r.testid for r in store.query(file='bar.c')],
+                             ['b'])
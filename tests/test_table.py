@@ -0,0 +1,118 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+import unittest
+
+from firehose.model import Analysis, Issue, Failure, Location, File, \
+    Point, Range, Message
+from firehose.table import ResultTable, NONE
+
+from tests.helpers import make_issue, make_analysis
+
+class ResultTableTests(unittest.TestCase):
+    def make_table(self):
+        issues = [make_issue('foo.c', 'a', 401, 'high', line=10,
+                             notes='notes'),
+                  make_issue('foo.c', 'b', line=20, notes='notes'),
+                  make_issue('bar.c', 'a', None, 'low', line=10,
+                             notes='notes'),
+                  make_issue('bar.c', 'a', 401, 'high', line=30,
+                             notes='notes')]
+        # (a Failure, which isn't stored)
+        failure = Failure(None, Location(File('baz.c', None), None),
+                          Message('crashed'), None)
+        analysis = make_analysis(issues[:2] + [failure] + issues[2:],
+                                 generator='test')
+        return issues, ResultTable.from_analysis(analysis)
+
+    def test_from_analysis(self):
+        issues, table = self.make_table()
+        self.assertEqual(len(table), 4)
+        self.assertEqual(list(table), issues)
+        self.assertEqual(table[1], issues[1])
+        self.assertEqual(table[-1], issues[-1])
+        with self.assertRaises(IndexError):
+            table[4]
+        self.assertEqual(table.values('file'),
+                         ['foo.c', 'foo.c', 'bar.c', 'bar.c'])
+        self.assertEqual(table.values('cwe'), [401, None, None, 401])
+        self.assertEqual(table.get(2, 'severity'), 'low')
+        # Each distinct string is stored once:
+        self.assertEqual(len(set(table.columns['file'])), 2)
+        self.assertEqual(table.pool.strings.count('foo.c'), 1)
+        self.assertEqual(list(table.columns['cwe']), [401, NONE, NONE, 401])
+
+    def test_missing_values(self):
+        table = ResultTable()
+        table.append(None, None, None, 'foo.c', None, None, None, 'message')
+        issue = table[0]
+        self.assertEqual(issue,
+                         Issue(None, None,
+                               Location(File('foo.c', None), None, None),
+                               Message('message'), None, None))
+
+    def test_range(self):
+        # Issues located by a range are stored at the start of the range:
+        table = ResultTable()
+        table.append_issue(Issue(None, 'test',
+                                 Location(File('foo.c', None), None,
+                                          range_=Range(Point(10, 2),
+                                                       Point(12, 5))),
+                                 Message('message'), None, None))
+        self.assertEqual(table.get(0, 'line'), 10)
+        self.assertEqual(table.get(0, 'column'), 2)
+        self.assertEqual(table[0].location.point, Point(10, 2))
+
+    def test_select(self):
+        issues, table = self.make_table()
+        self.assertEqual(table.select(testid='a'), [0, 2, 3])
+        self.assertEqual(table.select(testid='a', severity='high'), [0, 3])
+        self.assertEqual(table.select(file=('foo.c', 'bar.c'), line=10),
+                         [0, 2])
+        self.assertEqual(table.select(severity=None), [1])
+        self.assertEqual(table.select(cwe=[401, None]), [0, 1, 2, 3])
+        self.assertEqual(table.select(testid='unknown'), [])
+        self.assertEqual(table.select(), [0, 1, 2, 3])
+        self.assertEqual(list(table.issues(table.select(line=30))),
+                         [issues[3]])
+
+        subset = table.take(table.select(testid='a'))
+        self.assertEqual(list(subset), [issues[0], issues[2], issues[3]])
+        self.assertEqual(subset.select(file='bar.c'), [1, 2])
+
+        # Rows appended after a query are found by later queries:
+        table.append_issue(make_issue('bar.c', 'a', None, 'high', line=40))
+        self.assertEqual(table.select(testid='a', file='bar.c'), [2, 3, 4])
+        self.assertEqual(table.select(line=(40, 10)), [0, 2, 4])
+
+    def test_count_by(self):
+        issues, table = self.make_table()
+        self.assertEqual(table.count_by('testid'), {'a': 3, 'b': 1})
+        self.assertEqual(table.count_by('file', 'severity'),
+                         {('foo.c', 'high'): 1,
+                          ('foo.c', None): 1,
+                          ('bar.c', 'low'): 1,
+                          ('bar.c', 'high'): 1})
+        self.assertEqual(table.count_by('cwe'), {401: 2, None: 2})
+
+    def test_from_results(self):
+        # Tables can be built from a streaming reader:
+        table = ResultTable.from_results(
+            Analysis.iter_results('examples/example-2.xml'))
+        expected = ResultTable.from_analysis(
+            Analysis.from_xml('examples/example-2.xml'))
+        self.assertEqual(len(table), len(expected))
+        self.assertEqual(list(table), list(expected))
@@ -0,0 +1,80 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+
+from firehose.validate import AttrsValidator, RelaxNGValidator, \
+    get_validator, validate_files, lxml_etree
+
+EXAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..',
+                                         'examples', 'example-*.xml')))
+
+INVALID = {
+    'not-xml.xml': b'<analysis><metadata>',
+    'bad-cwe.xml': (b'<analysis><metadata><generator name="test"/></metadata>'
+                    b'<results><issue cwe="leak">'
+                    b'<message>message</message>'
+                    b'<location><file given-path="foo.c"/>'
+                    b'<point line="1" column="1"/></location>'
+                    b'</issue></results></analysis>'),
+    'no-location.xml': (b'<analysis><metadata><generator name="test"/>'
+                        b'</metadata><results><issue>'
+                        b'<message>message</message>'
+                        b'</issue></results></analysis>'),
+}
+
+class ValidateTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.invalid = []
+        for name, data in sorted(INVALID.items()):
+            path = os.path.join(self.tmpdir, name)
+            with open(path, 'wb') as f:
+                f.write(data)
+            self.invalid.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def assert_validates(self, validator):
+        self.assertTrue(EXAMPLES)
+        for path in EXAMPLES:
+            self.assertEqual(validator.validate_file(path), [])
+        for path in self.invalid:
+            errors = validator.validate_file(path)
+            self.assertTrue(errors, path)
+            self.assertTrue(errors[0].startswith(path))
+
+    def test_attrs_validator(self):
+        self.assert_validates(AttrsValidator())
+
+    @unittest.skipIf(lxml_etree is None, 'lxml is not installed')
+    def test_relaxng_validator(self):
+        self.assert_validates(RelaxNGValidator())
+        self.assertIsInstance(get_validator(), RelaxNGValidator)
+
+    def test_validate_files(self):
+        paths = EXAMPLES + self.invalid
+        for processes in (1, 2):
+            results = list(validate_files(paths, processes=processes))
+            self.assertEqual([path for path, errors in results], paths)
+            self.assertEqual([bool(errors) for path, errors in results],
+                             [False] * len(EXAMPLES)
+                             + [True] * len(self.invalid))
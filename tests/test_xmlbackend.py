@@ -0,0 +1,81 @@
+#   Copyright 2026 Red Hat, Inc.
+#
+#   This library is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU Lesser General Public
+#   License as published by the Free Software Foundation; either
+#   version 2.1 of the License, or (at your option) any later version.
+#
+#   This library is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#   Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public
+#   License along with this library; if not, write to the Free Software
+#   Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301
+#   USA
+
+import glob
+import unittest
+
+from six import BytesIO
+
+from firehose import xmlbackend
+from firehose.model import Analysis
+from firehose.parsers import cppcheck
+
+class XmlBackendTests(unittest.TestCase):
+    def setUp(self):
+        self.orig_backend = xmlbackend.get_backend()
+
+    def tearDown(self):
+        xmlbackend._backend = self.orig_backend
+
+    def parse_with_each_backend(self, fn):
+        results = {}
+        for name in sorted(xmlbackend.BACKENDS):
+            xmlbackend.set_backend(name)
+            self.assertEqual(xmlbackend.get_backend().name, name)
+            results[name] = fn()
+        return results
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            xmlbackend.set_backend('not-a-backend')
+
+    def test_examples(self):
+        # Every backend should yield the same model:
+        for filename in sorted(glob.glob('examples/example-*.xml')):
+            results = self.parse_with_each_backend(
+                lambda: Analysis.from_xml(filename))
+            for a in results.values():
+                self.assertEqual(a, results['etree'])
+            results = self.parse_with_each_backend(
+                lambda: list(Analysis.iter_results(filename)))
+            for a in results.values():
+                self.assertEqual(a, results['etree'])
+
+    def test_comments(self):
+        # Comments and processing instructions are ignored by every backend:
+        xmlbytes = b'''<analysis>
+                         <metadata><generator name='test'/></metadata>
+                         <results>
+                           <!-- a comment -->
+                           <?a-processing-instruction?>
+                         </results>
+                         <custom-fields>
+                           <!-- another comment -->
+                           <str-field name="test">value</str-field>
+                         </custom-fields>
+                       </analysis>'''
+        for a in self.parse_with_each_backend(
+                lambda: Analysis.from_xml(BytesIO(xmlbytes))).values():
+            self.assertEqual(a.results, [])
+            self.assertEqual(a.customfields['test'], 'value')
+
+    def test_cppcheck(self):
+        path = 'tests/parsers/example-output/cppcheck-xml-v2/example-001.xml'
+        results = self.parse_with_each_backend(
+            lambda: cppcheck.parse_file(path))
+        for a in results.values():
+            self.assertEqual(a, results['etree'])